@@ -2,37 +2,93 @@ from fastapi import FastAPI
 from routers.wizard import router as wizard_router
 from routers.api_plan import router as plan_router
 from routers.api_lyrics import router as lyrics_router
-from routers.api_ppt import router as ppt_router
+from routers.api_ppt import router as ppt_router, TEMPLATE, BIBLE_DIR
+from routers.api_cleanup import router as cleanup_router
+from routers.metrics import router as metrics_router
+from routers.api_bible import router as bible_router
 
 from services.store import PlanStore
+from services.jobs import CrawlJobQueue
+from services.build_pool import DeckBuildPool
+from services.bible import preload_bible
+from services.bible_search import get_bible_search
+from services.melon import get_driver_pool, shutdown_prefetch, warm_driver_pool
+from services.expiry import get_expiry_index
+from services.leader import LeaderLock
 
 import asyncio
+import logging
+import os
 from pathlib import Path
 
-from services.cleanup import cleanup_dir_by_age, env_int
+from services.cleanup import cleanup_dir_by_age, env_int, web_workers
+from services.metrics import dump_snapshot
+
+log = logging.getLogger(__name__)
+
+
+async def _expiry_sweep_loop(app: FastAPI):
+    """
+    만료 인덱스에 등록된 파일 중 만료된 것만 지움 (디렉터리 스캔 없음).
+    worker 가 여러 개여도 leader lock 을 잡은 프로세스 하나만 돈다.
+    leader 가 죽으면 lock 이 풀리므로 다른 worker 가 다음 주기에 이어받음.
+    """
+    interval_sec = env_int("EXPIRY_SWEEP_INTERVAL_SEC", 60)
+    stats = app.state.sweep_stats
+
+    while True:
+        try:
+            if app.state.leader.try_acquire():
+                result = await asyncio.get_running_loop().run_in_executor(None, get_expiry_index().sweep)
+                stats["runs"] += 1
+                stats["deleted"] += result["deleted"]
+                stats["deleted_bytes"] += result["deleted_bytes"]
+                stats["last"] = result
+                if result["deleted"]:
+                    log.info(
+                        "expiry sweep deleted=%d bytes=%d lag=%.1fs",
+                        result["deleted"], result["deleted_bytes"], result["lag_sec"],
+                    )
+        except Exception:
+            log.exception("expiry sweep failed")
+
+        await asyncio.sleep(interval_sec)
 
 
 async def _cleanup_loop(app: FastAPI):
     """
-    주기적으로 out/ 및 out/plans/ 파일을 TTL 기준으로 정리.
-    여러 worker로 띄우면 각 worker가 청소할 수 있는데,
-    삭제 실패는 무시하도록 safe unlink로 처리했음.
+    out/ 및 out/plans/ 파일을 TTL 기준으로 전체 스캔해서 정리.
+    평소 삭제는 _expiry_sweep_loop 가 하고, 이건 인덱스에 빠진 파일
+    (등록 전에 죽은 경우, 인덱스 도입 전 파일, *.tmp 등)을 가끔 주워 담는 reconcile 용.
     """
     # 환경변수로 조절 가능
-    interval_sec = env_int("CLEANUP_INTERVAL_SEC", 3600)   # 1시간마다
+    interval_sec = env_int("CLEANUP_INTERVAL_SEC", 6 * 3600)  # reconcile 이라 드물게
     ppt_ttl_sec = env_int("PPT_TTL_SEC", 3600)             # pptx 1시간 보관
     plan_ttl_sec = env_int("PLAN_TTL_SEC", 6 * 3600)       # plan json 6시간 보관(원하면 더 늘려)
+    deck_cache_ttl_sec = env_int("DECK_CACHE_TTL_SEC", 24 * 3600)  # 생성 결과 캐시: 마지막 사용 후 24시간
 
     out_dir = Path("out")
     plans_dir = out_dir / "plans"
+    deck_cache_dir = out_dir / "deck_cache"
+    metrics_dir = out_dir / "metrics"
 
     while True:
         try:
-            # out/*.pptx 삭제 (너 프로젝트는 out 아래에 pptx 생성)
-            cleanup_dir_by_age(out_dir, patterns=["*.pptx"], max_age_seconds=ppt_ttl_sec)
+            if app.state.leader.try_acquire():
+                # out/*.pptx 삭제 (너 프로젝트는 out 아래에 pptx 생성)
+                cleanup_dir_by_age(out_dir, patterns=["*.pptx"], max_age_seconds=ppt_ttl_sec)
+
+                # out/plans/*.json 삭제 (저장 도중 죽어서 남은 .tmp 포함)
+                cleanup_dir_by_age(plans_dir, patterns=["*.json", ".*.tmp"], max_age_seconds=plan_ttl_sec)
+                # plan lock 파일은 flock 이 mtime 을 안 바꿔서 나이로 지우면 잡고 있는 것까지 지워짐 → 안 잡힌 것만
+                app.state.store.prune_locks(plan_ttl_sec)
 
-            # out/plans/*.json 삭제
-            cleanup_dir_by_age(plans_dir, patterns=["*.json"], max_age_seconds=plan_ttl_sec)
+                # out/deck_cache/*.pptx 삭제 (hit 때마다 mtime 갱신되므로 오래 안 쓴 것만)
+                # 쓰다 만 *.tmp 도 같이 정리
+                cleanup_dir_by_age(deck_cache_dir, patterns=["*.pptx", "*.tmp"], max_age_seconds=deck_cache_ttl_sec)
+
+                # out/metrics/*.pkl 삭제 (재시작 등으로 없어진 worker 의 지표 스냅샷)
+                cleanup_dir_by_age(metrics_dir, patterns=["*.pkl", ".*.tmp"], max_age_seconds=24 * 3600)
         except Exception:
             # 운영이면 logging 넣는 걸 추천하지만, 일단 조용히 넘어가게
             pass
@@ -40,22 +96,92 @@ async def _cleanup_loop(app: FastAPI):
         await asyncio.sleep(interval_sec)
 
 
+async def _metrics_dump_loop():
+    """
+    worker 가 여러 개일 때 각자 지표를 out/metrics/{pid}.pkl 로 주기적으로 내려놓음.
+    /metrics 는 어느 worker 가 받든 이 파일들을 합쳐서 돌려줌.
+    """
+    interval_sec = env_int("METRICS_DUMP_INTERVAL_SEC", 5)
+    while True:
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, dump_snapshot, Path("out/metrics"))
+        except Exception:
+            log.exception("metrics dump failed")
+        await asyncio.sleep(interval_sec)
+
+
+def _warm_driver_pool_quietly():
+    try:
+        warm_driver_pool()
+    except Exception:
+        pass
+
+
 def create_app() -> FastAPI:
     app = FastAPI()
 
     # ✅ plan not found 방지: 전역 store 인스턴스 1개를 app.state로 공유
-    app.state.store = PlanStore(base_dir="out/plans")
+    app.state.store = PlanStore(base_dir="out/plans", ttl_sec=env_int("PLAN_TTL_SEC", 6 * 3600))
+
+    # 백그라운드 정리는 worker 중 하나(leader)만
+    app.state.leader = LeaderLock("out/.leader.lock")
+    app.state.sweep_stats = {"runs": 0, "deleted": 0, "deleted_bytes": 0, "last": None}
+
+    # Step2 가사 크롤링 job 큐 (요청 스레드/이벤트 루프를 막지 않게)
+    # 상태는 SQLite 라 worker 가 여러 개여도 대기열 한도/polling 은 전체 기준
+    app.state.crawl_jobs = CrawlJobQueue(
+        app.state.store,
+        max_workers=env_int("CRAWL_JOB_WORKERS", 2),
+        max_queue=env_int("CRAWL_JOB_QUEUE_MAX", 20),
+        stale_sec=env_int("CRAWL_JOB_STALE_SEC", 1800),
+    )
+
+    # PPT 빌드용 프로세스 풀 (worker마다 템플릿/성경 인덱스 미리 로드)
+    # 기본 크기는 web worker 끼리 CPU 를 나눠 가짐
+    app.state.build_pool = DeckBuildPool(
+        TEMPLATE,
+        BIBLE_DIR,
+        workers=env_int("BUILD_POOL_WORKERS", max(1, min(os.cpu_count() or 1, 4) // web_workers())),
+        max_pending=env_int("BUILD_QUEUE_MAX", 8),
+    )
 
     app.include_router(wizard_router)
     app.include_router(plan_router)
     app.include_router(lyrics_router)
     app.include_router(ppt_router)
+    app.include_router(cleanup_router)
+    app.include_router(bible_router)
+    app.include_router(metrics_router)
 
     @app.on_event("startup")
     async def _startup():
-        # 백그라운드 정리 루프 시작
+        # 성경 66권 절 인덱스를 미리 만들어 둠 (첫 PPT 생성이 느려지지 않게)
+        asyncio.get_running_loop().run_in_executor(None, preload_bible, Path("bible"))
+
+        # 본문 검색 색인 (없으면 만들고, 있으면 mmap 으로 열기만)
+        asyncio.get_running_loop().run_in_executor(None, get_bible_search, BIBLE_DIR)
+
+        # 빌드 worker 프로세스를 미리 띄움
+        asyncio.get_running_loop().run_in_executor(None, app.state.build_pool.warm)
+
+        # 멜론 크롤링용 브라우저를 미리 띄워 둠 (실패해도 요청 시 다시 시도하므로 무시)
+        asyncio.get_running_loop().run_in_executor(None, _warm_driver_pool_quietly)
+
+        # 백그라운드 정리 루프 시작 (만료 인덱스 sweep + 가끔 전체 reconcile)
+        asyncio.create_task(_expiry_sweep_loop(app))
         asyncio.create_task(_cleanup_loop(app))
 
+        if web_workers() > 1:
+            asyncio.create_task(_metrics_dump_loop())
+
+    @app.on_event("shutdown")
+    async def _shutdown():
+        app.state.crawl_jobs.shutdown()
+        shutdown_prefetch()
+        app.state.build_pool.shutdown()
+        get_driver_pool().close()
+        app.state.leader.release()
+
     return app
 
 
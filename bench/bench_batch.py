@@ -0,0 +1,124 @@
+"""
+/api/ppt/batch 의 iter_deck_batch 를 실제 빌드 풀로 돌려서 시간과 결과 zip 을 확인.
+
+- 덱마다: zip 항목이 .pptx 로 열리는지, 크기가 manifest 의 bytes 와 같은지
+- 빌드 풀이 임시파일로 넘긴 큰 덱(PPT_SPOOL_MAX_BYTES 초과)이 tmp 에 남지 않았는지
+- 덱 캐시를 켜면 두 번째 바퀴는 전부 캐시 hit 이어야 함
+하나라도 어긋나면 종료 코드 1.
+
+--spool-max-bytes 를 아주 작게 주면 모든 덱이 임시파일 경로로 감 (큰 덱 경로 확인용).
+
+    python -m bench.bench_batch
+    python -m bench.bench_batch --plans 6 --parallel 2 --spool-max-bytes 1000 --deck-cache
+"""
+import argparse
+import asyncio
+import glob
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+from pptx import Presentation
+
+from bench.suite import BIBLE_DIR, synthetic_plan
+from bench.synthetic_template import build_synthetic_template
+from services.build_pool import DeckBuildPool
+from services.deck_batch import iter_deck_batch
+from services.store import PlanStore
+
+
+async def _run(plan_ids, *, store, pool, template, parallel) -> tuple[bytes, float, float]:
+    out = io.BytesIO()
+    first = None
+    t0 = time.perf_counter()
+    async for chunk in iter_deck_batch(
+        plan_ids, store=store, pool=pool, template=template, bible_dir=BIBLE_DIR, parallel=parallel
+    ):
+        if first is None and chunk:
+            first = time.perf_counter() - t0
+        out.write(chunk)
+    return out.getvalue(), (first or 0) * 1000, (time.perf_counter() - t0) * 1000
+
+
+def _check(data: bytes, expect_cached: bool) -> list[str]:
+    problems = []
+    zf = zipfile.ZipFile(io.BytesIO(data))
+    if zf.testzip() is not None:
+        problems.append("zip CRC error")
+    manifest = json.loads(zf.read("manifest.json"))
+    for d in manifest["decks"]:
+        if not d["ok"]:
+            problems.append(f"{d['plan_id']}: {d['error']}")
+            continue
+        blob = zf.read(d["file"])
+        if len(blob) != d["bytes"]:
+            problems.append(f"{d['file']}: {len(blob)} bytes in zip, manifest says {d['bytes']}")
+        try:
+            Presentation(io.BytesIO(blob))
+        except Exception as e:
+            problems.append(f"{d['file']}: not a pptx ({type(e).__name__})")
+        if expect_cached and not d["cached"]:
+            problems.append(f"{d['file']}: expected a deck cache hit")
+    return problems
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--plans", type=int, default=4)
+    ap.add_argument("--praise", type=int, default=4, help="plan 하나의 찬양 곡 수")
+    ap.add_argument("--parallel", type=int, default=2, help="빌드 풀 worker 수 = 동시에 진행하는 plan 수")
+    ap.add_argument("--spool-max-bytes", type=int, default=None, help="PPT_SPOOL_MAX_BYTES (작게 주면 임시파일 경로)")
+    ap.add_argument("--deck-cache", action="store_true", help="덱 캐시를 켜고 두 바퀴 (두 번째는 전부 hit)")
+    ap.add_argument("--template", type=Path, default=None)
+    args = ap.parse_args()
+
+    # 빌드 풀(PPT_SPOOL_MAX_BYTES)/캐시가 만들어지기 전에 설정. out/ 은 임시 디렉터리에 생김
+    if args.spool_max_bytes is not None:
+        os.environ["PPT_SPOOL_MAX_BYTES"] = str(args.spool_max_bytes)
+    os.environ["DECK_CACHE_ENABLED"] = "1" if args.deck_cache else "0"
+    os.environ["SECTION_CACHE_ENABLED"] = "0"
+
+    spilled_before = set(glob.glob(os.path.join(tempfile.gettempdir(), "deck-*.pptx")))
+    problems = []
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        template = (args.template or build_synthetic_template(tmp / "template.pptx")).resolve()
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        pool = DeckBuildPool(template, BIBLE_DIR, workers=args.parallel, max_pending=args.parallel * 2)
+        try:
+            pool.warm()
+            store = PlanStore(str(tmp / "plans"))
+            plan_ids = [store.create(synthetic_plan(args.praise, 3)) for _ in range(args.plans)]
+            print(f"{args.plans} plans x {args.praise} songs, parallel {args.parallel},"
+                  f" spool max {pool.spool_max_bytes} bytes, deck cache {'on' if args.deck_cache else 'off'}")
+
+            for lap in range(2 if args.deck_cache else 1):
+                data, first_ms, total_ms = asyncio.run(
+                    _run(plan_ids, store=store, pool=pool, template=template, parallel=args.parallel)
+                )
+                lap_problems = _check(data, expect_cached=lap == 1)
+                problems += lap_problems
+                print(f"lap {lap + 1}: zip {len(data) / 1024:.0f} KiB, first chunk {first_ms:.0f} ms,"
+                      f" total {total_ms:.0f} ms, {'ok' if not lap_problems else f'{len(lap_problems)} problem(s)'}")
+        finally:
+            pool.shutdown()
+            os.chdir(cwd)
+
+    leftover = set(glob.glob(os.path.join(tempfile.gettempdir(), "deck-*.pptx"))) - spilled_before
+    if leftover:
+        problems.append(f"{len(leftover)} spooled deck file(s) left in {tempfile.gettempdir()}")
+
+    for p in problems:
+        print("  " + p)
+    if problems:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
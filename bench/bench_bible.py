@@ -0,0 +1,98 @@
+"""
+scroll_bible 벤치마크: 예전 방식(매번 파일 전체 스캔) vs 절 인덱스.
+
+    python -m bench.bench_bible
+    python -m bench.bench_bible --repeat 50
+"""
+import argparse
+import re
+import time
+from pathlib import Path
+
+from services import bible
+from services.bible import BOOK_MAP, scroll_bible
+
+BIBLE_DIR = Path(__file__).resolve().parent.parent / "bible"
+
+# (책, 장, 시작절, 끝절) — 큰 책 위주
+CASES = [
+    ("시편", 119, 1, 176),
+    ("시편", 150, 1, 6),
+    ("예레미야", 31, 1, 40),
+    ("예레미야", 52, 1, 34),
+    ("이사야", 53, 1, 12),
+    ("요한복음", 3, 1, 21),
+]
+
+
+def scroll_bible_scan(bible_dir: Path, book: str, chapter: int, start_v: int, end_v: int):
+    """인덱스 도입 전 scroll_bible 구현 (비교용으로 그대로 옮겨둠)"""
+    abbr = BOOK_MAP.get(book, book)
+    fp = Path(bible_dir) / f"{book}.txt"
+    if not fp.exists():
+        return ["(성경 파일 없음)"] * (end_v - start_v + 1)
+
+    pat = re.compile(rf"^\s*{re.escape(abbr)}\s*(\d+)\s*:\s*(\d+)\s+(.*)$")
+    verses = []
+
+    with open(fp, "r", encoding="cp949") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            m = pat.match(line)
+            if not m:
+                continue
+
+            ch = int(m.group(1))
+            vs = int(m.group(2))
+            body = m.group(3).strip()
+            body = re.sub(r"<[^>]*>", "", body).strip()
+
+            if ch != chapter:
+                continue
+            if start_v <= vs <= end_v:
+                verses.append(body)
+            if ch == chapter and vs > end_v:
+                break
+
+    need = (end_v - start_v + 1)
+    if len(verses) < need:
+        verses += [""] * (need - len(verses))
+    return verses[:need]
+
+
+def _time(fn, repeat: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for book, ch, s, e in CASES:
+            fn(BIBLE_DIR, book, ch, s, e)
+    return (time.perf_counter() - t0) / (repeat * len(CASES))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    # 결과가 같은지 먼저 확인
+    for book, ch, s, e in CASES:
+        if scroll_bible_scan(BIBLE_DIR, book, ch, s, e) != scroll_bible(BIBLE_DIR, book, ch, s, e):
+            print(f"!! 결과 불일치: {book} {ch}장 {s}-{e}절")
+
+    bible._BOOK_INDEX.clear()
+    t0 = time.perf_counter()
+    loaded = bible.preload_bible(BIBLE_DIR)
+    preload_ms = (time.perf_counter() - t0) * 1000
+
+    scan = _time(scroll_bible_scan, args.repeat)
+    indexed = _time(scroll_bible, args.repeat)
+
+    print(f"preload_bible: {loaded}권, {preload_ms:.1f} ms")
+    print(f"scan    : {scan * 1000:8.3f} ms / phrase")
+    print(f"indexed : {indexed * 1000:8.3f} ms / phrase")
+    print(f"speedup : x{scan / indexed:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+배치 가사 크롤링 벤치마크: 브라우저 1개 순차 vs K개 병렬 (wall-clock).
+
+실제 Chromium이 필요함. MELON_BASE_URL 로 크롤링 대상을 바꿀 수 있고,
+캐시는 꺼둔 상태(LYRICS_CACHE_ENABLED=0)로 잼.
+배치 경로는 HTTP 로 먼저 가져오므로 그것도 꺼서(MELON_HTTP_ENABLED=0) 브라우저 풀만 잼
+(HTTP 경로는 bench_melon_http).
+
+    python -m bench.bench_melon_batch --workers 3
+    python -m bench.bench_melon_batch --workers 4 --titles "주 은혜임을" "은혜" "시선"
+"""
+import argparse
+import os
+import time
+
+os.environ["LYRICS_CACHE_ENABLED"] = "0"
+os.environ["MELON_HTTP_ENABLED"] = "0"
+
+from services import melon  # noqa: E402
+
+DEFAULT_TITLES = [
+    ("주 은혜임을", ""),
+    ("은혜", "손경민"),
+    ("시선", "제이어스"),
+    ("나는 믿네", ""),
+    ("이 땅 위에 오신", ""),
+    ("온 맘 다해", ""),
+]
+
+
+def _run(songs, workers: int) -> tuple[float, int]:
+    t0 = time.perf_counter()
+    results = melon.fetch_lyrics_batch_melon([dict(s) for s in songs], workers=workers)
+    elapsed = time.perf_counter() - t0
+    ok = sum(1 for _, lyrics in results if not melon.is_failed_lyrics(lyrics))
+    return elapsed, ok
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--workers", type=int, default=None, help="병렬 브라우저 수 (기본: default_crawl_workers)")
+    ap.add_argument("--titles", nargs="*", default=None)
+    args = ap.parse_args()
+
+    titles = [(t, "") for t in args.titles] if args.titles else DEFAULT_TITLES
+    songs = [{"title": t, "artist": a} for t, a in titles]
+    workers = args.workers or melon.default_crawl_workers()
+
+    # 드라이버 시작 비용은 빼고 비교하려고 풀을 먼저 데워 둠
+    pool = melon.get_driver_pool()
+    pool.warm(workers)
+
+    try:
+        seq, seq_ok = _run(songs, workers=1)
+        par, par_ok = _run(songs, workers=workers)
+    finally:
+        pool.close()
+
+    print(f"songs      : {len(songs)}")
+    print(f"sequential : {seq:6.2f} s  ({seq_ok} ok)")
+    print(f"parallel   : {par:6.2f} s  ({par_ok} ok, workers={workers})")
+    print(f"speedup    : x{seq / par:.2f}")
+
+
+if __name__ == "__main__":
+    main()
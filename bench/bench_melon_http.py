@@ -0,0 +1,62 @@
+"""
+HTTP 가사 fetcher 벤치마크 (오프라인): 로컬 멜론 stand-in을 띄워서
+파서가 카탈로그 가사를 그대로 뽑는지 확인하고, 곡당 지연(p50/p95)을 잰다.
+
+    python -m bench.bench_melon_http
+    python -m bench.bench_melon_http --latency-ms 80 --rounds 5
+"""
+import argparse
+import os
+import statistics
+import time
+
+os.environ["LYRICS_CACHE_ENABLED"] = "0"
+
+from bench.melon_standin import MelonStandin, song_lyrics  # noqa: E402
+from services import melon  # noqa: E402
+
+
+def _pct(values: list[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--latency-ms", type=float, default=30.0, help="stand-in 응답 지연 (멜론 RTT 흉내)")
+    ap.add_argument("--rounds", type=int, default=3)
+    args = ap.parse_args()
+
+    with MelonStandin(latency_ms=args.latency_ms) as srv:
+        melon.MELON_HOME = srv.base_url
+
+        mismatched = 0
+        for song in srv.catalog:
+            got = melon._fetch_lyrics_http(song["title"], song["artist"])
+            if got != song_lyrics(song):
+                mismatched += 1
+                print(f"!! 파싱 불일치: {song['title']}")
+        if melon._fetch_lyrics_http("없는 곡 제목 zzz") != melon.LYRICS_NOT_FOUND:
+            print("!! 검색결과 없음 처리가 안 됨")
+
+        per_song = []
+        for _ in range(args.rounds):
+            for song in srv.catalog:
+                t0 = time.perf_counter()
+                melon._fetch_lyrics_http(song["title"], song["artist"])
+                per_song.append((time.perf_counter() - t0) * 1000)
+
+        songs = [{"title": s["title"], "artist": s["artist"]} for s in srv.catalog]
+        t0 = time.perf_counter()
+        melon.fetch_lyrics_batch_melon(songs)
+        batch_ms = (time.perf_counter() - t0) * 1000
+
+    print(f"songs       : {len(srv.catalog)} (parse mismatches: {mismatched})")
+    print(f"latency     : {args.latency_ms:.0f} ms / request (stand-in)")
+    print(f"per song    : p50 {statistics.median(per_song):.1f} ms, p95 {_pct(per_song, 95):.1f} ms")
+    print(f"batch (all) : {batch_ms:.1f} ms")
+    print(f"requests    : {srv.requests}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Step2 제출 → Step3 가사가 다 채워질 때까지의 시간: prefetch 없음 vs 있음 (오프라인).
+
+로컬 멜론 stand-in 을 띄우고, 사용자가 곡마다 --type-ms 동안 입력한 뒤 칸을 벗어나는 것
+(= /api/lyrics/prefetch)을 흉내낸 다음 제출(크롤링 job 등록)해서 job 이 끝날 때까지 잰다.
+마지막 곡은 입력을 끝내고 --review-ms 뒤에 제출하므로, 그보다 오래 걸리는 만큼은 prefetch 가 있어도 기다림.
+
+같은 곡 목록으로 --sessions 개 세션이 동시에 제출했을 때 stand-in 요청 수도 셈
+(같은 곡 동시 가져오기가 하나로 합쳐지면 곡 수 × 2 요청에 가까워야 함).
+
+    python -m bench.bench_prefetch
+    python -m bench.bench_prefetch --latency-ms 300 --songs 5 --type-ms 1500
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest import mock
+
+from bench.melon_standin import MelonStandin
+from services import melon
+from services.jobs import CrawlJobQueue
+from services.lyrics_cache import LyricsCache
+from services.store import PlanStore
+
+
+def _plan(songs: list[dict]) -> dict:
+    return {
+        "praise_count": len(songs),
+        "songs": {"praise": [dict(s, lyrics="") for s in songs], "offering": None, "closing": None},
+    }
+
+
+def _session(
+    songs: list[dict], store: PlanStore, jobs: CrawlJobQueue, type_ms: float, review_ms: float, prefetch: bool
+) -> float:
+    """입력(곡마다 type_ms) → 확인(review_ms) → 제출 → job 완료까지. 제출부터의 ms 반환"""
+    for s in songs:
+        time.sleep(type_ms / 1000)
+        if prefetch:
+            melon.prefetch_lyrics(s["title"], s["artist"])
+    time.sleep(review_ms / 1000)
+
+    t0 = time.perf_counter()
+    plan_id = store.create(_plan(songs))
+    batch = [
+        {"slot": ["praise", i], "field": f"lyrics_praise_{i}", "title": s["title"], "artist": s["artist"]}
+        for i, s in enumerate(songs)
+    ]
+    job_id = jobs.submit(plan_id, batch)
+    while jobs.get(job_id)["status"] in ("queued", "running"):
+        time.sleep(0.005)
+    return (time.perf_counter() - t0) * 1000
+
+
+def _run(srv, songs, tmp: Path, name: str, *, type_ms: float, review_ms: float, prefetch: bool, sessions: int = 1):
+    cache = LyricsCache(str(tmp / f"{name}.sqlite3"), ttl_sec=3600, max_entries=1000)
+    store = PlanStore(str(tmp / f"plans_{name}"))
+    jobs = CrawlJobQueue(store, max_workers=sessions, max_queue=sessions, db_path=str(tmp / f"jobs_{name}.sqlite3"))
+    env = {"MELON_PREFETCH_ENABLED": "1" if prefetch else "0"}
+    before = srv.requests
+    results: list[float] = []
+    try:
+        with mock.patch.object(melon, "get_lyrics_cache", lambda: cache), mock.patch.dict(os.environ, env):
+            def _one():
+                results.append(_session(songs, store, jobs, type_ms, review_ms, prefetch))
+
+            threads = [threading.Thread(target=_one) for _ in range(sessions)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+    finally:
+        jobs.shutdown()
+    return statistics.median(results), srv.requests - before
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--latency-ms", type=float, default=300.0, help="stand-in 응답 지연 (멜론 RTT 흉내)")
+    ap.add_argument("--songs", type=int, default=5)
+    ap.add_argument("--type-ms", type=float, default=1000.0, help="곡 하나 입력하는 데 걸리는 시간")
+    ap.add_argument("--review-ms", type=float, default=500.0, help="마지막 칸을 벗어나서 제출 버튼을 누르기까지")
+    ap.add_argument("--sessions", type=int, default=4)
+    args = ap.parse_args()
+
+    with MelonStandin(latency_ms=args.latency_ms) as srv, tempfile.TemporaryDirectory() as tmp:
+        melon.MELON_HOME = srv.base_url
+        tmp = Path(tmp)
+        songs = [{"title": s["title"], "artist": s["artist"]} for s in srv.catalog[: args.songs]]
+
+        base_ms, base_req = _run(srv, songs, tmp, "base", type_ms=args.type_ms, review_ms=args.review_ms, prefetch=False)
+        pre_ms, pre_req = _run(srv, songs, tmp, "prefetch", type_ms=args.type_ms, review_ms=args.review_ms, prefetch=True)
+        multi_ms, multi_req = _run(
+            srv, songs, tmp, "multi",
+            type_ms=args.type_ms, review_ms=args.review_ms, prefetch=True, sessions=args.sessions,
+        )
+
+    print(f"songs          : {len(songs)}, latency {args.latency_ms:.0f} ms/request, typing {args.type_ms:.0f} ms/song,"
+          f" review {args.review_ms:.0f} ms")
+    print(f"no prefetch    : {base_ms:8.1f} ms submit → Step3 filled  ({base_req} requests)")
+    print(f"prefetch       : {pre_ms:8.1f} ms submit → Step3 filled  ({pre_req} requests, {base_ms / pre_ms:.1f}x)")
+    print(
+        f"{args.sessions} sessions     : {multi_ms:8.1f} ms median                ({multi_req} requests,"
+        f" uncoalesced would be {base_req * args.sessions})"
+    )
+
+
+if __name__ == "__main__":
+    main()
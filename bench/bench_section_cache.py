@@ -0,0 +1,86 @@
+"""
+가사 한 곡 수정 후 다시 생성할 때의 시간: 구간(섹션) 캐시 없음 vs 있음.
+
+- no cache   : 매번 전체 슬라이드를 python-pptx 로 렌더링
+- cold       : 캐시가 빈 상태 (렌더링 + 캐시 저장 비용 포함)
+- edit (mem) : 한 곡만 고친 plan, 같은 프로세스 메모리 캐시
+- edit (disk): 한 곡만 고친 plan, 다른 worker 처럼 메모리는 비고 디스크 캐시만 있음
+
+    python -m bench.bench_section_cache
+    python -m bench.bench_section_cache --praise 20 --phrases 10 --repeat 5
+"""
+import argparse
+import copy
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+from bench.suite import BIBLE_DIR, synthetic_plan
+from bench.synthetic_template import build_synthetic_template
+from services import ppt_builder
+from services.section_cache import SectionCache
+
+
+def _edit(plan: dict, n: int) -> dict:
+    plan = copy.deepcopy(plan)
+    plan["songs"]["praise"][0]["lyrics"] += f"\n수정 {n}번째"
+    return plan
+
+
+def _time(fn, repeat: int) -> float:
+    samples = []
+    for i in range(repeat):
+        t0 = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+def _build(plan: dict, template: Path, cache) -> None:
+    with mock.patch.object(ppt_builder, "get_section_cache", lambda: cache):
+        buf = ppt_builder.build_ppt_buffer(plan, template, BIBLE_DIR)
+        buf.close()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--template", type=Path, default=None)
+    ap.add_argument("--praise", type=int, default=20)
+    ap.add_argument("--phrases", type=int, default=10)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        template = args.template or build_synthetic_template(tmp / "template.pptx")
+        plan = synthetic_plan(args.praise, args.phrases)
+
+        # 템플릿/성경 인덱스 미리 데움
+        _build(plan, template, None)
+
+        no_cache = _time(lambda i: _build(_edit(plan, i), template, None), args.repeat)
+
+        cold = _time(lambda i: _build(_edit(plan, i), template, SectionCache(str(tmp / f"cold{i}"))), args.repeat)
+
+        cache = SectionCache(str(tmp / "warm"))
+        _build(plan, template, cache)
+        edit_mem = _time(lambda i: _build(_edit(plan, 100 + i), template, cache), args.repeat)
+
+        edit_disk = _time(
+            lambda i: _build(_edit(plan, 200 + i), template, SectionCache(str(tmp / "warm"), mem_entries=512)),
+            args.repeat,
+        )
+
+        slides = len(ppt_builder.compile_plan(plan, BIBLE_DIR))
+
+    print(f"plan        : praise={args.praise} phrases={args.phrases} ({slides} slides)")
+    print(f"no cache    : {no_cache:8.1f} ms / build")
+    print(f"cold        : {cold:8.1f} ms / build (render + fill cache)")
+    print(f"edit (mem)  : {edit_mem:8.1f} ms / build  ({no_cache / edit_mem:4.1f}x)")
+    print(f"edit (disk) : {edit_disk:8.1f} ms / build  ({no_cache / edit_disk:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+슬라이드 수에 따른 렌더링 시간: python-pptx add_slide vs SlideEmitter (PPT_FAST_EMIT).
+
+가사/본문 슬라이드를 섞어서 N장짜리 덱을 만들고, 렌더링과 저장 시간을 따로 잰다.
+두 방식으로 만든 파일의 zip 파트가 모두 같은지도 확인.
+
+    python -m bench.bench_slide_engine
+    python -m bench.bench_slide_engine --sizes 100 500 2000 --repeat 3
+"""
+import argparse
+import io
+import os
+import statistics
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+from unittest import mock
+
+from bench.synthetic_template import build_synthetic_template
+from services import ppt_builder
+from services.slide_plan import L0_BIBLE_PHRASE, L1_WORSHIP_LYR, L1_WORSHIP_TITLE, M0, M1, SlideSpec
+
+
+def synthetic_specs(n: int) -> list[SlideSpec]:
+    specs = []
+    for i in range(n):
+        kind = i % 10
+        if kind == 0:
+            specs.append(SlideSpec(M1, L1_WORSHIP_TITLE, ((10, f"찬양 {i}"), (11, "Praise"))))
+        elif kind < 7:
+            specs.append(SlideSpec(M1, L1_WORSHIP_LYR, ((10, f"{i}번째 가사 첫 줄\n{i}번째 가사 둘째 줄"),)))
+        else:
+            specs.append(SlideSpec(M0, L0_BIBLE_PHRASE, ((10, f"본문 {i} " * 8), (11, f"시편 119장 {i}절"))))
+    return specs
+
+
+def _build(template: Path, specs: list[SlideSpec], fast: bool) -> tuple[float, float, bytes]:
+    with mock.patch.dict(os.environ, {"PPT_FAST_EMIT": "1" if fast else "0"}):
+        p = ppt_builder.load_template(template)
+        t0 = time.perf_counter()
+        ppt_builder.render_slides(p, specs, None, ppt_builder.template_version(template))
+        t1 = time.perf_counter()
+        buf = io.BytesIO()
+        p.save(buf)
+        t2 = time.perf_counter()
+    return (t1 - t0) * 1000, (t2 - t1) * 1000, buf.getvalue()
+
+
+def _same_parts(a: bytes, b: bytes) -> bool:
+    za, zb = zipfile.ZipFile(io.BytesIO(a)), zipfile.ZipFile(io.BytesIO(b))
+    names = za.namelist()
+    return names == zb.namelist() and all(za.read(n) == zb.read(n) for n in names)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--template", type=Path, default=None)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[100, 500, 2000])
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        template = args.template or build_synthetic_template(Path(tmp) / "template.pptx")
+        _build(template, synthetic_specs(10), True)  # 템플릿 캐시/skeleton 데움
+
+        print(f"{'slides':>7s} {'add_slide ms':>13s} {'fast ms':>9s} {'speedup':>8s} {'save ms':>8s} {'us/slide (fast)':>16s} identical")
+        for n in args.sizes:
+            specs = synthetic_specs(n)
+            slow = [_build(template, specs, False) for _ in range(args.repeat)]
+            fast = [_build(template, specs, True) for _ in range(args.repeat)]
+            slow_ms = statistics.median(r[0] for r in slow)
+            fast_ms = statistics.median(r[0] for r in fast)
+            save_ms = statistics.median(r[1] for r in fast)
+            same = _same_parts(slow[0][2], fast[0][2])
+            print(
+                f"{n:7d} {slow_ms:13.1f} {fast_ms:9.1f} {slow_ms / fast_ms:7.1f}x {save_ms:8.1f}"
+                f" {fast_ms / n * 1000:16.1f} {same}"
+            )
+
+
+if __name__ == "__main__":
+    main()
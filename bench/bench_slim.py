@@ -0,0 +1,80 @@
+"""
+덱 하나당 크기/생성 시간: 기본 저장 vs slim 모드(PPT_SLIM) / zip 레벨(PPT_ZIP_LEVEL).
+
+합성 템플릿은 레이아웃마다 배경 이미지를 넣어서(같은 이미지도 레이아웃마다 따로) 실제 템플릿과 비슷하게 만듦.
+덱이 쓰는 레이아웃은 plan 에 따라 일부뿐이라 나머지 레이아웃/이미지가 slim 에서 빠짐.
+
+    python -m bench.bench_slim
+    python -m bench.bench_slim --template thepureum.pptx --repeat 5
+"""
+import argparse
+import io
+import os
+import statistics
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+from unittest import mock
+
+from pptx import Presentation
+
+from bench.suite import BIBLE_DIR, synthetic_plan
+from bench.synthetic_template import build_synthetic_template
+from services import ppt_builder
+
+MODES = [
+    ("default", {}),
+    ("zip level 1", {"PPT_ZIP_LEVEL": "1"}),
+    ("slim", {"PPT_SLIM": "1"}),
+    ("slim + level 1", {"PPT_SLIM": "1", "PPT_ZIP_LEVEL": "1"}),
+    ("slim + level 9", {"PPT_SLIM": "1", "PPT_ZIP_LEVEL": "9"}),
+]
+
+
+def _build(plan: dict, template: Path, env: dict) -> tuple[float, bytes]:
+    with mock.patch.dict(os.environ, {"SECTION_CACHE_ENABLED": "0", **env}):
+        t0 = time.perf_counter()
+        buf = ppt_builder.build_ppt_buffer(plan, template, BIBLE_DIR)
+        ms = (time.perf_counter() - t0) * 1000
+    try:
+        return ms, buf.read()
+    finally:
+        buf.close()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--template", type=Path, default=None)
+    ap.add_argument("--backgrounds", type=int, default=6, help="합성 템플릿의 서로 다른 배경 이미지 수")
+    ap.add_argument("--praise", type=int, default=5)
+    ap.add_argument("--phrases", type=int, default=3)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        template = args.template or build_synthetic_template(
+            Path(tmp) / "template.pptx", layout_backgrounds=args.backgrounds
+        )
+        plan = synthetic_plan(args.praise, args.phrases)
+        _build(plan, template, {})  # 템플릿 캐시/성경 인덱스 데움
+
+        print(f"template: {template.stat().st_size / 1024:.0f} KB")
+        print(f"{'mode':16s} {'KB':>8s} {'ms':>8s} {'saved KB':>9s} {'saved ms':>9s} {'parts':>6s} slides")
+        base = None
+        for name, env in MODES:
+            samples = [_build(plan, template, env) for _ in range(args.repeat)]
+            ms = statistics.median(s[0] for s in samples)
+            data = samples[0][1]
+            parts = len(zipfile.ZipFile(io.BytesIO(data)).namelist())
+            slides = len(Presentation(io.BytesIO(data)).slides)  # 다시 열리는지 확인 겸
+            if base is None:
+                base = (len(data), ms)
+            print(
+                f"{name:16s} {len(data) / 1024:8.0f} {ms:8.1f} {(base[0] - len(data)) / 1024:9.0f}"
+                f" {base[1] - ms:9.1f} {parts:6d} {slides}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+PlanStore get/save 처리량 (여러 스레드 동시 부하).
+- before: 기존 구현 (매 get 마다 파일 읽기 + JSON 파싱, indent=2 로 제자리 쓰기)
+- after : services.store.PlanStore (mtime 확인 LRU + 원자적 쓰기 + compact JSON)
+
+    python -m bench.bench_store
+    python -m bench.bench_store --threads 16 --ops 4000 --read-ratio 0.9
+"""
+import argparse
+import json
+import random
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from services.store import PlanStore
+
+
+class LegacyPlanStore:
+    """변경 전 PlanStore (비교용으로 그대로 옮겨둠)"""
+
+    def __init__(self, base_dir: str = "out/plans"):
+        self.base = Path(base_dir)
+        self.base.mkdir(parents=True, exist_ok=True)
+
+    def _fp(self, plan_id: str) -> Path:
+        return self.base / f"{plan_id}.json"
+
+    def create(self, plan: dict) -> str:
+        plan_id = datetime.now().strftime("%Y%m%d%H%M%S%f")
+        plan["plan_id"] = plan_id
+        self.save(plan_id, plan)
+        return plan_id
+
+    def get(self, plan_id: str) -> dict | None:
+        fp = self._fp(plan_id)
+        if not fp.exists():
+            return None
+        return json.loads(fp.read_text(encoding="utf-8"))
+
+    def save(self, plan_id: str, plan: dict) -> None:
+        fp = self._fp(plan_id)
+        fp.write_text(json.dumps(plan, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def synthetic_plan(praise: int = 5, phrases: int = 3) -> dict:
+    lyrics = "\n".join(f"가사 {j}번째 줄 주님의 은혜가 넘치네" for j in range(30))
+    return {
+        "praise_count": praise,
+        "prayer": "기도 | 홍길동",
+        "sermon_title": "벤치마크 설교",
+        "sermon_phrases": [f"요한복음 {i + 1}장 1-10절" for i in range(phrases)],
+        "songs": {
+            "praise": [{"title": f"찬양 {i}", "artist": "", "lyrics": lyrics} for i in range(praise)],
+            "offering": {"title": "헌금송", "artist": "", "lyrics": lyrics},
+            "closing": {"title": "설후찬", "artist": "", "lyrics": lyrics},
+        },
+        "flags": {"include_offering": True, "include_closing": True},
+    }
+
+
+def run(store, plan_ids: list[str], threads: int, ops: int, read_ratio: float) -> dict:
+    errors = []
+    counts = {"get": 0, "save": 0}
+    lock = threading.Lock()
+
+    def worker(n: int):
+        rnd = random.Random(n)
+        local = {"get": 0, "save": 0}
+        for _ in range(ops // threads):
+            pid = rnd.choice(plan_ids)
+            try:
+                if rnd.random() < read_ratio:
+                    if store.get(pid) is None:
+                        errors.append(pid)
+                    local["get"] += 1
+                else:
+                    plan = store.get(pid)
+                    plan["songs"]["praise"][0]["lyrics"] += "\n추가"
+                    store.save(pid, plan)
+                    local["save"] += 1
+            except Exception as e:  # 제자리 쓰기 중인 파일을 읽으면 JSON 파싱 에러가 남
+                errors.append(repr(e))
+        with lock:
+            for k in counts:
+                counts[k] += local[k]
+
+    ts = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    t0 = time.perf_counter()
+    for t in ts:
+        t.start()
+    for t in ts:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    return {"ops_per_sec": (counts["get"] + counts["save"]) / elapsed, "errors": len(errors), **counts}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--threads", type=int, default=8)
+    ap.add_argument("--ops", type=int, default=2000)
+    ap.add_argument("--plans", type=int, default=20)
+    ap.add_argument("--read-ratio", type=float, default=0.8)
+    args = ap.parse_args()
+
+    for name, cls in (("before", LegacyPlanStore), ("after", PlanStore)):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = cls(base_dir=tmp)
+            plan_ids = [store.create(synthetic_plan()) for _ in range(args.plans)]
+            r = run(store, plan_ids, args.threads, args.ops, args.read_ratio)
+            print(
+                f"{name:6s}: {r['ops_per_sec']:8.0f} ops/s  "
+                f"(get {r['get']}, save {r['save']}, errors {r['errors']}, {args.threads} threads)"
+            )
+
+    # create 동시 호출 시 ID 충돌 확인
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, cls in (("before", LegacyPlanStore), ("after", PlanStore)):
+            store = cls(base_dir=str(Path(tmp) / name))
+            ids, lock = [], threading.Lock()
+
+            def creator():
+                for _ in range(50):
+                    pid = store.create(synthetic_plan(1, 1))
+                    with lock:
+                        ids.append(pid)
+
+            ts = [threading.Thread(target=creator) for _ in range(args.threads)]
+            for t in ts:
+                t.start()
+            for t in ts:
+                t.join()
+            print(f"{name:6s}: create x{len(ids)} → duplicate ids {len(ids) - len(set(ids))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+/generate 응답 경로별 요청당 시간과 peak 메모리(tracemalloc).
+- file  : build_ppt → out/ 에 저장 → 읽어서 전송 → 삭제 (기존 방식)
+- stream: build_ppt_buffer → SpooledTemporaryFile 에서 청크 전송
+
+    python -m bench.bench_stream
+    python -m bench.bench_stream --template thepureum.pptx --songs 10
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from bench.bench_template import BIBLE_DIR, PLAN
+from bench.synthetic_template import build_synthetic_template
+from routers.api_ppt import STREAM_CHUNK, _iter_buffer
+from services.ppt_builder import build_ppt, build_ppt_buffer
+
+
+def _drain_file(fp: Path) -> int:
+    sent = 0
+    with open(fp, "rb") as f:
+        while chunk := f.read(STREAM_CHUNK):
+            sent += len(chunk)
+    os.remove(fp)
+    return sent
+
+
+def _file_path(plan, template, out_dir) -> int:
+    return _drain_file(build_ppt(plan, template, BIBLE_DIR, out_dir))
+
+
+def _stream_path(plan, template, _out_dir) -> int:
+    return sum(len(c) for c in _iter_buffer(build_ppt_buffer(plan, template, BIBLE_DIR)))
+
+
+def _measure(fn, plan, template, out_dir, repeat: int) -> tuple[float, float, int]:
+    fn(plan, template, out_dir)  # warm-up (템플릿 캐시, 성경 인덱스)
+    peaks, times, size = [], [], 0
+    for _ in range(repeat):
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        size = fn(plan, template, out_dir)
+        times.append(time.perf_counter() - t0)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return sum(times) / repeat * 1000, max(peaks) / 1024 / 1024, size
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--template", type=Path, default=None)
+    ap.add_argument("--songs", type=int, default=4)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    plan = dict(PLAN)
+    plan["songs"] = dict(PLAN["songs"])
+    plan["songs"]["praise"] = (PLAN["songs"]["praise"] * args.songs)[: args.songs]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        template = args.template or build_synthetic_template(tmp / "template.pptx")
+        for name, fn in (("file", _file_path), ("stream", _stream_path)):
+            ms, peak_mb, size = _measure(fn, plan, template, tmp / "out", args.repeat)
+            print(f"{name:6s}: {ms:7.1f} ms / request, peak {peak_mb:6.2f} MiB (tracemalloc), deck {size / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
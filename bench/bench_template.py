@@ -0,0 +1,77 @@
+"""
+build_ppt 덱 1개당 시간: 템플릿을 매번 파싱+clear 하던 방식 vs 캐시된 템플릿 사본.
+
+thepureum.pptx 가 없으면 합성 템플릿(bench/synthetic_template.py)으로 잰다.
+
+    python -m bench.bench_template
+    python -m bench.bench_template --template thepureum.pptx --repeat 20
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+from pptx import Presentation
+
+from bench.synthetic_template import build_synthetic_template
+from services import ppt_builder
+
+ROOT = Path(__file__).resolve().parent.parent
+BIBLE_DIR = ROOT / "bible"
+
+PLAN = {
+    "sermon_title": "벤치마크 설교",
+    "prayer": "기도 | 홍길동",
+    "sermon_phrases": ["요한복음 3장 16-21절", "로마서 8장 28-39절"],
+    "songs": {
+        "praise": [
+            {"title": f"찬양 {i}", "lyrics": "\n".join(f"{i}번 곡 {j}번째 줄" for j in range(24))}
+            for i in range(4)
+        ],
+        "offering": {"title": "헌금송", "lyrics": "헌금송 1\n헌금송 2\n\n헌금송 3"},
+        "closing": {"title": "설후찬", "lyrics": "설후찬 1\n설후찬 2"},
+    },
+}
+
+
+def _uncached_load(template_path):
+    """캐시 도입 전: 매 요청마다 템플릿 파싱 + 샘플 슬라이드 제거"""
+    p = Presentation(str(template_path))
+    ppt_builder.clear_all_slides(p)
+    return p
+
+
+def _time_builds(template: Path, out_dir: Path, repeat: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        ppt_builder.build_ppt(PLAN, template, BIBLE_DIR, out_dir)
+    return (time.perf_counter() - t0) / repeat * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--template", type=Path, default=None)
+    ap.add_argument("--repeat", type=int, default=10)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        template = args.template or build_synthetic_template(tmp / "template.pptx")
+        out_dir = tmp / "out"
+
+        # 성경 인덱스는 양쪽 다 미리 데워 둠 (템플릿 차이만 보려고)
+        ppt_builder.build_ppt(PLAN, template, BIBLE_DIR, out_dir)
+
+        with mock.patch.object(ppt_builder, "load_template", _uncached_load):
+            before = _time_builds(template, out_dir, args.repeat)
+        after = _time_builds(template, out_dir, args.repeat)
+
+    print(f"template : {template.name if args.template else 'synthetic'}")
+    print(f"before   : {before:7.1f} ms / deck (parse + clear_all_slides per build)")
+    print(f"after    : {after:7.1f} ms / deck (cached, deepcopy per build)")
+    print(f"saved    : {before - after:7.1f} ms / deck")
+
+
+if __name__ == "__main__":
+    main()
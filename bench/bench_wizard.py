@@ -0,0 +1,337 @@
+"""
+마법사 전체 경로 부하 테스트 (오프라인): 동시 세션 N 개가 브라우저와 같은 순서로 요청을 보냄.
+
+    step1   POST /api/plan/init
+    step2   POST /api/plan/{id}/songs/basic          (크롤링 job 등록)
+    poll    GET  /api/plan/{id}/jobs/{job}            (Step3 화면의 polling, 여러 번)
+    crawl   = step2 제출부터 job 이 끝날 때까지
+    step3   POST /api/plan/{id}/songs/lyrics          (채워진 가사 그대로 저장)
+    preview GET  /api/ppt/{id}/preview                (Step4 화면)
+    step4   POST /api/ppt/{id}/generate
+
+가사는 로컬 멜론 stand-in 에서 가져오고, stand-in 의 지연 분포/장애 비율을 옵션으로 줄 수 있음.
+서버는 임시 디렉터리(out/ 이 거기 생김)에서 uvicorn 으로 띄우거나 --base-url 로 이미 떠 있는 서버를 씀
+(그 서버는 MELON_BASE_URL 이 stand-in 을 가리켜야 함 — `python -m bench.melon_standin` 참고).
+
+단계별 p50/p95/p99 와 오류율, 가사를 못 가져온 곡 비율을 출력.
+HTTP 가 실패한 곡은 서버가 브라우저(Selenium)로 다시 시도하므로 Chromium 이 없는 환경에서는 그 곡이 실패 문구로 채워짐.
+브라우저 경로만 보려면 MELON_HTTP_ENABLED=0 (stand-in 검색 페이지에 상세 이동 스크립트가 있어 Selenium 도 가사까지 감).
+가사 캐시가 켜져 있으면 같은 곡은 처음 한 번만 stand-in 으로 가므로, 장애 비율을 볼 때는 --no-lyrics-cache.
+서버 설정(MELON_HTTP_TIMEOUT_SEC 등)은 이 스크립트의 환경변수가 그대로 넘어감.
+따로 안 주면 멜론 쪽 대기 시간은 SERVER_DEFAULTS 의 짧은 값으로 띄움 (장애 주입 때 브라우저 fallback 이
+기본값인 풀 대기 120초 등을 다 기다리느라 세션이 crawl 타임아웃까지 붙잡히지 않게).
+
+    python -m bench.bench_wizard
+    python -m bench.bench_wizard --sessions 50 --concurrency 10 --latency-ms 150 --jitter 0.6 --error-rate 0.05
+"""
+import argparse
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+from bench.melon_standin import MelonStandin, add_fault_args, fault_options
+from bench.synthetic_template import build_synthetic_template
+from services.melon import is_failed_lyrics
+
+REPO = Path(__file__).resolve().parent.parent
+
+STEPS = ("step1", "step2", "poll", "crawl", "step3", "preview", "step4")
+
+# start_server 가 띄우는 서버의 기본 환경 (이 스크립트의 환경변수가 있으면 그쪽이 우선)
+SERVER_DEFAULTS = {
+    "MELON_HTTP_TIMEOUT_SEC": "3",    # stand-in --slow-ms(기본 10초)보다 짧게
+    "MELON_POOL_TIMEOUT_SEC": "10",   # 브라우저 fallback 이 드라이버를 기다리는 시간
+    "MELON_WAIT_MAX_SEC": "5",        # 브라우저 페이지 readiness 대기
+    "MELON_FLIGHT_WAIT_SEC": "60",    # 같은 곡을 가져오는 다른 요청을 기다리는 시간
+}
+
+
+# ---------- 서버 ----------
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(workdir: Path, template: Path, melon_url: str, *, workers: int = 1, env: dict | None = None):
+    """
+    workdir 에서 uvicorn 을 띄우고 (proc, base_url) 반환. 템플릿 화면/성경은 저장소 것을 링크해서 씀.
+    덱 캐시는 끄고(매번 실제 빌드), 멜론 브라우저는 미리 안 띄움.
+    """
+    workdir.mkdir(parents=True, exist_ok=True)
+    for name in ("templates", "bible"):
+        if not (workdir / name).exists():
+            (workdir / name).symlink_to(REPO / name)
+
+    port = _free_port()
+    env = dict(
+        SERVER_DEFAULTS,
+        **os.environ,
+        PYTHONPATH=str(REPO),
+        WEB_WORKERS=str(workers),
+        PPT_TEMPLATE=str(template),
+        MELON_BASE_URL=melon_url,
+        MELON_POOL_WARM="0",
+        DECK_CACHE_ENABLED="0",
+        METRICS_DUMP_INTERVAL_SEC="1",
+        **(env or {}),
+    )
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app:app", "--app-dir", str(REPO),
+         "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        cwd=workdir, env=env,
+        start_new_session=True,  # 빌드 풀 worker 까지 한 번에 정리하려고 프로세스 그룹을 따로
+    )
+    base = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            if requests.get(base + "/metrics", timeout=1).ok:
+                return proc, base
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    stop_server(proc)
+    raise RuntimeError("server did not start")
+
+
+def stop_server(proc: subprocess.Popen) -> None:
+    """uvicorn 과, 그 아래 빌드 풀 worker(spawn 이라 부모가 끝나도 남을 수 있음)까지 종료"""
+    proc.terminate()
+    try:
+        proc.wait(timeout=20)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+# ---------- 세션 ----------
+
+class SessionFailed(Exception):
+    def __init__(self, step: str, reason: str):
+        super().__init__(f"{step}: {reason}")
+        self.step = step
+
+
+def wizard_session(
+    sess: requests.Session,
+    base: str,
+    songs: list[dict],
+    record,
+    *,
+    poll_interval: float = 0.2,
+    crawl_timeout: float = 300.0,
+) -> int:
+    """
+    Step1 → Step4 한 바퀴. 요청마다 record(step, ms) 를 부르고, 실패하면 SessionFailed.
+    가사를 못 가져온 곡 수를 반환.
+    """
+
+    def _call(step: str, fn):
+        t0 = time.perf_counter()
+        try:
+            r = fn()
+        except requests.RequestException as e:
+            raise SessionFailed(step, type(e).__name__) from e
+        record(step, (time.perf_counter() - t0) * 1000)
+        if r.status_code >= 400:
+            raise SessionFailed(step, f"HTTP {r.status_code}")
+        return r
+
+    def _redirect_param(step: str, r, name: str) -> str:
+        values = parse_qs(urlparse(r.headers.get("location", "")).query).get(name)
+        if not values:
+            raise SessionFailed(step, f"no {name} in redirect")
+        return values[0]
+
+    r = _call("step1", lambda: sess.post(
+        f"{base}/api/plan/init",
+        data={"praise_count": len(songs), "sermon_title": "부하 테스트", "sermon_phrases_raw": "요 3:16\n시 23:1"},
+        allow_redirects=False,
+    ))
+    plan_id = _redirect_param("step1", r, "plan_id")
+
+    form = {}
+    for i, s in enumerate(songs):
+        form[f"praise_title_{i}"], form[f"praise_artist_{i}"] = s["title"], s["artist"]
+    t0 = time.perf_counter()
+    r = _call("step2", lambda: sess.post(f"{base}/api/plan/{plan_id}/songs/basic", data=form, allow_redirects=False))
+    job_id = _redirect_param("step2", r, "job_id")
+
+    # Step3 polling: 브라우저처럼 매번 새 요청 (worker 가 여럿이면 다른 worker 로도 감)
+    while True:
+        job = _call("poll", lambda: requests.get(f"{base}/api/plan/{plan_id}/jobs/{job_id}", timeout=10)).json()
+        if job["status"] not in ("queued", "running"):
+            break
+        if time.perf_counter() - t0 > crawl_timeout:
+            record("crawl", (time.perf_counter() - t0) * 1000)
+            raise SessionFailed("crawl", "timeout")
+        time.sleep(poll_interval)
+    record("crawl", (time.perf_counter() - t0) * 1000)
+    if job["status"] != "done":
+        raise SessionFailed("crawl", job.get("error") or job["status"])
+
+    lyrics = {s["field"]: s["lyrics"] or "" for s in job["songs"]}
+    failed = sum(1 for text in lyrics.values() if is_failed_lyrics(text))
+    _call("step3", lambda: sess.post(f"{base}/api/plan/{plan_id}/songs/lyrics", data=lyrics, allow_redirects=False))
+
+    _call("preview", lambda: sess.get(f"{base}/api/ppt/{plan_id}/preview"))
+    r = _call("step4", lambda: sess.post(f"{base}/api/ppt/{plan_id}/generate"))
+    if not r.content.startswith(b"PK"):
+        raise SessionFailed("step4", "not a pptx")
+    return failed
+
+
+class LoadResult:
+    def __init__(self):
+        self.samples: dict[str, list[float]] = {k: [] for k in STEPS}
+        self.errors: dict[str, int] = {k: 0 for k in STEPS}
+        self.reasons: dict[str, int] = {}
+        self.sessions = 0
+        self.failed_sessions = 0
+        self.songs = 0
+        self.failed_songs = 0
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, step: str, ms: float) -> None:
+        with self._lock:
+            self.samples[step].append(ms)
+
+    def finish(self, songs: int, failed_songs: int | None, error: SessionFailed | None) -> None:
+        with self._lock:
+            self.sessions += 1
+            if error is not None:
+                self.failed_sessions += 1
+                self.errors[error.step] += 1
+                self.reasons[str(error)] = self.reasons.get(str(error), 0) + 1
+            else:
+                self.songs += songs
+                self.failed_songs += failed_songs
+
+
+def run_load(
+    base: str,
+    catalog: list[dict],
+    *,
+    concurrency: int,
+    sessions: int | None = None,
+    duration: float | None = None,
+    songs_per_session: int = 4,
+) -> LoadResult:
+    """동시 concurrency 개로 세션을 sessions 번(또는 duration 초 동안) 돌림"""
+    result = LoadResult()
+    counter = iter(range(sessions if sessions is not None else 1 << 62))
+    counter_lock = threading.Lock()
+    stop_at = time.perf_counter() + duration if duration is not None else None
+
+    def _next() -> int | None:
+        if stop_at is not None and time.perf_counter() >= stop_at:
+            return None
+        with counter_lock:
+            return next(counter, None)
+
+    def _client() -> None:
+        sess = requests.Session()
+        while (n := _next()) is not None:
+            songs = [catalog[(n * songs_per_session + k) % len(catalog)] for k in range(songs_per_session)]
+            try:
+                failed = wizard_session(sess, base, songs, result.record)
+                result.finish(len(songs), failed, None)
+            except SessionFailed as e:
+                result.finish(len(songs), None, e)
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as ex:
+        for f in [ex.submit(_client) for _ in range(concurrency)]:
+            f.result()
+    result.elapsed = time.perf_counter() - t0
+    return result
+
+
+def pct(values: list[float], q: int) -> float:
+    if not values:
+        return float("nan")
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+def report(result: LoadResult) -> None:
+    print(f"{'step':8s} {'n':>6s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s} {'errors':>7s} {'err %':>6s}")
+    for step in STEPS:
+        values = result.samples[step]
+        attempts = len(values) + (result.errors[step] if step != "crawl" else 0)
+        rate = result.errors[step] / attempts * 100 if attempts else 0.0
+        print(
+            f"{step:8s} {len(values):6d} {pct(values, 50):9.1f} {pct(values, 95):9.1f} {pct(values, 99):9.1f}"
+            f" {result.errors[step]:7d} {rate:6.1f}"
+        )
+    ok = result.sessions - result.failed_sessions
+    print(
+        f"sessions: {result.sessions} in {result.elapsed:.1f}s ({result.sessions / result.elapsed:.2f}/s),"
+        f" failed {result.failed_sessions} ({result.failed_sessions / max(1, result.sessions) * 100:.1f}%)"
+    )
+    if ok:
+        print(
+            f"songs without lyrics: {result.failed_songs}/{result.songs}"
+            f" ({result.failed_songs / max(1, result.songs) * 100:.1f}%)"
+        )
+    for reason, n in sorted(result.reasons.items(), key=lambda kv: -kv[1])[:5]:
+        print(f"  {n:4d} x {reason}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sessions", type=int, default=40, help="돌릴 세션 수")
+    ap.add_argument("--concurrency", type=int, default=8, help="동시에 도는 세션 수")
+    ap.add_argument("--songs", type=int, default=4, help="세션 하나의 찬양 곡 수")
+    ap.add_argument("--workers", type=int, default=1, help="서버를 띄울 때 uvicorn worker 수")
+    ap.add_argument("--base-url", default=None, help="이미 떠 있는 서버 (없으면 임시 디렉터리에서 띄움)")
+    ap.add_argument("--template", type=Path, default=None)
+    ap.add_argument("--no-lyrics-cache", action="store_true", help="서버 가사 캐시를 끔 (모든 곡이 stand-in 으로)")
+    add_fault_args(ap, latency_ms=100.0)
+    args = ap.parse_args()
+
+    with MelonStandin(**fault_options(args)) as srv, tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        proc = None
+        base = args.base_url
+        if base is None:
+            template = args.template or build_synthetic_template(tmp / "template.pptx")
+            env = {"LYRICS_CACHE_ENABLED": "0"} if args.no_lyrics_cache else None
+            proc, base = start_server(tmp / "server", template, srv.base_url, workers=args.workers, env=env)
+        try:
+            print(
+                f"{args.sessions} sessions x {args.songs} songs, concurrency {args.concurrency}, server {base}"
+                f" ({args.workers} worker), melon latency {args.latency_ms:.0f} ms jitter {args.jitter},"
+                f" error {args.error_rate:.0%} drop {args.drop_rate:.0%} slow {args.slow_rate:.0%}"
+            )
+            result = run_load(
+                base, srv.catalog, concurrency=args.concurrency, sessions=args.sessions, songs_per_session=args.songs
+            )
+        finally:
+            if proc is not None:
+                stop_server(proc)
+
+        report(result)
+        print(f"melon stand-in: {srv.requests} requests, injected {srv.faults}")
+
+
+if __name__ == "__main__":
+    main()
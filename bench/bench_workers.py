@@ -0,0 +1,81 @@
+"""
+uvicorn worker 수(WEB_WORKERS)를 1 → N 으로 늘렸을 때의 처리량/지연.
+
+임시 디렉터리에서 실제 서버를 `uvicorn --workers N` 으로 띄우고 (out/ 이 거기 생김, 멜론 브라우저는 안 띄움),
+--clients 개 클라이언트가 --duration 초 동안 마법사 한 바퀴(bench_wizard 와 같은 세션)를 계속 돎.
+가사는 로컬 멜론 stand-in 에서 가져옴.
+- job polling 은 매번 새 연결이라 제출한 worker 가 아닌 곳으로도 감 → job 상태가 공유 안 되면 errors 로 잡힘
+- 끝나면 /metrics 를 아무 worker 에서나 읽어서, worker 끼리 합친 ppt_decks_total 이 보낸 생성 요청 수와 맞는지 확인
+
+CPU 코어가 worker 수보다 적으면 처리량은 거의 안 늘어남 (os.cpu_count() 를 같이 출력).
+
+    python -m bench.bench_workers
+    python -m bench.bench_workers --workers 1,2,4 --clients 16 --duration 20
+"""
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import requests
+
+from bench.bench_wizard import pct, run_load, start_server, stop_server
+from bench.melon_standin import MelonStandin
+from bench.synthetic_template import build_synthetic_template
+
+SONGS_PER_SESSION = 4
+# 표에 보여 줄 단계 (crawl = Step2 제출부터 job 이 끝날 때까지)
+STEPS = ("step2", "poll", "crawl", "preview", "step4")
+
+
+def _merged_count(base: str, name: str) -> float:
+    """worker 여럿이 기록한 counter 를 아무 worker 에서 읽었을 때의 합"""
+    text = requests.get(base + "/metrics", timeout=5).text
+    return sum(float(line.rsplit(" ", 1)[1]) for line in text.splitlines() if line.startswith(name))
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--workers", default="1,2,4", help="쉼표로 구분한 worker 수 목록")
+    ap.add_argument("--clients", type=int, default=8)
+    ap.add_argument("--duration", type=float, default=15.0)
+    ap.add_argument("--latency-ms", type=float, default=100.0, help="멜론 stand-in 응답 지연")
+    ap.add_argument("--template", type=Path, default=None)
+    args = ap.parse_args()
+
+    print(f"cpu_count: {os.cpu_count()}, clients {args.clients}, {args.duration:.0f}s per run,"
+          f" {SONGS_PER_SESSION} songs/session, melon latency {args.latency_ms:.0f} ms")
+    print(f"{'workers':>7s} {'sess/s':>7s} {'errors':>6s} " + " ".join(f"{k + ' p50/p95':>17s}" for k in STEPS)
+          + f" {'decks metric/sent':>17s}")
+
+    with MelonStandin(latency_ms=args.latency_ms) as srv, tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        template = args.template or build_synthetic_template(tmp / "template.pptx")
+        for n in [int(x) for x in args.workers.split(",")]:
+            # worker 수마다 빈 out/ 에서 시작 (가사 캐시/job DB 도 새로)
+            proc, base = start_server(tmp / f"w{n}", template, srv.base_url, workers=n)
+            try:
+                # 워밍업: worker 마다 템플릿/성경 인덱스를 올림
+                run_load(base, srv.catalog, concurrency=n * 2, duration=3.0, songs_per_session=SONGS_PER_SESSION)
+                time.sleep(2.0)  # 워밍업 때 쌓인 값이 다른 worker 의 스냅샷에도 반영되게
+                before = _merged_count(base, "ppt_decks_total")
+                result = run_load(
+                    base, srv.catalog,
+                    concurrency=args.clients, duration=args.duration, songs_per_session=SONGS_PER_SESSION,
+                )
+                time.sleep(2.0)  # 다른 worker 의 지표 스냅샷이 갱신될 때까지
+                decks = _merged_count(base, "ppt_decks_total") - before
+            finally:
+                stop_server(proc)
+
+            s = result.samples
+            cols = " ".join(f"{pct(s[k], 50):8.1f}/{pct(s[k], 95):<8.1f}" for k in STEPS)
+            print(
+                f"{n:7d} {result.sessions / result.elapsed:7.2f} {result.failed_sessions:6d} {cols}"
+                f" {decks:9.0f}/{len(s['step4'])}"
+            )
+
+
+if __name__ == "__main__":
+    main()
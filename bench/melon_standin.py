@@ -0,0 +1,275 @@
+"""
+오프라인 벤치마크/파서 확인용 멜론 stand-in HTTP 서버.
+
+bench/fixtures/melon/ 의 페이지(멜론 검색/상세 페이지 마크업을 본뜬 것)에
+songs.json 카탈로그를 채워서 돌려줌. 가사는 저작권 문제로 곡마다 만든 더미 가사.
+
+부하 테스트용으로 응답 지연 분포와 장애를 흉내낼 수 있음.
+- latency_ms / jitter : 지연 중앙값과 로그정규 분포 sigma (0 이면 고정 지연)
+- error_rate          : 503 으로 응답하는 비율
+- drop_rate           : 응답 없이 연결을 끊는 비율
+- slow_rate / slow_ms : slow_ms 만큼 더 늦게 응답하는 비율 (HTTP 타임아웃 경로 확인용)
+
+    python -m bench.melon_standin --port 8765 --latency-ms 80
+    python -m bench.melon_standin --port 8765 --latency-ms 80 --jitter 0.5 --error-rate 0.05
+    MELON_BASE_URL=http://127.0.0.1:8765/ uvicorn app:app
+"""
+import argparse
+import json
+import math
+import random
+import socket
+import threading
+import time
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "melon"
+
+
+def _read(name: str) -> str:
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+
+def load_catalog() -> list[dict]:
+    return json.loads(_read("songs.json"))
+
+
+def song_lyrics(song: dict) -> str:
+    """카탈로그 곡의 더미 가사 (절 사이 빈 줄)"""
+    stanzas = []
+    for k in range(1, song["stanzas"] + 1):
+        stanzas.append("\n".join(f"{song['title']} {k}절 {j}번째 줄" for j in range(1, 5)))
+    return "\n\n".join(stanzas)
+
+
+def _fill(template: str, **values) -> str:
+    for k, v in values.items():
+        template = template.replace("{" + k + "}", str(v))
+    return template
+
+
+class MelonStandin:
+    """
+    with MelonStandin(latency_ms=50) as srv:
+        os.environ["MELON_BASE_URL"] = srv.base_url
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        latency_ms: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        drop_rate: float = 0.0,
+        slow_rate: float = 0.0,
+        slow_ms: float = 10000.0,
+        seed: int | None = None,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self.slow_rate = slow_rate
+        self.slow_ms = slow_ms
+        self.catalog = load_catalog()
+        self.requests = 0
+        self.faults = {"error": 0, "drop": 0, "slow": 0}
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._templates = {
+            name: _read(f"{name}.html")
+            for name in ("_header", "home", "search_song", "search_song_row", "song_detail")
+        }
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    # ---------- 페이지 ----------
+
+    def _header(self, query: str = "") -> str:
+        return _fill(self._templates["_header"], query=escape(query))
+
+    def search(self, query: str) -> list[dict]:
+        tokens = query.casefold().split()
+        return [
+            s for s in self.catalog
+            if tokens and all(t in f"{s['title']} {s['artist']}".casefold() for t in tokens)
+        ]
+
+    def render_home(self) -> str:
+        return _fill(self._templates["home"], header=self._header())
+
+    def render_search(self, query: str) -> str:
+        hits = self.search(query)
+        rows = "".join(
+            _fill(
+                self._templates["search_song_row"],
+                no=n,
+                song_id=s["song_id"],
+                title=escape(s["title"]),
+                artist=escape(s["artist"]),
+            )
+            for n, s in enumerate(hits, start=1)
+        )
+        no_result = "" if hits else '      <p class="no_data">검색결과가 없습니다.</p>'
+        return _fill(
+            self._templates["search_song"],
+            header=self._header(query),
+            query=escape(query),
+            count=len(hits),
+            rows=rows,
+            no_result=no_result,
+        )
+
+    def render_detail(self, song_id: str) -> str | None:
+        song = next((s for s in self.catalog if s["song_id"] == song_id), None)
+        if song is None:
+            return None
+        lyrics_html = "<br>".join(escape(line) for line in song_lyrics(song).split("\n"))
+        return _fill(
+            self._templates["song_detail"],
+            header=self._header(),
+            title=escape(song["title"]),
+            artist=escape(song["artist"]),
+            lyrics_html=lyrics_html,
+        )
+
+    def route(self, path: str, query: dict) -> tuple[int, str]:
+        q = (query.get("q") or [""])[0]
+        if path in ("/", "/index.htm"):
+            return 200, self.render_home()
+        if path in ("/search/song/index.htm", "/search/total/index.htm"):
+            return 200, self.render_search(q)
+        if path == "/song/detail.htm":
+            page = self.render_detail((query.get("songId") or [""])[0])
+            return (200, page) if page else (404, "not found")
+        return 404, "not found"
+
+    # ---------- 지연/장애 ----------
+
+    def _draw(self) -> tuple[str | None, float]:
+        """요청 하나에 대해 (장애 종류 또는 None, 지연 초)"""
+        with self._rng_lock:
+            self.requests += 1
+            delay = self.latency_ms
+            if self.jitter and delay:
+                delay *= math.exp(self._rng.gauss(0.0, self.jitter))
+            r = self._rng.random()
+            fault = None
+            for name, rate in (("error", self.error_rate), ("drop", self.drop_rate), ("slow", self.slow_rate)):
+                if r < rate:
+                    fault = name
+                    self.faults[name] += 1
+                    break
+                r -= rate
+        if fault == "slow":
+            delay += self.slow_ms
+        return fault, delay / 1000
+
+    # ---------- 서버 ----------
+
+    def _handler_class(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+
+            def setup(self):
+                super().setup()
+                # 헤더/본문이 따로 나가서 Nagle + delayed ACK(40ms)에 걸리지 않게
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def do_GET(self):
+                fault, delay = standin._draw()
+                if delay:
+                    time.sleep(delay)
+                if fault == "drop":
+                    self.close_connection = True
+                    return
+                if fault == "error":
+                    status, body = 503, "service unavailable"
+                else:
+                    url = urlparse(self.path)
+                    status, body = standin.route(url.path, parse_qs(url.query))
+                data = body.encode("utf-8")
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "text/html; charset=UTF-8")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    # 클라이언트가 먼저 포기함 (slow 응답이 타임아웃에 걸린 경우)
+                    self.close_connection = True
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "MelonStandin":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def add_fault_args(ap: argparse.ArgumentParser, latency_ms: float = 0.0) -> None:
+    """stand-in 지연/장애 옵션 (다른 벤치마크에서도 같은 이름으로 씀)"""
+    ap.add_argument("--latency-ms", type=float, default=latency_ms, help="멜론 응답 지연 중앙값")
+    ap.add_argument("--jitter", type=float, default=0.0, help="지연 로그정규 분포 sigma (0 이면 고정)")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="503 응답 비율")
+    ap.add_argument("--drop-rate", type=float, default=0.0, help="응답 없이 연결 끊는 비율")
+    ap.add_argument("--slow-rate", type=float, default=0.0, help="--slow-ms 만큼 더 늦는 응답 비율")
+    ap.add_argument("--slow-ms", type=float, default=10000.0)
+    ap.add_argument("--seed", type=int, default=None)
+
+
+def fault_options(args: argparse.Namespace) -> dict:
+    return {
+        "latency_ms": args.latency_ms,
+        "jitter": args.jitter,
+        "error_rate": args.error_rate,
+        "drop_rate": args.drop_rate,
+        "slow_rate": args.slow_rate,
+        "slow_ms": args.slow_ms,
+        "seed": args.seed,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    add_fault_args(ap)
+    args = ap.parse_args()
+
+    srv = MelonStandin(args.host, args.port, **fault_options(args))
+    print(f"melon stand-in on {srv.base_url}")
+    try:
+        srv._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+"""
+덱 생성 핫패스 벤치마크 모음 (오프라인, 합성 plan 사용).
+
+- build_ppt       : 찬양 1~20곡 x 본문 1~10구절, 전체 생성 + 저장 (구간 캐시 없이)
+- build_ppt_cached: 같은 plan 을 다시 만들 때 (임시 디렉터리의 구간 캐시가 찬 상태)
+- add_song_section: 가사 줄 수별 (긴 가사)
+- resolve_refs    : 설교 본문 목록 해석 (덱 생성이 쓰는 경로). cold = 책 인덱스/장 길이 비운 상태, warm = 있음
+- scroll_bible    : 시편/예레미야 큰 장 (cold = 인덱스 비운 상태, warm = 인덱스 있음)
+- parse_range     : 구절 문자열 파싱
+- PlanStore       : get(캐시 hit / 다른 worker 가 바꾼 뒤) / save
+
+결과는 JSON 으로 저장하고, --compare 로 저장해 둔 baseline 과 비교해서 느려진 항목을 표시.
+느려진 항목이 있으면 종료 코드 1.
+
+    python -m bench.suite --out bench_results.json
+    python -m bench.suite --out new.json --compare bench_results.json --threshold 0.15
+    python -m bench.suite --filter scroll_bible --repeat 20
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from unittest import mock
+
+from bench.synthetic_template import build_synthetic_template
+from services import bible, bible_refs, ppt_builder
+from services.bible import parse_range, scroll_bible
+from services.bible_refs import resolve_refs
+from services.section_cache import SectionCache
+from services.store import PlanStore
+
+ROOT = Path(__file__).resolve().parent.parent
+BIBLE_DIR = ROOT / "bible"
+
+PRAISE_SIZES = [1, 5, 10, 20]
+PHRASE_SIZES = [1, 5, 10]
+LYRIC_LINES = [40, 200, 1000]
+
+# 본문 후보 (큰 책 위주로 돌려 씀)
+PHRASES = [
+    "시편 119장 1-40절",
+    "예레미야 31장 1-40절",
+    "시편 23장 1-6절",
+    "예레미야 52장 1-34절",
+    "요한복음 3장 16-21절",
+    "이사야 53장 1-12절",
+    "로마서 8장 28-39절",
+    "시편 150장 1-6절",
+    "예레미야 29장 10-14절",
+    "마태복음 5장 1-16절",
+]
+
+# resolve_refs: 기존 형식 10줄 / 장 단위·장 넘김·약어 (장 길이 조회가 필요한 것들)
+REF_CASES = [
+    ("phrases=10", PHRASES),
+    ("extended", ["시편 119편", "요 3:16-4:2", "롬 8:28-39; 12:1-2", "이사야 53-54장", "시 23"]),
+]
+
+BIBLE_CASES = [
+    ("시편", 119, 1, 176),
+    ("시편", 23, 1, 6),
+    ("예레미야", 31, 1, 40),
+    ("예레미야", 52, 1, 34),
+]
+
+
+def synthetic_lyrics(lines: int) -> str:
+    # 4줄마다 빈 줄 → 실제 가사처럼 절 구분이 있게
+    out = []
+    for j in range(lines):
+        out.append(f"가사 {j}번째 줄 주님의 은혜가 넘치네")
+        if j % 4 == 3:
+            out.append("")
+    return "\n".join(out)
+
+
+def synthetic_plan(praise: int, phrases: int, lyric_lines: int = 30) -> dict:
+    lyrics = synthetic_lyrics(lyric_lines)
+    return {
+        "praise_count": praise,
+        "prayer": "기도 | 홍길동",
+        "sermon_title": "벤치마크 설교",
+        "sermon_phrases": [PHRASES[i % len(PHRASES)] for i in range(phrases)],
+        "songs": {
+            "praise": [{"title": f"찬양 {i}", "artist": "", "lyrics": lyrics} for i in range(praise)],
+            "offering": {"title": "헌금송", "artist": "", "lyrics": lyrics},
+            "closing": {"title": "설후찬", "artist": "", "lyrics": lyrics},
+        },
+        "flags": {"include_offering": True, "include_closing": True},
+    }
+
+
+def measure(fn, *, repeat: int, setup=None, number: int = 1, warmup: int = 1) -> dict:
+    """
+    setup() 의 반환값을 fn 에 넘겨 repeat 번 잼 (setup 시간은 제외).
+    number 는 한 번 잴 때 fn 을 몇 번 돌릴지 (아주 짧은 함수용), 결과는 1회당 ms.
+    """
+    for _ in range(warmup):
+        fn(setup() if setup else None)
+
+    samples = []
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn(arg)
+        samples.append((time.perf_counter() - t0) / number * 1000)
+
+    samples.sort()
+    return {
+        "median_ms": statistics.median(samples),
+        "min_ms": samples[0],
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "repeat": repeat,
+        "number": number,
+    }
+
+
+def cases(template: Path, work: Path, repeat: int):
+    """(이름, 측정 함수) 목록. 측정 함수는 결과 dict 를 반환"""
+    out_dir = work / "out"
+
+    def _build(plan: dict, cache: SectionCache | None) -> dict:
+        # 실제 out/section_cache 는 쓰지 않음 (돌릴 때마다 캐시 상태가 달라 baseline 비교가 안 됨)
+        with mock.patch.object(ppt_builder, "get_section_cache", lambda: cache):
+            return measure(lambda _: ppt_builder.build_ppt(plan, template, BIBLE_DIR, out_dir), repeat=repeat)
+
+    for praise in PRAISE_SIZES:
+        for phrases in PHRASE_SIZES:
+            plan = synthetic_plan(praise, phrases)
+            yield (
+                f"build_ppt/praise={praise}/phrases={phrases}",
+                lambda plan=plan: _build(plan, None),
+            )
+            # 워밍업 1회가 캐시를 채우므로 측정은 전부 hit
+            yield (
+                f"build_ppt_cached/praise={praise}/phrases={phrases}",
+                lambda plan=plan, d=work / f"section_cache_{praise}_{phrases}": _build(plan, SectionCache(str(d))),
+            )
+
+    for lines in LYRIC_LINES:
+        song = {"title": "긴 찬양_1", "lyrics": synthetic_lyrics(lines)}
+        yield (
+            f"add_song_section/lines={lines}",
+            lambda song=song: measure(
+                lambda p: ppt_builder.add_song_section(p, "Praise", song),
+                setup=lambda: ppt_builder.load_template(template),
+                repeat=repeat,
+            ),
+        )
+
+    def _cold_refs():
+        with bible._INDEX_LOCK:
+            bible._BOOK_INDEX.clear()
+        with bible_refs._CHAPTER_LOCK:
+            bible_refs._CHAPTER_LEN.clear()
+
+    for name, phrases in REF_CASES:
+        yield (
+            f"resolve_refs/cold/{name}",
+            lambda phrases=phrases: measure(lambda _: resolve_refs(BIBLE_DIR, phrases), setup=_cold_refs, repeat=repeat),
+        )
+        yield (
+            f"resolve_refs/warm/{name}",
+            lambda phrases=phrases: measure(lambda _: resolve_refs(BIBLE_DIR, phrases), repeat=repeat, number=20),
+        )
+
+    for book, ch, sv, ev in BIBLE_CASES:
+        args = (BIBLE_DIR, book, ch, sv, ev)
+
+        def _cold_setup():
+            with bible._INDEX_LOCK:
+                bible._BOOK_INDEX.clear()
+
+        yield (
+            f"scroll_bible/cold/{book}/{ch}",
+            lambda args=args, setup=_cold_setup: measure(lambda _: scroll_bible(*args), setup=setup, repeat=repeat),
+        )
+        yield (
+            f"scroll_bible/warm/{book}/{ch}",
+            lambda args=args: measure(lambda _: scroll_bible(*args), repeat=repeat, number=200),
+        )
+
+    yield (
+        "parse_range/x1000",
+        lambda: measure(lambda _: [parse_range(ph) for ph in PHRASES * 100], repeat=repeat),
+    )
+
+    for praise in (1, 20):
+        store = PlanStore(base_dir=str(work / f"plans_{praise}"))
+        plan = synthetic_plan(praise, 10)
+        plan_id = store.create(plan)
+
+        def _touch(store=store, plan_id=plan_id):
+            # 다른 worker 가 저장한 상황 흉내 (버전이 바뀌어 캐시 miss)
+            os.utime(store._fp(plan_id), ns=(time.time_ns(), time.time_ns()))
+
+        yield (
+            f"plan_store/get_cached/praise={praise}",
+            lambda store=store, plan_id=plan_id: measure(lambda _: store.get(plan_id), repeat=repeat, number=200),
+        )
+        yield (
+            f"plan_store/get_reload/praise={praise}",
+            lambda store=store, plan_id=plan_id, touch=_touch: measure(
+                lambda _: store.get(plan_id), setup=touch, repeat=repeat * 10
+            ),
+        )
+        yield (
+            f"plan_store/save/praise={praise}",
+            lambda store=store, plan_id=plan_id, plan=plan: measure(
+                lambda _: store.save(plan_id, plan), repeat=repeat, number=20
+            ),
+        )
+
+
+def _git_rev() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, timeout=5
+        ).stdout.strip()
+    except Exception:
+        return ""
+
+
+def run(args) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        work = Path(tmp)
+        template = args.template or build_synthetic_template(work / "template.pptx")
+
+        for name, fn in cases(template, work, args.repeat):
+            if args.filter and args.filter not in name:
+                continue
+            results[name] = fn()
+            print(f"{name:45s} {results[name]['median_ms']:10.3f} ms", flush=True)
+
+    return {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "git_rev": _git_rev(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "template": str(args.template) if args.template else "synthetic",
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float, min_delta_ms: float) -> list[dict]:
+    """median 기준으로 threshold 이상 느려진 항목 (절대 차이가 min_delta_ms 미만이면 잡음으로 봄)"""
+    regressions = []
+    base = baseline.get("results", {})
+    print()
+    print(f"{'case':45s} {'base ms':>10s} {'now ms':>10s} {'change':>8s}")
+    for name, now in current["results"].items():
+        if name not in base:
+            continue
+        b, n = base[name]["median_ms"], now["median_ms"]
+        ratio = (n / b - 1) if b else 0.0
+        flag = ratio > threshold and (n - b) >= min_delta_ms
+        print(f"{name:45s} {b:10.3f} {n:10.3f} {ratio:+7.1%}{'  REGRESSION' if flag else ''}")
+        if flag:
+            regressions.append({"case": name, "baseline_ms": b, "current_ms": n, "change": ratio})
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--out", type=Path, default=Path("bench_results.json"))
+    ap.add_argument("--compare", type=Path, default=None, help="비교할 baseline JSON")
+    ap.add_argument("--threshold", type=float, default=0.15, help="이 비율 이상 느려지면 regression")
+    ap.add_argument("--min-delta-ms", type=float, default=0.05)
+    ap.add_argument("--template", type=Path, default=None)
+    ap.add_argument("--repeat", type=int, default=7)
+    ap.add_argument("--filter", default="", help="이름에 이 문자열이 들어간 항목만")
+    args = ap.parse_args()
+
+    current = run(args)
+
+    regressions = []
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare(current, baseline, args.threshold, args.min_delta_ms)
+        current["comparison"] = {
+            "baseline": str(args.compare),
+            "baseline_git_rev": baseline.get("meta", {}).get("git_rev", ""),
+            "threshold": args.threshold,
+            "regressions": regressions,
+        }
+
+    args.out.write_text(json.dumps(current, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\nsaved: {args.out}")
+
+    if regressions:
+        print(f"{len(regressions)} regression(s)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
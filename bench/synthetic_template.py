@@ -0,0 +1,146 @@
+"""
+thepureum.pptx 대신 쓸 수 있는 합성 템플릿 (오프라인 벤치마크용).
+
+실제 템플릿은 저장소에 없으므로, python-pptx 기본 템플릿을 가지고
+ppt_builder 가 기대하는 구조를 흉내 낸다.
+- master0: 레이아웃 13개, master1: 레이아웃 10개
+- 모든 레이아웃에 placeholder idx 10/11/12
+- 배경 이미지(media) + 샘플 슬라이드 몇 장 (clear_all_slides 대상)
+- layout_backgrounds > 0 이면 레이아웃마다 배경 이미지. 실제 템플릿처럼 같은 이미지도 레이아웃마다 따로 들어감
+
+    python -m bench.synthetic_template out/bench_template.pptx
+"""
+import argparse
+import copy
+import io
+import struct
+import zlib
+from pathlib import Path
+
+from lxml import etree
+from pptx import Presentation
+from pptx.opc.constants import CONTENT_TYPE as CT
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.packuri import PackURI
+from pptx.oxml.ns import qn
+from pptx.oxml.shapes.picture import CT_Picture
+from pptx.parts.image import Image, ImagePart
+from pptx.parts.slide import SlideLayoutPart, SlideMasterPart
+from pptx.util import Emu
+
+MASTER0_LAYOUTS = 13
+MASTER1_LAYOUTS = 10
+
+_PH_XML = (
+    '<p:sp xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main" '
+    'xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main">'
+    '<p:nvSpPr><p:cNvPr id="{sp_id}" name="Text Placeholder {idx}"/>'
+    '<p:cNvSpPr><a:spLocks noGrp="1"/></p:cNvSpPr>'
+    '<p:nvPr><p:ph type="body" sz="quarter" idx="{idx}"/></p:nvPr></p:nvSpPr>'
+    '<p:spPr><a:xfrm><a:off x="{x}" y="{y}"/><a:ext cx="8000000" cy="900000"/></a:xfrm></p:spPr>'
+    '<p:txBody><a:bodyPr/><a:lstStyle/><a:p><a:r><a:rPr lang="ko-KR"/><a:t>placeholder {idx}</a:t></a:r></a:p></p:txBody>'
+    "</p:sp>"
+)
+
+
+def _png(width: int = 640, height: int = 360) -> bytes:
+    """배경 이미지용 PNG (그라데이션이라 압축이 너무 잘 되지는 않게)"""
+    rows = b"".join(
+        b"\x00" + bytes(v for x in range(width) for v in (x * 255 // width, y * 255 // height, (x ^ y) & 0xFF))
+        for y in range(height)
+    )
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", ihdr) + chunk(b"IDAT", zlib.compress(rows)) + chunk(b"IEND", b"")
+
+
+def _add_placeholders(layout_el) -> None:
+    sp_tree = layout_el.find(qn("p:cSld")).find(qn("p:spTree"))
+    # 기존 placeholder 는 지우고 idx 10/11/12 만 둠
+    for sp in sp_tree.findall(qn("p:sp")):
+        sp_tree.remove(sp)
+    for n, idx in enumerate((10, 11, 12)):
+        sp_tree.append(etree.fromstring(_PH_XML.format(sp_id=100 + n, idx=idx, x=500000, y=800000 + n * 1500000)))
+
+
+def _add_background(prs: Presentation, layout, png: bytes) -> None:
+    # get_or_add_image_part 는 같은 이미지를 합쳐 버리므로 파트를 직접 만듦
+    image_part = ImagePart.new(prs.part.package, Image.from_blob(png))
+    rId = layout.part.relate_to(image_part, RT.IMAGE)
+    pic = CT_Picture.new_pic(90, "Background", "", rId, 0, 0, prs.slide_width, prs.slide_height)
+    sp_tree = layout._element.find(qn("p:cSld")).find(qn("p:spTree"))
+    sp_tree.insert(2, pic)  # nvGrpSpPr, grpSpPr 다음 (맨 뒤 레이어)
+
+
+def build_synthetic_template(path: Path, sample_slides: int = 5, layout_backgrounds: int = 0) -> Path:
+    prs = Presentation()
+    pkg = prs.part.package
+    master0 = prs.slide_masters[0]
+    src_layout = master0.slide_layouts[6]  # "Blank"
+
+    ids = iter(range(2147483900, 2147499999))
+    layout_no = iter(range(100, 1000))
+
+    def add_layout(master_part, name: str):
+        el = copy.deepcopy(src_layout._element)
+        el.find(qn("p:cSld")).set("name", name)
+        part = SlideLayoutPart(
+            PackURI(f"/ppt/slideLayouts/slideLayout{next(layout_no)}.xml"), CT.PML_SLIDE_LAYOUT, pkg, el
+        )
+        part.relate_to(master_part, RT.SLIDE_MASTER)
+        rId = master_part.relate_to(part, RT.SLIDE_LAYOUT)
+        lst = master_part._element.get_or_add_sldLayoutIdLst()
+        entry = etree.SubElement(lst, qn("p:sldLayoutId"))
+        entry.set("id", str(next(ids)))
+        entry.set(qn("r:id"), rId)
+
+    # master0: 기본 레이아웃 11개 + 2개 추가
+    for i in range(MASTER0_LAYOUTS - len(master0.slide_layouts)):
+        add_layout(master0.part, f"m0 extra {i}")
+
+    # master1: master0 복제 후 레이아웃 새로 10개
+    m1_el = copy.deepcopy(master0._element)
+    m1_el.remove(m1_el.find(qn("p:sldLayoutIdLst")))
+    m1_part = SlideMasterPart(PackURI("/ppt/slideMasters/slideMaster2.xml"), CT.PML_SLIDE_MASTER, pkg, m1_el)
+    m1_part.relate_to(master0.part.part_related_by(RT.THEME), RT.THEME)
+    rId = prs.part.relate_to(m1_part, RT.SLIDE_MASTER)
+    m_entry = etree.SubElement(prs._element.find(qn("p:sldMasterIdLst")), qn("p:sldMasterId"))
+    m_entry.set("id", str(next(ids)))
+    m_entry.set(qn("r:id"), rId)
+    for i in range(MASTER1_LAYOUTS):
+        add_layout(m1_part, f"m1 layout {i}")
+
+    backgrounds = [_png(1280 + 16 * i, 720) for i in range(layout_backgrounds)]
+    n = 0
+    for master in prs.slide_masters:
+        for layout in master.slide_layouts:
+            _add_placeholders(layout._element)
+            if backgrounds:
+                _add_background(prs, layout, backgrounds[n % len(backgrounds)])
+                n += 1
+
+    # 샘플 슬라이드 (실제 템플릿처럼 이미지 포함). 빌드 시 clear_all_slides 로 지워짐
+    png = _png()
+    for i in range(sample_slides):
+        slide = prs.slides.add_slide(prs.slide_masters[i % 2].slide_layouts[0])
+        slide.shapes.add_picture(io.BytesIO(png), Emu(0), Emu(0), prs.slide_width, prs.slide_height)
+        slide.placeholders[10].text = f"sample slide {i}"
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    prs.save(str(path))
+    return path
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("path", nargs="?", default="out/bench_template.pptx")
+    args = ap.parse_args()
+    print(build_synthetic_template(Path(args.path)))
+
+
+if __name__ == "__main__":
+    main()
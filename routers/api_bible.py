@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Query
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from routers.api_ppt import BIBLE_DIR
+from services.bible_refs import resolve_refs
+from services.bible_search import get_bible_search
+
+router = APIRouter()
+
+
+@router.get("/api/bible/search")
+def search_bible(q: str = Query(..., max_length=200), limit: int = Query(20, ge=1, le=100)):
+    q = q.strip()
+    if len(q) < 2:
+        return JSONResponse({"error": "query must be at least 2 characters"}, status_code=400)
+    return {"query": q, "results": get_bible_search(BIBLE_DIR).search(q, limit=limit)}
+
+
+class ResolveReq(BaseModel):
+    # phrases 또는 text(Step1 textarea 그대로, 줄 단위) 중 하나
+    phrases: list[str] = []
+    text: str = ""
+
+
+@router.post("/api/bible/resolve")
+def resolve_bible(req: ResolveReq):
+    phrases = [x.strip() for x in (req.phrases or req.text.splitlines()) if x.strip()]
+    if len(phrases) > 50:
+        return JSONResponse({"error": "too many phrases"}, status_code=400)
+    results = resolve_refs(BIBLE_DIR, phrases)
+    return {"ok": all(r["ok"] for r in results), "results": results}
@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Request
+
+from services.expiry import get_expiry_index
+
+router = APIRouter()
+
+
+@router.get("/api/cleanup/stats")
+def cleanup_stats(request: Request):
+    return {
+        "leader": request.app.state.leader.is_leader,
+        "index": get_expiry_index().stats(),
+        **request.app.state.sweep_stats,
+    }
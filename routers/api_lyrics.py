@@ -1,6 +1,7 @@
 from fastapi import APIRouter
 from pydantic import BaseModel
-from services.melon import fetch_lyrics_melon
+from services.melon import fetch_lyrics_melon, get_driver_pool, prefetch_lyrics, prefetch_stats
+from services.lyrics_cache import get_lyrics_cache
 
 router = APIRouter()
 
@@ -14,3 +15,27 @@ class LyricsReq(BaseModel):
 def fetch_lyrics(req: LyricsReq):
     lyrics = fetch_lyrics_melon(req.title, req.artist or "")
     return {"lyrics": lyrics}
+
+
+@router.post("/api/lyrics/prefetch")
+def prefetch(req: LyricsReq):
+    """Step2 입력 칸에서 포커스가 빠질 때 호출. 가져오기만 시작하고 바로 응답"""
+    return {"status": prefetch_lyrics(req.title, req.artist or "")}
+
+
+@router.get("/api/lyrics/prefetch/stats")
+def lyrics_prefetch_stats():
+    return prefetch_stats()
+
+
+@router.get("/api/lyrics/cache/stats")
+def lyrics_cache_stats():
+    cache = get_lyrics_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+
+@router.get("/api/lyrics/pool/stats")
+def driver_pool_stats():
+    return get_driver_pool().stats()
@@ -1,9 +1,11 @@
 # routers/api_plan.py
+import sqlite3
 
 from fastapi import APIRouter, Request, Form, HTTPException
 from fastapi.responses import RedirectResponse
+from starlette.concurrency import run_in_threadpool
 
-from services.melon import fetch_lyrics_batch_melon
+from services.jobs import JobQueueFull
 
 router = APIRouter()
 
@@ -12,6 +14,10 @@ def _store(request: Request):
     return request.app.state.store
 
 
+def _jobs(request: Request):
+    return request.app.state.crawl_jobs
+
+
 @router.post("/api/plan/init")
 async def plan_init(
     request: Request,
@@ -48,17 +54,22 @@ async def plan_init(
     return RedirectResponse(url=f"/step/2?plan_id={plan_id}", status_code=303)
 
 
+def _save_plan(store, plan_id: str, plan: dict) -> None:
+    # 이전 job 이 아직 가사를 채우는 중일 수 있어서 같은 plan lock 안에서 저장
+    with store.locked(plan_id):
+        store.save(plan_id, plan)
+
+
 @router.post("/api/plan/{plan_id}/songs/basic")
 async def save_songs_basic(request: Request, plan_id: str):
     """
     Step2 제출:
     - 제목/가수 저장
-    - 그 즉시 멜론에서 가사 크롤링
-    - plan에 lyrics 채워서 저장
-    - Step3로 이동(수정만)
+    - 멜론 가사 크롤링 job 등록 (요청은 기다리지 않음)
+    - Step3로 이동 → Step3 화면이 job 상태를 polling 하면서 가사를 채움
     """
     store = _store(request)
-    plan = store.get(plan_id)
+    plan = await run_in_threadpool(store.get, plan_id)
     if not plan:
         return RedirectResponse(url=f"/step/2?plan_id={plan_id}", status_code=303)
 
@@ -89,21 +100,65 @@ async def save_songs_basic(request: Request, plan_id: str):
     plan["songs"]["offering"] = offering
     plan["songs"]["closing"] = closing
 
-    # 3) 여기서 즉시 크롤링(배치)
-    batch = list(plan["songs"]["praise"])
+    # 3) 크롤링은 job으로 넘기고 바로 Step3로 (곡이 끝나는 대로 plan에 가사가 채워짐)
+    batch = [
+        {"slot": ["praise", i], "field": f"lyrics_praise_{i}", "title": s["title"], "artist": s["artist"]}
+        for i, s in enumerate(praise)
+    ]
     if offering:
-        batch.append(offering)
+        batch.append({"slot": ["offering", None], "field": "lyrics_offering", **offering})
     if closing:
-        batch.append(closing)
+        batch.append({"slot": ["closing", None], "field": "lyrics_closing", **closing})
+
+    await run_in_threadpool(_save_plan, store, plan_id, plan)
+
+    try:
+        # 등록은 SQLite 쓰기 lock(BEGIN IMMEDIATE)을 잡으므로 이벤트 루프 밖에서
+        job_id = await run_in_threadpool(_jobs(request).submit, plan_id, batch)
+    except (JobQueueFull, sqlite3.OperationalError):
+        # OperationalError: 다른 worker 가 job DB 를 오래 잡고 있음 (database is locked)
+        raise HTTPException(
+            status_code=503,
+            detail="가사 크롤링 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": "30"},
+        )
+
+    return RedirectResponse(url=f"/step/3?plan_id={plan_id}&job_id={job_id}", status_code=303)
+
+
+@router.get("/api/plan/jobs/metrics")
+def crawl_job_metrics(request: Request):
+    return _jobs(request).metrics()
+
 
-    results = fetch_lyrics_batch_melon(batch, headless=True)
+@router.get("/api/plan/{plan_id}/jobs/{job_id}")
+def crawl_job_status(request: Request, plan_id: str, job_id: str):
+    job = _jobs(request).get(job_id)
+    if not job or job["plan_id"] != plan_id:
+        raise HTTPException(status_code=404, detail="job not found")
+    return job
 
-    # 4) 결과 반영 (song_dict를 그대로 넘겼으므로 in-place로 채움)
-    for song_obj, lyrics in results:
-        song_obj["lyrics"] = (lyrics or "").replace("\r\n", "\n")
 
-    store.save(plan_id, plan)
-    return RedirectResponse(url=f"/step/3?plan_id={plan_id}", status_code=303)
+def _save_lyrics_form(store, plan_id: str, form) -> bool:
+    with store.locked(plan_id):
+        plan = store.get(plan_id)
+        if not plan:
+            return False
+
+        # praise
+        for idx, s in enumerate(plan["songs"]["praise"]):
+            s["lyrics"] = str(form.get(f"lyrics_praise_{idx}", "")).replace("\r\n", "\n")
+
+        # offering
+        if plan["songs"].get("offering"):
+            plan["songs"]["offering"]["lyrics"] = str(form.get("lyrics_offering", "")).replace("\r\n", "\n")
+
+        # closing
+        if plan["songs"].get("closing"):
+            plan["songs"]["closing"]["lyrics"] = str(form.get("lyrics_closing", "")).replace("\r\n", "\n")
+
+        store.save(plan_id, plan)
+        return True
 
 
 @router.post("/api/plan/{plan_id}/songs/lyrics")
@@ -112,23 +167,11 @@ async def save_lyrics(request: Request, plan_id: str):
     Step3 제출: textarea 수정 내용 저장만
     """
     store = _store(request)
-    plan = store.get(plan_id)
-    if not plan:
+    if not await run_in_threadpool(store.get, plan_id):
         return RedirectResponse(url=f"/step/3?plan_id={plan_id}", status_code=303)
 
     form = await request.form()
-
-    # praise
-    for idx, s in enumerate(plan["songs"]["praise"]):
-        s["lyrics"] = str(form.get(f"lyrics_praise_{idx}", "")).replace("\r\n", "\n")
-
-    # offering
-    if plan["songs"].get("offering"):
-        plan["songs"]["offering"]["lyrics"] = str(form.get("lyrics_offering", "")).replace("\r\n", "\n")
-
-    # closing
-    if plan["songs"].get("closing"):
-        plan["songs"]["closing"]["lyrics"] = str(form.get("lyrics_closing", "")).replace("\r\n", "\n")
-
-    store.save(plan_id, plan)
+    # 크롤링 job 이 가사를 채우는 것과 겹치지 않게 plan lock 안에서 읽고 저장 (lock 대기는 스레드에서)
+    if not await run_in_threadpool(_save_lyrics_form, store, plan_id, form):
+        return RedirectResponse(url=f"/step/3?plan_id={plan_id}", status_code=303)
     return RedirectResponse(url=f"/step/4?plan_id={plan_id}", status_code=303)
@@ -1,24 +1,39 @@
-from fastapi import APIRouter, Request
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from pathlib import Path
 from datetime import datetime
 from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
 import os
 
-from services.ppt_builder import build_ppt
+from services.bible import bible_version
+from services.cleanup import env_int
+from services.deck_batch import iter_deck_batch
+from services.deck_cache import deck_cache_key, get_deck_cache
+from services.expiry import register_expiry
+from services.build_pool import BuildRejected, open_build_result
+from services.ppt_builder import template_version
+from services.slide_plan import compile_plan, summarize
 
 router = APIRouter()
 
 BASE_DIR = Path(__file__).resolve().parent.parent
-TEMPLATE = BASE_DIR / "thepureum.pptx"
+TEMPLATE = Path(os.getenv("PPT_TEMPLATE", str(BASE_DIR / "thepureum.pptx")))
 BIBLE_DIR = BASE_DIR / "bible"
 OUT_DIR = BASE_DIR / "out"
 
+PPTX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+STREAM_CHUNK = 64 * 1024
+
 
 def _store(request: Request):
     return request.app.state.store
 
 
+def _build_pool(request: Request):
+    return request.app.state.build_pool
+
+
 def _remove_file(path: str):
     try:
         os.remove(path)
@@ -26,21 +41,182 @@ def _remove_file(path: str):
         pass
 
 
-@router.post("/api/ppt/{plan_id}/generate")
-def generate_ppt(request: Request, plan_id: str):
-    store = _store(request)
-    plan = store.get(plan_id)
+def _iter_buffer(buf):
+    """버퍼(BytesIO/임시파일/캐시 파일)를 청크 단위로 내보내고, 다 보내면(또는 끊기면) 닫음"""
+    try:
+        while True:
+            chunk = buf.read(STREAM_CHUNK)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        buf.close()
+
+
+def _stream_response(buf, size: int, download_name: str) -> StreamingResponse:
+    return StreamingResponse(
+        _iter_buffer(buf),
+        media_type=PPTX_MEDIA_TYPE,
+        headers={
+            "Content-Disposition": f'attachment; filename="{download_name}"',
+            "Content-Length": str(size),
+        },
+    )
+
+
+@router.get("/api/ppt/cache/stats")
+def deck_cache_stats():
+    cache = get_deck_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+
+@router.get("/api/ppt/pool/stats")
+def build_pool_stats(request: Request):
+    return _build_pool(request).stats()
+
+
+def _preview(plan: dict) -> JSONResponse:
+    specs = compile_plan(plan, BIBLE_DIR)
+    # 슬라이드가 수백 장이라 jsonable_encoder 를 거치지 않고 바로 직렬화
+    return JSONResponse({"count": len(specs), "sections": summarize(specs), "slides": [s.to_dict() for s in specs]})
+
+
+@router.get("/api/ppt/{plan_id}/preview")
+def preview_ppt(request: Request, plan_id: str):
+    """저장된 plan 이 어떻게 슬라이드로 나뉘는지 (덱을 만들지 않고 JSON 으로)"""
+    plan = _store(request).get(plan_id)
     if not plan:
         return JSONResponse({"error": "plan not found"}, status_code=404)
+    return _preview(plan)
+
+
+@router.post("/api/ppt/{plan_id}/preview")
+async def preview_ppt_draft(request: Request, plan_id: str):
+    """
+    Step3 에서 아직 저장 안 한 가사로 미리보기.
+    body: {"lyrics": {"lyrics_praise_0": "...", "lyrics_offering": "...", ...}} (Step3 textarea 이름 그대로)
+    """
+    plan = await run_in_threadpool(_store(request).get, plan_id)
+    if not plan:
+        return JSONResponse({"error": "plan not found"}, status_code=404)
+
+    try:
+        body = await request.json()
+    except ValueError:  # JSON 이 아님
+        body = None
+    lyrics = (body.get("lyrics") or {}) if isinstance(body, dict) else None
+    if not isinstance(lyrics, dict):
+        return JSONResponse({"error": "body must be a JSON object with a lyrics object"}, status_code=400)
+    songs = plan["songs"]
+    for idx, s in enumerate(songs["praise"]):
+        if f"lyrics_praise_{idx}" in lyrics:
+            s["lyrics"] = str(lyrics[f"lyrics_praise_{idx}"])
+    for key in ("offering", "closing"):
+        if songs.get(key) and f"lyrics_{key}" in lyrics:
+            songs[key]["lyrics"] = str(lyrics[f"lyrics_{key}"])
+    return await run_in_threadpool(_preview, plan)
+
+
+def _open_cached(plan: dict):
+    """(캐시 키, hit 이면 (열린 파일, 크기) 아니면 None). 캐시를 끈 경우 (None, None)"""
+    cache = get_deck_cache()
+    if cache is None:
+        return None, None
+    key = deck_cache_key(plan, template_version=template_version(TEMPLATE), bible_version=bible_version(BIBLE_DIR))
+    return key, cache.open(key)
+
+
+def _spool_result(result, cache_key: str | None):
+    buf, size = open_build_result(result)
+    if cache_key:
+        get_deck_cache().put(cache_key, buf)
+    return buf, size
+
 
-    out_fp = build_ppt(plan, TEMPLATE, BIBLE_DIR, OUT_DIR)
+def _keep_file(result: str, cache_key: str | None) -> Path:
+    out_fp = Path(result)
+    # 전송 후 삭제가 실패하거나 도중에 끊겨도 TTL 뒤에 지워지게
+    register_expiry(out_fp, env_int("PPT_TTL_SEC", 3600))
+    if cache_key:
+        with open(out_fp, "rb") as f:
+            get_deck_cache().put(cache_key, f)
+    return out_fp
+
+
+@router.post("/api/ppt/{plan_id}/generate")
+async def generate_ppt(request: Request, plan_id: str):
+    # 빌드 풀을 기다리는 동안만 이벤트 루프를 비우고, 파일 I/O(plan/캐시/템플릿·성경 버전)는 스레드에서
+    plan = await run_in_threadpool(_store(request).get, plan_id)
+    if not plan:
+        return JSONResponse({"error": "plan not found"}, status_code=404)
 
     date_str = datetime.now().strftime("%Y%m%d")
     download_name = f"thepureum_{date_str}.pptx"
 
+    # ✅ 같은 내용(plan + 날짜 + 템플릿/성경 버전)으로 이미 만든 덱이 있으면 그대로 보냄
+    cache_key, hit = await run_in_threadpool(_open_cached, plan)
+    if hit:
+        return _stream_response(hit[0], hit[1], download_name)
+
+    # ✅ 빌드는 프로세스 풀에서. 대기열이 꽉 차면 429 + Retry-After
+    stream = bool(env_int("PPT_STREAM", 1))
+    try:
+        result, _timings = await _build_pool(request).build(plan, out_dir=None if stream else OUT_DIR)
+    except BuildRejected as e:
+        return JSONResponse(
+            {"error": "too many builds in progress"},
+            status_code=429,
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+    # ✅ 기본: out/ 에 파일을 남기지 않고 바로 스트리밍 (PPT_SPOOL_MAX_BYTES 까지는 메모리, 넘으면 이름 없는 임시파일)
+    if stream:
+        buf, size = await run_in_threadpool(_spool_result, result, cache_key)
+        return _stream_response(buf, size, download_name)
+
+    out_fp = await run_in_threadpool(_keep_file, result, cache_key)
     return FileResponse(
         path=str(out_fp),
         filename=download_name,
-        media_type="application/vnd.openxmlformats-officedocument.presentationml.presentation",
+        media_type=PPTX_MEDIA_TYPE,
         background=BackgroundTask(_remove_file, str(out_fp)),  # ✅ 전송 끝나면 삭제
     )
+
+
+@router.post("/api/ppt/batch")
+async def generate_ppt_batch(request: Request):
+    """
+    여러 plan(여러 주/여러 예배)을 한 번에: body {"plan_ids": [...]}
+    덱이 끝나는 대로 zip 에 넣어 스트리밍하고, plan 별 실패는 manifest.json 에 기록.
+    """
+    try:
+        body = await request.json()
+    except ValueError:  # JSON 이 아님
+        body = None
+    raw_ids = body.get("plan_ids") if isinstance(body, dict) else None
+    if not isinstance(raw_ids, list) or not all(isinstance(x, str) for x in raw_ids):
+        return JSONResponse({"error": "body must be a JSON object with a plan_ids list of strings"}, status_code=400)
+    plan_ids = list(dict.fromkeys(x.strip() for x in raw_ids if x.strip()))
+    max_plans = env_int("PPT_BATCH_MAX_PLANS", 60)
+    if not plan_ids:
+        raise HTTPException(status_code=400, detail="plan_ids is empty")
+    if len(plan_ids) > max_plans:
+        raise HTTPException(status_code=400, detail=f"too many plans (max {max_plans})")
+
+    pool = _build_pool(request)
+    date_str = datetime.now().strftime("%Y%m%d")
+    return StreamingResponse(
+        iter_deck_batch(
+            plan_ids,
+            store=_store(request),
+            pool=pool,
+            template=TEMPLATE,
+            bible_dir=BIBLE_DIR,
+            # 다른 사용자의 단건 생성이 429 를 받지 않게 worker 수만큼만 동시에 올림
+            parallel=env_int("PPT_BATCH_PARALLEL", pool.workers),
+        ),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="thepureum_batch_{date_str}.zip"'},
+    )
@@ -0,0 +1,22 @@
+from pathlib import Path
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from services.cleanup import env_int, web_workers
+from services.metrics import REGISTRY, render_merged
+
+router = APIRouter()
+
+METRICS_SPOOL_DIR = Path("out/metrics")
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    # Prometheus text exposition format
+    # worker 가 여러 개면 어느 worker 가 받든 전체 합계를 돌려줌
+    if web_workers() > 1:
+        body = render_merged(METRICS_SPOOL_DIR, max_age_sec=env_int("METRICS_STALE_SEC", 60))
+    else:
+        body = REGISTRY.render()
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4; charset=utf-8")
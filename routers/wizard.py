@@ -34,7 +34,7 @@ def step2(request: Request, plan_id: str):
 
 
 @router.get("/step/3")
-def step3(request: Request, plan_id: str):
+def step3(request: Request, plan_id: str, job_id: str = ""):
     store = _store(request)
     plan = store.get(plan_id)
 
@@ -47,7 +47,7 @@ def step3(request: Request, plan_id: str):
     # 템플릿에서 plan.songs.praise / plan.songs.offering / plan.songs.closing 사용
     return templates.TemplateResponse(
         "step3.html",
-        {"request": request, "plan_id": plan_id, "plan": plan},
+        {"request": request, "plan_id": plan_id, "plan": plan, "job_id": job_id},
     )
 
 
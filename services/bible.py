@@ -1,6 +1,12 @@
+import hashlib
 import re
+import threading
+import time
 from pathlib import Path
 
+from services.cleanup import env_int
+from services.metrics import counter, histogram
+
 BOOK_MAP = {
     "창세기": "창", "출애굽기": "출", "레위기": "리", "민수기": "민", "신명기": "신", "여호수아": "수",
     "사사기": "삿", "룻기": "룻", "사무엘상": "삼상", "사무엘하": "삼하", "열왕기상": "왕상", "열왕기하": "왕하",
@@ -28,39 +34,113 @@ def parse_range(phrase: str):
     return (book, chapter, start, end)
 
 
-def scroll_bible(bible_dir: Path, book: str, chapter: int, start_v: int, end_v: int):
-    abbr = BOOK_MAP.get(book, book)
-    fp = Path(bible_dir) / f"{book}.txt"
-    if not fp.exists():
-        return ["(성경 파일 없음)"] * (end_v - start_v + 1)
+# 절 라인: "요3:16 본문" 형태. 약어는 파일마다 다를 수 있어서(레위기=레) 파일 안의 것을 그대로 씀
+_VERSE_LINE = re.compile(r"^\s*([^\d\s:]+)\s*(\d+)\s*:\s*(\d+)\s+(.*)$")
+_HEADING = re.compile(r"<[^>]*>")
 
-    pat = re.compile(rf"^\s*{re.escape(abbr)}\s*(\d+)\s*:\s*(\d+)\s+(.*)$")
-    verses = []
+# (bible_dir, book) -> {(chapter, verse): body}
+# 책 단위로 처음 요청될 때 한 번만 읽어서 메모리에 들고 있음 (성경 전체가 ~3.6MB라 부담 없음)
+_BOOK_INDEX: dict[tuple[str, str], dict[tuple[int, int], str] | None] = {}
+_INDEX_LOCK = threading.Lock()
 
+_BOOK_LOAD_SECONDS = histogram("bible_book_load_seconds", "성경 책 파일 하나를 읽어 인덱싱하는 시간")
+_RESOLVE_SECONDS = histogram("bible_resolve_seconds", "본문 구절을 찾는 시간 (resolve_refs 호출 한 번 / scroll_bible 범위 하나)")
+_VERSES = counter("bible_verses_total", "찾은 절 수", ("result",))
+
+
+def _parse_book_file(fp: Path) -> dict[tuple[int, int], str]:
+    verses: dict[tuple[int, int], str] = {}
     with open(fp, "r", encoding="cp949") as f:
         for line in f:
             line = line.strip()
             if not line:
                 continue
-            m = pat.match(line)
+            m = _VERSE_LINE.match(line)
             if not m:
                 continue
 
-            ch = int(m.group(1))
-            vs = int(m.group(2))
-            body = m.group(3).strip()
+            # ✅ 꺾쇠(<...>) 제거는 인덱스 만들 때 미리 해둠
+            body = _HEADING.sub("", m.group(4)).strip()
+            verses.setdefault((int(m.group(2)), int(m.group(3))), body)
+    return verses
 
-            # ✅ 꺾쇠(<...>) 제거
-            body = re.sub(r"<[^>]*>", "", body).strip()
 
-            if ch != chapter:
-                continue
-            if start_v <= vs <= end_v:
-                verses.append(body)
-            if ch == chapter and vs > end_v:
-                break
-
-    need = (end_v - start_v + 1)
-    if len(verses) < need:
-        verses += [""] * (need - len(verses))
-    return verses[:need]
+def load_book(bible_dir: Path, book: str) -> dict[tuple[int, int], str] | None:
+    """
+    책 하나의 절 인덱스를 반환 (없으면 None).
+    처음 호출될 때만 파일을 읽고, 이후에는 캐시된 dict를 그대로 돌려준다.
+    """
+    key = (str(Path(bible_dir).resolve()), book)
+    if key in _BOOK_INDEX:
+        return _BOOK_INDEX[key]
+
+    with _INDEX_LOCK:
+        if key in _BOOK_INDEX:
+            return _BOOK_INDEX[key]
+
+        fp = Path(bible_dir) / f"{book}.txt"
+        t0 = time.perf_counter()
+        verses = _parse_book_file(fp) if fp.exists() else None
+        if verses is not None:
+            _BOOK_LOAD_SECONDS.observe(time.perf_counter() - t0)
+        _BOOK_INDEX[key] = verses
+        return verses
+
+
+# bible_dir -> (다시 계산할 시각, 버전). 요청마다 66개 파일을 glob/stat 하지 않게 잠깐 들고 있음
+_VERSION_CACHE: dict[str, tuple[float, str]] = {}
+
+
+def bible_version(bible_dir: Path) -> str:
+    """
+    성경 데이터 버전 문자열: 책 파일들의 이름/크기/mtime 으로 만든 해시.
+    파일이 하나라도 바뀌면 값이 달라짐 (생성 결과 캐시 키에 사용).
+    BIBLE_VERSION_TTL_SEC(기본 60초) 동안은 계산해 둔 값을 씀 → 파일 교체 후 그만큼 늦게 반영.
+    """
+    key = str(bible_dir)
+    now = time.monotonic()
+    cached = _VERSION_CACHE.get(key)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    h = hashlib.sha1()
+    for fp in sorted(Path(bible_dir).glob("*.txt")):
+        st = fp.stat()
+        h.update(f"{fp.name}:{st.st_size}:{st.st_mtime_ns};".encode("utf-8"))
+    version = h.hexdigest()
+    _VERSION_CACHE[key] = (now + env_int("BIBLE_VERSION_TTL_SEC", 60), version)
+    return version
+
+
+def preload_bible(bible_dir: Path) -> int:
+    """
+    서버 시작 시 66권 전체를 미리 인덱싱. 로드된 책 수를 반환.
+    """
+    loaded = 0
+    for book in BOOK_MAP:
+        if load_book(bible_dir, book) is not None:
+            loaded += 1
+    return loaded
+
+
+def record_resolve(seconds: float, *, ok: int, missing: int = 0, no_book: int = 0) -> None:
+    """구절 찾기 지표 (scroll_bible, bible_refs.resolve_refs 가 같이 씀)"""
+    _VERSES.inc(ok, result="ok")
+    if missing:
+        _VERSES.inc(missing, result="missing")
+    if no_book:
+        _VERSES.inc(no_book, result="no_book")
+    _RESOLVE_SECONDS.observe(seconds)
+
+
+def scroll_bible(bible_dir: Path, book: str, chapter: int, start_v: int, end_v: int):
+    t0 = time.perf_counter()
+    verses = load_book(bible_dir, book)
+    if verses is None:
+        _VERSES.inc(end_v - start_v + 1, result="no_book")
+        return ["(성경 파일 없음)"] * (end_v - start_v + 1)
+
+    found = [verses.get((chapter, vs), "") for vs in range(start_v, end_v + 1)]
+    missing = found.count("")
+    record_resolve(time.perf_counter() - t0, ok=len(found) - missing, missing=missing)
+    return found
@@ -0,0 +1,216 @@
+# services/bible_refs.py
+from __future__ import annotations
+
+import re
+import threading
+import time
+from pathlib import Path
+
+from services.bible import BOOK_MAP, load_book, record_resolve
+from services.cleanup import env_int
+from services.metrics import counter
+
+# 전체 이름 + 약어(BOOK_MAP 역방향) → 전체 이름. 레위기는 파일 안에서 "레" 를 씀
+BOOK_ALIASES = {name: name for name in BOOK_MAP}
+BOOK_ALIASES.update({abbr: name for name, abbr in BOOK_MAP.items()})
+BOOK_ALIASES.setdefault("레", "레위기")
+
+MISSING_BOOK_TEXT = "(성경 파일 없음)"
+
+_RESOLVED = counter("bible_refs_total", "본문 참조 해석 결과", ("result",))
+
+# "요한복음 3장 16절" / "요 3:16" 의 책 부분 (숫자 앞까지)
+_BOOK_PREFIX = re.compile(r"^\s*([^\d\s:,;][^\d:,;]*?)\s*(?=\d)")
+
+# 책 이름을 뗀 나머지(공백 제거 후)에 대한 패턴들. 장 = 장|편(시편)
+_CH = r"(\d+)(?:장|편)"
+_SPEC_PATTERNS = [
+    # 3장16절-4장2절
+    ("cross", re.compile(rf"^{_CH}(\d+)절?-{_CH}(\d+)절$")),
+    # 3장16-21절, 3장16절
+    ("verses", re.compile(rf"^{_CH}(\d+)(?:-(\d+))?절$")),
+    # 3장, 3-4장
+    ("chapters", re.compile(r"^(\d+)(?:-(\d+))?(?:장|편)$")),
+    # 16-18절 (앞의 장 이어서)
+    ("more_verses", re.compile(r"^(\d+)(?:-(\d+))?절$")),
+    # 3:16-4:2
+    ("cross", re.compile(r"^(\d+):(\d+)-(\d+):(\d+)$")),
+    # 3:16-21, 3:16
+    ("verses", re.compile(r"^(\d+):(\d+)(?:-(\d+))?$")),
+    # 16, 16-18 (콜론 표기에서 앞의 장 이어서, 장 정보가 없으면 장 단위)
+    ("bare", re.compile(r"^(\d+)(?:-(\d+))?$")),
+]
+
+_CHAPTER_LEN: dict[tuple[str, str], dict[int, int]] = {}
+_CHAPTER_LOCK = threading.Lock()
+
+
+class RefError(ValueError):
+    pass
+
+
+def resolve_book(name: str) -> str | None:
+    return BOOK_ALIASES.get(re.sub(r"\s+", "", name or ""))
+
+
+def _chapter_lengths(bible_dir: Path, book: str) -> dict[int, int]:
+    """장 번호 → 마지막 절 번호 (책이 없으면 빈 dict)"""
+    key = (str(Path(bible_dir).resolve()), book)
+    lengths = _CHAPTER_LEN.get(key)
+    if lengths is None:
+        lengths = {}
+        for ch, vs in load_book(bible_dir, book) or {}:
+            if vs > lengths.get(ch, 0):
+                lengths[ch] = vs
+        with _CHAPTER_LOCK:
+            _CHAPTER_LEN[key] = lengths
+    return lengths
+
+
+def _parse_phrase(phrase: str) -> list[tuple]:
+    """
+    한 줄을 범위 목록으로. 범위 = (책, 시작장, 시작절, 끝장, 끝절)
+    끝절이 None 이면 그 장 끝까지 (장 단위 지정). 책을 모르면 입력한 이름 그대로 둠.
+    쉼표/세미콜론으로 여러 개를 적을 수 있고, 책/장을 생략하면 앞의 것을 이어서 씀.
+    """
+    book = None
+    chapter = None
+    ranges = []
+
+    for seg in re.split(r"[,;]", phrase.replace("~", "-").replace("–", "-")):
+        if not seg.strip():
+            continue
+        m = _BOOK_PREFIX.match(seg)
+        if m:
+            book = resolve_book(m.group(1)) or m.group(1).strip()
+            chapter = None
+            seg = seg[m.end():]
+        if book is None:
+            raise RefError(f"책 이름이 없습니다: {seg.strip()}")
+
+        spec = re.sub(r"\s+", "", seg)
+        for kind, pat in _SPEC_PATTERNS:
+            sm = pat.match(spec)
+            if sm:
+                break
+        else:
+            raise RefError(f"형식을 알 수 없습니다: {seg.strip()}")
+
+        g = [int(x) if x else None for x in sm.groups()]
+        if kind == "cross":
+            ranges.append((book, g[0], g[1], g[2], g[3]))
+            chapter = g[2]
+        elif kind == "verses":
+            ranges.append((book, g[0], g[1], g[0], g[2] or g[1]))
+            chapter = g[0]
+        elif kind == "chapters":
+            ranges.append((book, g[0], 1, g[1] or g[0], None))
+            chapter = None
+        elif kind == "more_verses" or (kind == "bare" and chapter is not None):
+            if chapter is None:
+                raise RefError(f"장이 없습니다: {seg.strip()}")
+            ranges.append((book, chapter, g[0], chapter, g[1] or g[0]))
+        else:  # bare, 장 정보 없음 → "시 23", "시 23-24"
+            ranges.append((book, g[0], 1, g[1] or g[0], None))
+
+    if not ranges:
+        raise RefError("본문이 비어 있습니다")
+    return ranges
+
+
+def _expand(bible_dir: Path, rng: tuple, known: bool) -> list[tuple[int, int]]:
+    """범위를 (장, 절) 목록으로. 모르는 책은 장 길이를 알 수 없어서 장 단위 지정이면 에러"""
+    book, c1, v1, c2, v2 = rng
+    if c2 < c1 or (c1 == c2 and v2 is not None and v2 < v1):
+        raise RefError(f"끝이 시작보다 앞입니다: {_label(rng)}")
+
+    lengths = _chapter_lengths(bible_dir, book) if known else {}
+    out = []
+    for ch in range(c1, c2 + 1):
+        start = v1 if ch == c1 else 1
+        if ch == c2 and v2 is not None:
+            end = v2
+        elif ch in lengths:
+            end = lengths[ch]
+        else:
+            raise RefError(f"{book} {ch}장이 없습니다")
+        out.extend((ch, vs) for vs in range(start, end + 1))
+    return out
+
+
+def _label(rng: tuple) -> str:
+    book, c1, v1, c2, v2 = rng
+    if v2 is None:
+        return f"{book} {c1}장" if c1 == c2 else f"{book} {c1}-{c2}장"
+    if c1 != c2:
+        return f"{book} {c1}장 {v1}절-{c2}장 {v2}절"
+    return f"{book} {c1}장 {v1}절" if v1 == v2 else f"{book} {c1}장 {v1}-{v2}절"
+
+
+def resolve_refs(bible_dir: Path, phrases: list[str]) -> list[dict]:
+    """
+    본문 여러 줄을 한 번에 해석. 입력 순서대로
+    {"input", "ok", "error", "parsed", "ranges": [라벨...], "verses": [{"book","chapter","verse","text","missing"}]}
+    parsed: 형식은 알아봤는지 (거꾸로 된 범위나 최대 절 수 초과처럼 형식만 맞고 절을 못 꺼낸 경우도 True)
+    책 데이터는 책별로 묶어서 한 번씩만 조회함.
+    """
+    t0 = time.perf_counter()
+    max_verses = env_int("BIBLE_MAX_VERSES", 500)
+    parsed: list[dict] = []
+    wanted: dict[str, set[tuple[int, int]]] = {}
+
+    for phrase in phrases:
+        item = {"input": phrase, "ok": True, "error": None, "parsed": False, "ranges": [], "verses": []}
+        parsed.append(item)
+        try:
+            ranges = _parse_phrase(phrase)
+            item["parsed"] = True
+            refs = []
+            for rng in ranges:
+                known = rng[0] in BOOK_MAP
+                refs.extend((rng[0], ch, vs) for ch, vs in _expand(bible_dir, rng, known))
+            if len(refs) > max_verses:
+                raise RefError(f"절이 너무 많습니다 ({len(refs)}절, 최대 {max_verses}절)")
+        except RefError as e:
+            item.update(ok=False, error=str(e))
+            _RESOLVED.inc(result="error")
+            continue
+
+        item["ranges"] = [_label(r) for r in ranges]
+        item["_refs"] = refs
+        for book, ch, vs in refs:
+            wanted.setdefault(book, set()).add((ch, vs))
+
+    texts: dict[tuple[str, int, int], str | None] = {}
+    no_file: set[str] = set()
+    for book, keys in wanted.items():
+        verses = load_book(bible_dir, book) if book in BOOK_MAP else None
+        if verses is None:
+            no_file.add(book)
+            continue
+        for ch, vs in keys:
+            texts[(book, ch, vs)] = verses.get((ch, vs))
+
+    for item in parsed:
+        refs = item.pop("_refs", None)
+        if refs is None:
+            continue
+        for book, ch, vs in refs:
+            if book in no_file:
+                text, missing = MISSING_BOOK_TEXT, True
+            else:
+                text = texts[(book, ch, vs)] or ""
+                missing = not text
+            item["verses"].append({"book": book, "chapter": ch, "verse": vs, "text": text, "missing": missing})
+        unknown = next((v["book"] for v in item["verses"] if v["book"] in no_file), None)
+        if unknown:
+            item.update(ok=False, error=f"성경 파일이 없는 책입니다: {unknown}")
+        elif any(v["missing"] for v in item["verses"]):
+            item.update(ok=False, error="없는 절이 포함되어 있습니다")
+        _RESOLVED.inc(result="ok" if item["ok"] else "partial")
+
+    verses = [v for item in parsed for v in item["verses"]]
+    no_book = sum(1 for v in verses if v["book"] in no_file)
+    missing = sum(1 for v in verses if v["missing"]) - no_book
+    record_resolve(time.perf_counter() - t0, ok=len(verses) - missing - no_book, missing=missing, no_book=no_book)
+    return parsed
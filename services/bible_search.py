@@ -0,0 +1,218 @@
+# services/bible_search.py
+from __future__ import annotations
+
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import tempfile
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+
+from services.bible import BOOK_MAP, bible_version, load_book
+from services.metrics import histogram
+
+# 파일 구조 (숫자는 모두 이 머신의 native byte order, 캐시 파일이라 이식성은 필요 없음)
+#   magic(8) | n_verses, n_terms, books_json_len, posting 크기(2|4) (u32 x4) | books json (4바이트 정렬)
+#   verses : u16[n_verses * 4]  (book_id, chapter, verse, bigram 수)
+#   terms  : u32[n_terms]       (두 글자를 (ord(a) << 16) | ord(b) 로 묶은 값, 정렬됨)
+#   offsets: u32[n_terms + 1]   (postings 안에서의 시작 위치)
+#   postings: u16|u32[...]      (term 별 verse id 목록, 오름차순. 성경은 3만여 절이라 보통 u16)
+_MAGIC = b"BBLIDX01"
+_HEADER = struct.Struct("=IIII")
+
+# 공백/문장부호를 빼고 글자만 남겨서 bigram 을 만듦 (띄어쓰기를 틀리게 기억해도 찾히게)
+_NON_WORD = re.compile(r"[\W_]+")
+
+_SEARCH_SECONDS = histogram("bible_search_seconds", "성경 본문 검색 시간")
+
+
+def normalize_text(text: str) -> str:
+    return _NON_WORD.sub("", text).casefold()
+
+
+def _bigrams(text: str) -> set[int]:
+    return {(ord(a) << 16) | ord(b) for a, b in zip(text, text[1:]) if ord(a) < 0x10000 and ord(b) < 0x10000}
+
+
+def _pad4(n: int) -> int:
+    return (4 - n % 4) % 4
+
+
+def build_search_index(bible_dir: Path, out_path: Path) -> Path:
+    """scroll_bible 이 읽는 cp949 원본(load_book)으로 bigram 역색인 파일을 만듦 (원자적 교체)"""
+    books = [b for b in BOOK_MAP if load_book(bible_dir, b) is not None]
+
+    verses = array("H")
+    postings: dict[int, list[int]] = {}
+    vid = 0
+    for book_id, book in enumerate(books):
+        for (ch, vs), body in sorted(load_book(bible_dir, book).items()):
+            grams = _bigrams(normalize_text(body))
+            verses.extend((book_id, ch, vs, min(len(grams), 0xFFFF)))
+            for g in grams:
+                postings.setdefault(g, []).append(vid)
+            vid += 1
+
+    terms = array("I", sorted(postings))
+    offsets = array("I", [0])
+    flat = array("H" if vid <= 0xFFFF else "I")
+    for g in terms:
+        flat.fromlist(postings[g])
+        offsets.append(len(flat))
+
+    books_json = json.dumps(books, ensure_ascii=False).encode("utf-8")
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=out_path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_MAGIC)
+            f.write(_HEADER.pack(vid, len(terms), len(books_json), flat.itemsize))
+            f.write(books_json + b"\0" * _pad4(len(books_json)))
+            f.write(verses.tobytes() + b"\0" * _pad4(len(verses) * 2))
+            f.write(terms.tobytes())
+            f.write(offsets.tobytes())
+            f.write(flat.tobytes())
+        os.replace(tmp, out_path)
+    except Exception:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+    return out_path
+
+
+class BibleSearchIndex:
+    """
+    mmap 으로 연 bigram 역색인. 파일을 통째로 메모리에 올리지 않고 필요한 postings 만 읽음.
+    점수: 질의 bigram 들의 idf 합 (짧은 절을 약간 우대), 질의 전체가 그대로 들어 있으면 맨 앞.
+    """
+
+    def __init__(self, path: Path, bible_dir: Path):
+        self.path = Path(path)
+        self.bible_dir = Path(bible_dir)
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mm[:8] != _MAGIC:
+            raise ValueError(f"not a bible search index: {self.path}")
+        pos = 8
+        self.n_verses, n_terms, books_len, posting_size = _HEADER.unpack_from(self._mm, pos)
+        pos += _HEADER.size
+        self.books = json.loads(bytes(self._mm[pos:pos + books_len]).decode("utf-8"))
+        pos += books_len + _pad4(books_len)
+
+        view = memoryview(self._mm)
+        self._verses = view[pos:pos + self.n_verses * 8].cast("H")
+        pos += self.n_verses * 8 + _pad4(self.n_verses * 8)
+        self._terms = view[pos:pos + n_terms * 4].cast("I")
+        pos += n_terms * 4
+        self._offsets = view[pos:pos + (n_terms + 1) * 4].cast("I")
+        pos += (n_terms + 1) * 4
+        self._postings = view[pos:].cast("H" if posting_size == 2 else "I")
+
+        total = sum(self._verses[i * 4 + 3] for i in range(self.n_verses))
+        self._avg_len = (total / self.n_verses) if self.n_verses else 1.0
+
+    def _postings_for(self, term: int):
+        i = bisect_left(self._terms, term)
+        if i == len(self._terms) or self._terms[i] != term:
+            return None
+        return self._postings[self._offsets[i]:self._offsets[i + 1]]
+
+    def _ref(self, vid: int) -> tuple[str, int, int]:
+        b, ch, vs, _ = self._verses[vid * 4:vid * 4 + 4]
+        return self.books[b], ch, vs
+
+    def search(self, query: str, limit: int = 20, min_match: float = 0.6) -> list[dict]:
+        """
+        질의와 겹치는 bigram 이 min_match 비율 이상인 절을 점수순으로.
+        질의가 두 글자 미만이면 빈 목록.
+        """
+        t0 = time.perf_counter()
+        q = normalize_text(query)
+        grams = _bigrams(q)
+        if not grams:
+            return []
+
+        scores: dict[int, float] = {}
+        matched: dict[int, int] = {}
+        for g in grams:
+            plist = self._postings_for(g)
+            if plist is None:
+                continue
+            idf = math.log(1 + self.n_verses / len(plist))
+            for vid in plist:
+                scores[vid] = scores.get(vid, 0.0) + idf
+                matched[vid] = matched.get(vid, 0) + 1
+
+        need = max(1, math.ceil(len(grams) * min_match))
+        candidates = [vid for vid, n in matched.items() if n >= need]
+        for vid in candidates:
+            length = self._verses[vid * 4 + 3]
+            scores[vid] /= 0.75 + 0.25 * length / self._avg_len
+
+        # 상위 후보만 본문을 보고 "질의 전체 포함" 여부로 다시 정렬
+        candidates.sort(key=lambda v: scores[v], reverse=True)
+        results = []
+        for vid in candidates[:max(limit * 5, 50)]:
+            book, ch, vs = self._ref(vid)
+            text = (load_book(self.bible_dir, book) or {}).get((ch, vs), "")
+            exact = q in normalize_text(text)
+            results.append({
+                "book": book,
+                "chapter": ch,
+                "verse": vs,
+                "ref": f"{book} {ch}장 {vs}절",
+                "text": text,
+                "score": round(scores[vid], 3),
+                "exact": exact,
+            })
+        results.sort(key=lambda r: (not r["exact"], -r["score"]))
+
+        _SEARCH_SECONDS.observe(time.perf_counter() - t0)
+        return results[:limit]
+
+    def close(self) -> None:
+        for v in (self._verses, self._terms, self._offsets, self._postings):
+            v.release()
+        self._mm.close()
+
+
+_index: BibleSearchIndex | None = None
+_index_version: str | None = None
+_index_lock = threading.Lock()
+
+
+def get_bible_search(bible_dir: Path, index_dir: Path = Path("out/bible_search")) -> BibleSearchIndex:
+    """
+    성경 데이터 버전별로 색인 파일을 한 번만 만들고(다른 worker 가 만들어 둔 게 있으면 그대로 씀)
+    mmap 으로 열어 둔 인스턴스를 반환.
+    """
+    global _index, _index_version
+    version = bible_version(bible_dir)
+    if _index is not None and _index_version == version:
+        return _index
+
+    with _index_lock:
+        if _index is not None and _index_version == version:
+            return _index
+
+        fp = Path(index_dir) / f"{version}.idx"
+        if not fp.exists():
+            build_search_index(bible_dir, fp)
+            for old in Path(index_dir).glob("*.idx"):
+                if old != fp:
+                    try:
+                        old.unlink()
+                    except OSError:
+                        pass
+        _index, _index_version = BibleSearchIndex(fp, bible_dir), version
+        return _index
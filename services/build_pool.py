@@ -0,0 +1,188 @@
+# services/build_pool.py
+from __future__ import annotations
+
+import asyncio
+import io
+import math
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from services.bible import preload_bible
+from services.cleanup import env_int
+from services.expiry import register_expiry
+from services.metrics import REGISTRY, counter, histogram
+from services.ppt_builder import build_ppt, build_ppt_buffer, load_template
+
+
+class BuildRejected(Exception):
+    """대기 중인 빌드가 max_pending 개를 넘었을 때 (→ 429)"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"build queue full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+_QUEUE_WAIT_SECONDS = histogram("ppt_build_queue_wait_seconds", "빌드 풀 대기 시간")
+_BUILD_SECONDS = histogram("ppt_build_seconds", "빌드 worker 안에서 덱 하나 만드는 시간")
+_BUILDS = counter("ppt_builds_total", "빌드 풀 요청 결과", ("result",))
+
+
+# ---------- worker 프로세스 쪽 ----------
+
+_worker_template: Path | None = None
+_worker_bible_dir: Path | None = None
+
+
+def _init_worker(template_path: str, bible_dir: str) -> None:
+    """worker 프로세스 시작 시 템플릿 캐시와 성경 인덱스를 미리 올려 둠"""
+    global _worker_template, _worker_bible_dir
+    _worker_template = Path(template_path)
+    _worker_bible_dir = Path(bible_dir)
+
+    preload_bible(_worker_bible_dir)
+    if _worker_template.exists():
+        load_template(_worker_template)
+
+
+def _warm() -> int:
+    return os.getpid()
+
+
+def _build_in_worker(plan: dict, submitted_at: float, out_dir: str | None, spool_max_bytes: int):
+    """
+    out_dir 가 None 이면 덱을 bytes 로 반환. 단 spool_max_bytes 보다 크면 임시파일에 써서 그 경로(str)를 반환
+    (웹 프로세스가 큰 덱을 통째로 메모리에 받지 않게). out_dir 가 있으면 out_dir 에 저장한 경로(str).
+    시간은 프로세스 간 비교를 위해 time.time() 기준.
+    worker 에서 쌓인 단계별 지표는 timings["metrics"] 로 같이 넘겨서 웹 프로세스에 합침.
+    """
+    started_at = time.time()
+    if out_dir is None:
+        buf = build_ppt_buffer(plan, _worker_template, _worker_bible_dir, spool_max_bytes=spool_max_bytes)
+        try:
+            if buf.seek(0, os.SEEK_END) <= spool_max_bytes:
+                buf.seek(0)
+                result = buf.read()
+            else:
+                buf.seek(0)
+                fd, result = tempfile.mkstemp(prefix="deck-", suffix=".pptx")
+                with os.fdopen(fd, "wb") as out:
+                    shutil.copyfileobj(buf, out)
+                # 웹 프로세스가 결과를 못 받고 끝나도(요청 취소 등) 남지 않게
+                register_expiry(Path(result), env_int("PPT_TTL_SEC", 3600))
+        finally:
+            buf.close()
+    else:
+        result = str(build_ppt(plan, _worker_template, _worker_bible_dir, Path(out_dir)))
+    timings = {"queue_wait": started_at - submitted_at, "build": time.time() - started_at}
+    timings["metrics"] = REGISTRY.drain()
+    return result, timings
+
+
+def open_build_result(result):
+    """
+    out_dir 없이 빌드한 결과를 (처음으로 되감은 파일 객체, 크기)로.
+    임시파일로 넘어온 큰 덱은 열어 둔 채 바로 지워서 이름 없는 파일로 만듦 (닫으면 사라짐).
+    파일을 열고 지우므로 이벤트 루프 밖에서 부를 것.
+    """
+    if isinstance(result, bytes):
+        return io.BytesIO(result), len(result)
+    f = open(result, "rb")
+    os.unlink(result)
+    return f, os.fstat(f.fileno()).st_size
+
+
+# ---------- 웹 프로세스 쪽 ----------
+
+
+class DeckBuildPool:
+    """
+    CPU를 많이 쓰는 python-pptx 빌드를 별도 프로세스 풀에서 돌림 (GIL 경쟁 방지).
+    - 대기+실행 중인 빌드가 max_pending 개 이상이면 BuildRejected (Retry-After 추정치 포함)
+    - 큐 대기 시간과 빌드 시간을 따로 집계
+    - out_dir 없이 빌드한 덱은 spool_max_bytes(PPT_SPOOL_MAX_BYTES)까지만 bytes 로 받고, 넘으면 임시파일로 받음
+    """
+
+    def __init__(self, template_path: Path, bible_dir: Path, *, workers: int, max_pending: int, start_method: str = "spawn"):
+        self.workers = max(1, workers)
+        self.max_pending = max(self.workers, max_pending)
+        self.spool_max_bytes = env_int("PPT_SPOOL_MAX_BYTES", 8 * 1024 * 1024)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context(start_method),
+            initializer=_init_worker,
+            initargs=(str(template_path), str(bible_dir)),
+        )
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._counters = {"builds": 0, "failed": 0, "rejected": 0}
+        self._totals = {"queue_wait": 0.0, "build": 0.0}
+        self._max = {"queue_wait": 0.0, "build": 0.0}
+
+    def warm(self) -> None:
+        """worker 프로세스를 미리 다 띄워 둠 (initializer 에서 템플릿/성경 로드)"""
+        for fut in [self._executor.submit(_warm) for _ in range(self.workers)]:
+            fut.result()
+
+    def _retry_after(self) -> int:
+        avg_build = (self._totals["build"] / self._counters["builds"]) if self._counters["builds"] else 1.0
+        return max(1, math.ceil(avg_build * self._pending / self.workers))
+
+    async def build(self, plan: dict, out_dir: Path | None = None):
+        """
+        (결과, {"queue_wait": 초, "build": 초}).
+        결과는 out_dir 가 있으면 저장 경로, 없으면 open_build_result() 에 넘길 값 (bytes 또는 임시파일 경로)
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._counters["rejected"] += 1
+                _BUILDS.inc(result="rejected")
+                raise BuildRejected(self._retry_after())
+            self._pending += 1
+
+        try:
+            fut = self._executor.submit(
+                _build_in_worker, plan, time.time(), None if out_dir is None else str(out_dir), self.spool_max_bytes
+            )
+            result, timings = await asyncio.wrap_future(fut)
+        except Exception:
+            with self._lock:
+                self._counters["failed"] += 1
+            _BUILDS.inc(result="failed")
+            raise
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+        REGISTRY.merge(timings.pop("metrics", {}))
+        _BUILDS.inc(result="ok")
+        _QUEUE_WAIT_SECONDS.observe(timings["queue_wait"])
+        _BUILD_SECONDS.observe(timings["build"])
+        with self._lock:
+            self._counters["builds"] += 1
+            for k in ("queue_wait", "build"):
+                self._totals[k] += timings[k]
+                self._max[k] = max(self._max[k], timings[k])
+        return result, timings
+
+    def stats(self) -> dict:
+        with self._lock:
+            n = self._counters["builds"]
+            return {
+                "workers": self.workers,
+                "pending": self._pending,
+                "max_pending": self.max_pending,
+                **self._counters,
+                "queue_wait_avg_ms": (self._totals["queue_wait"] / n * 1000) if n else 0.0,
+                "queue_wait_max_ms": self._max["queue_wait"] * 1000,
+                "build_avg_ms": (self._totals["build"] / n * 1000) if n else 0.0,
+                "build_max_ms": self._max["build"] * 1000,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -59,3 +59,15 @@ def env_int(name: str, default: int) -> int:
         return int(os.getenv(name, str(default)))
     except Exception:
         return default
+
+
+def env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except Exception:
+        return default
+
+
+def web_workers() -> int:
+    """uvicorn --workers 로 띄운 worker 프로세스 수 (프로세스마다 잡는 자원을 나눌 때 씀)"""
+    return max(1, env_int("WEB_WORKERS", 1))
@@ -0,0 +1,202 @@
+# services/deck_batch.py
+from __future__ import annotations
+
+import asyncio
+import datetime
+import json
+import time
+import zipfile
+from pathlib import Path
+
+from services.bible import bible_version
+from services.build_pool import BuildRejected, open_build_result
+from services.deck_cache import deck_cache_key, get_deck_cache
+from services.metrics import counter
+from services.ppt_builder import template_version
+
+_READ_CHUNK = 1024 * 1024
+
+_BATCH_DECKS = counter("ppt_batch_decks_total", "배치 생성에서 덱 하나의 결과", ("result",))
+
+
+class ZipStream:
+    """
+    seek 없이 앞에서부터 써 내려가는 zip. 파일을 하나 넣을 때마다 그때까지 만들어진 바이트만 돌려줌
+    → 전체 아카이브를 메모리에 들고 있지 않고 바로 응답으로 흘려보낼 수 있음.
+    .pptx 는 이미 압축된 zip 이라 기본은 STORED.
+    """
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        # tell/seek 가 없으니 zipfile 이 data descriptor 방식으로 씀
+        self._zf = zipfile.ZipFile(self, "w")
+
+    # zipfile 이 쓰는 파일 객체 인터페이스
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def _drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+    @staticmethod
+    def _info(name: str, compress_type: int) -> zipfile.ZipInfo:
+        info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+        info.compress_type = compress_type
+        info.external_attr = 0o644 << 16
+        return info
+
+    def add(self, name: str, data: bytes, compress_type: int = zipfile.ZIP_STORED) -> bytes:
+        self._zf.writestr(self._info(name, compress_type), data)
+        return self._drain()
+
+    def open(self, name: str, compress_type: int = zipfile.ZIP_STORED):
+        """
+        항목 하나를 조금씩 쓰는 파일 객체 (큰 덱을 통째로 메모리에 올리지 않게).
+        write 할 때마다 drain() 으로 그때까지 만들어진 바이트를 가져갈 것. 다 쓰면 close 후 한 번 더 drain().
+        """
+        return self._zf.open(self._info(name, compress_type), "w")
+
+    def drain(self) -> bytes:
+        return self._drain()
+
+    def close(self) -> bytes:
+        self._zf.close()
+        return self._drain()
+
+
+async def _build(pool, plan: dict, attempts: int = 3):
+    """빌드 풀이 다른 요청으로 꽉 찼으면(BuildRejected) 잠깐 기다렸다가 다시"""
+    for attempt in range(attempts):
+        try:
+            return await pool.build(plan)
+        except BuildRejected as e:
+            if attempt == attempts - 1:
+                raise
+            await asyncio.sleep(min(e.retry_after, 5))
+
+
+def _spool(result, cache, key: str | None):
+    """빌드 결과(bytes 또는 임시파일 경로)를 (파일 객체, 크기)로 열고, 키가 있으면 캐시에도 넣음"""
+    f, size = open_build_result(result)
+    if key:
+        try:
+            cache.put(key, f)
+        except Exception:
+            f.close()
+            raise
+    return f, size
+
+
+async def iter_deck_batch(plan_ids: list[str], *, store, pool, template: Path, bible_dir: Path, parallel: int):
+    """
+    plan 여러 개를 빌드 풀에서 동시에 만들면서, 끝나는 순서대로 zip 에 넣어 흘려보냄.
+    - 템플릿/성경은 빌드 풀 worker 가 이미 올려 둔 것을 같이 씀
+    - 동시에 진행하는 plan 은 parallel 개까지. 끝난 덱이 응답으로 나간 뒤에야 다음 plan 을 시작하므로
+      클라이언트가 느리게 받아도 메모리에 쌓이는 덱은 parallel 개를 넘지 않음
+    - plan/캐시 파일 I/O 는 스레드에서 (이벤트 루프를 막지 않게)
+    - plan 마다의 실패(없는 plan, 빌드 오류)는 manifest.json 에 남기고 나머지는 계속
+    - manifest.json 은 모든 덱이 끝난 뒤 마지막 항목으로 들어감
+    """
+    loop = asyncio.get_running_loop()
+    cache = get_deck_cache()
+    try:
+        versions = await loop.run_in_executor(
+            None, lambda: {"template_version": template_version(template), "bible_version": bible_version(bible_dir)}
+        )
+    except OSError:
+        # 템플릿을 못 읽으면 캐시 키를 못 만듦 → 캐시 없이 진행 (빌드 오류는 plan 별로 manifest 에)
+        cache, versions = None, {}
+
+    async def _deck(plan: dict, entry: dict):
+        """(처음으로 되감은 파일 객체, 크기). 캐시 hit 이면 캐시 파일을 그대로 열어서 줌"""
+        key = deck_cache_key(plan, **versions) if cache is not None else None
+        if key:
+            hit = await loop.run_in_executor(None, cache.open, key)
+            if hit:
+                entry["cached"] = True
+                return hit
+
+        result, timings = await _build(pool, plan)
+        entry["build_ms"] = round(timings["build"] * 1000, 1)
+        # PPT_SPOOL_MAX_BYTES 보다 큰 덱은 임시파일 경로로 옴 → 스레드에서 열어서 (지우고) 파일로
+        return await loop.run_in_executor(None, _spool, result, cache, key)
+
+    async def _one(n: int, plan_id: str):
+        entry = {
+            "plan_id": plan_id, "ok": False, "file": None, "bytes": 0, "cached": False, "build_ms": None, "error": None,
+        }
+        try:
+            plan = await loop.run_in_executor(None, store.get, plan_id)
+            if not plan:
+                entry["error"] = "plan not found"
+                return entry, None
+            f, size = await _deck(plan, entry)
+        except Exception as e:
+            # 한 plan 이 실패해도 나머지는 계속
+            entry["error"] = f"{type(e).__name__}: {e}"
+            return entry, None
+
+        entry.update(ok=True, file=f"{n:02d}_{plan_id}.pptx", bytes=size)
+        return entry, f
+
+    todo = iter(enumerate(plan_ids, start=1))
+    running: set[asyncio.Future] = set()
+
+    def _start() -> None:
+        # 자리가 빈 만큼만 다음 plan 을 시작
+        while len(running) < max(1, parallel):
+            nxt = next(todo, None)
+            if nxt is None:
+                return
+            running.add(asyncio.ensure_future(_one(*nxt)))
+
+    order = {plan_id: n for n, plan_id in enumerate(plan_ids)}
+    zs = ZipStream()
+    manifest: list[dict] = []
+    try:
+        _start()
+        while running:
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for fut in done:
+                running.discard(fut)
+                entry, f = fut.result()
+                _BATCH_DECKS.inc(result="failed" if not entry["ok"] else "cached" if entry["cached"] else "built")
+                manifest.append(entry)
+                if f is None:
+                    continue
+                # 덱 파일은 청크 단위로 (읽기는 스레드에서) zip 에 흘려보냄
+                with f, zs.open(entry["file"]) as dst:
+                    while chunk := await loop.run_in_executor(None, f.read, _READ_CHUNK):
+                        dst.write(chunk)
+                        yield zs.drain()
+                yield zs.drain()
+            _start()
+
+        manifest.sort(key=lambda e: order[e["plan_id"]])
+        summary = {
+            "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+            "total": len(manifest),
+            "ok": sum(1 for e in manifest if e["ok"]),
+            "failed": sum(1 for e in manifest if not e["ok"]),
+            "decks": manifest,
+        }
+        yield zs.add(
+            "manifest.json",
+            json.dumps(summary, ensure_ascii=False, indent=2).encode("utf-8"),
+            compress_type=zipfile.ZIP_DEFLATED,
+        )
+        yield zs.close()
+    finally:
+        # 클라이언트가 중간에 끊으면 진행 중인 빌드는 취소 (아직 시작 안 한 plan 은 시작하지 않음)
+        # 이미 끝났는데 못 보낸 덱은 파일만 닫음
+        for t in running:
+            if not t.done():
+                t.cancel()
+            elif not t.cancelled() and t.exception() is None and t.result()[1] is not None:
+                t.result()[1].close()
@@ -0,0 +1,176 @@
+# services/deck_cache.py
+from __future__ import annotations
+
+import datetime
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+from services.cleanup import _safe_unlink, env_int
+from services.deck_slim import output_options
+from services.expiry import register_expiry
+
+# 렌더링 규칙(ppt_builder)이 바뀌면 올려서 예전 캐시를 무효화
+BUILDER_VERSION = 1
+
+
+def _render_inputs(plan: dict) -> dict:
+    """plan 중에서 덱 결과에 영향을 주는 값만 추림 (plan_id, flags 등은 제외)"""
+    songs = plan.get("songs") or {}
+
+    def _song(s):
+        if not s:
+            return None
+        return {"title": s.get("title", ""), "lyrics": s.get("lyrics", "") or ""}
+
+    return {
+        "sermon_title": plan.get("sermon_title", ""),
+        "sermon_phrases": plan.get("sermon_phrases", []),
+        "prayer": plan.get("prayer", "기도 | "),
+        "praise": [_song(s) for s in songs.get("praise") or []],
+        "offering": _song(songs.get("offering")),
+        "closing": _song(songs.get("closing")),
+    }
+
+
+def deck_cache_key(plan: dict, *, template_version: str, bible_version: str, date: datetime.date | None = None) -> str:
+    """
+    plan 렌더링 입력 + 날짜(프리뷰 슬라이드에 들어감) + 템플릿/성경 버전 + 저장 방식(slim/zip 레벨)의 sha256.
+    """
+    payload = {
+        "plan": _render_inputs(plan),
+        "date": (date or datetime.date.today()).isoformat(),
+        "template": template_version,
+        "bible": bible_version,
+        "builder": BUILDER_VERSION,
+        "output": output_options(),
+    }
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class DeckCache:
+    """
+    생성된 .pptx 를 out/deck_cache/{key}.pptx 로 보관하는 content-addressed 캐시.
+    - hit 이면 파일 mtime 을 갱신 (LRU 기준 + cleanup TTL 이 "마지막 사용 후" 기준이 되게)
+    - 전체 크기가 max_bytes 를 넘으면 mtime 오래된 것부터 삭제
+    - hit/miss/bytes_saved 는 프로세스별 카운터
+    - ttl_sec 을 주면 put/hit 때마다 만료 인덱스에 (다시) 등록
+    """
+
+    def __init__(self, base_dir: str = "out/deck_cache", *, max_bytes: int, ttl_sec: int | None = None):
+        self.base = Path(base_dir)
+        self.base.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttl_sec = ttl_sec
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "bytes_saved": 0, "evicted": 0}
+
+    def _fp(self, key: str) -> Path:
+        return self.base / f"{key}.pptx"
+
+    def open(self, key: str):
+        """
+        hit 이면 (열린 파일, 크기), miss 면 None.
+        먼저 열어 두므로 전송 중에 다른 요청이 evict 해도 안전함.
+        """
+        fp = self._fp(key)
+        try:
+            f = open(fp, "rb")
+        except FileNotFoundError:
+            with self._lock:
+                self._counters["misses"] += 1
+            return None
+
+        size = os.fstat(f.fileno()).st_size
+        try:
+            os.utime(fp)
+        except OSError:
+            pass
+        if self.ttl_sec:
+            register_expiry(fp, self.ttl_sec)
+        with self._lock:
+            self._counters["hits"] += 1
+            self._counters["bytes_saved"] += size
+        return f, size
+
+    def put(self, key: str, buf) -> None:
+        """buf(파일 객체)를 처음부터 끝까지 캐시에 복사하고 다시 처음으로 되감음"""
+        fd, tmp = tempfile.mkstemp(dir=self.base, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                buf.seek(0)
+                while chunk := buf.read(1024 * 1024):
+                    out.write(chunk)
+            os.replace(tmp, self._fp(key))
+            if self.ttl_sec:
+                register_expiry(self._fp(key), self.ttl_sec)
+        except Exception:
+            _safe_unlink(Path(tmp))
+            raise
+        finally:
+            buf.seek(0)
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for fp in self.base.glob("*.pptx"):
+            try:
+                st = fp.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, fp))
+
+        total = sum(e[1] for e in entries)
+        if total <= self.max_bytes:
+            return
+
+        for _, size, fp in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            if _safe_unlink(fp):
+                total -= size
+                with self._lock:
+                    self._counters["evicted"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+        entries, size = 0, 0
+        for fp in self.base.glob("*.pptx"):
+            try:
+                size += fp.stat().st_size
+                entries += 1
+            except FileNotFoundError:
+                continue
+        total = counters["hits"] + counters["misses"]
+        return {
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "hit_rate": (counters["hits"] / total) if total else 0.0,
+            **counters,
+        }
+
+
+_cache: DeckCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_deck_cache() -> DeckCache | None:
+    """프로세스 전역 덱 캐시. DECK_CACHE_ENABLED=0 이면 None."""
+    global _cache
+    if not env_int("DECK_CACHE_ENABLED", 1):
+        return None
+
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = DeckCache(
+                    max_bytes=env_int("DECK_CACHE_MAX_BYTES", 200 * 1024 * 1024),
+                    ttl_sec=env_int("DECK_CACHE_TTL_SEC", 24 * 3600),
+                )
+    return _cache
@@ -0,0 +1,153 @@
+# services/deck_slim.py
+from __future__ import annotations
+
+import hashlib
+import logging
+import time
+import zipfile
+
+from pptx import Presentation
+from pptx.opc.package import _Relationship
+from pptx.opc.serialized import PackageWriter
+
+from services.cleanup import env_int
+from services.metrics import counter, histogram
+
+log = logging.getLogger(__name__)
+
+# 이미 압축된 형식이라 deflate 해도 거의 안 줄어드는 media (slim 모드에서는 그대로 저장)
+_COMPRESSED_MEDIA = (".png", ".jpg", ".jpeg", ".gif", ".mp4", ".m4a", ".mp3", ".wdp")
+
+_PARTS_REMOVED = counter("ppt_slim_parts_removed_total", "slim 모드에서 덱에서 빠진 파트 수", ("kind",))
+_BYTES_REMOVED = histogram(
+    "ppt_slim_bytes_removed", "slim 모드에서 덱 하나당 빠진 파트 크기(압축 전)",
+    buckets=tuple(2 ** n * 1024 * 1024 for n in range(-4, 6)),
+)
+
+
+def output_options() -> dict:
+    """
+    덱 저장 방식. 결과 바이트가 달라지므로 덱 캐시 키에도 들어감.
+    - PPT_SLIM=1     : 안 쓰는 layout/master 제거 + 같은 media 하나로 합침
+    - PPT_ZIP_LEVEL  : zip deflate 레벨 0~9 (-1 이면 python-pptx 기본값, 0 이면 압축 안 함)
+    """
+    return {"slim": bool(env_int("PPT_SLIM", 0)), "zip_level": env_int("PPT_ZIP_LEVEL", -1)}
+
+
+def _part_bytes(parts) -> dict:
+    return {part: len(part.blob) for part in parts}
+
+
+def _prune_layouts(p: Presentation, used: set[tuple[int, int]]) -> tuple[int, int]:
+    """used 에 없는 layout 을 master 에서 떼어 내고, layout 이 하나도 안 남은 master 는 통째로 뗌"""
+    layouts_removed = masters_removed = 0
+    masters = list(p.slide_masters)
+    sldMasterIdLst = p.slide_masters._sldMasterIdLst
+
+    for m_idx, (master, sldMasterId) in enumerate(zip(masters, list(sldMasterIdLst))):
+        sldLayoutIdLst = master._element.get_or_add_sldLayoutIdLst()
+        for l_idx, sldLayoutId in enumerate(list(sldLayoutIdLst)):
+            if (m_idx, l_idx) in used:
+                continue
+            sldLayoutIdLst.remove(sldLayoutId)
+            master.part.drop_rel(sldLayoutId.rId)
+            layouts_removed += 1
+
+        if not any(m == m_idx for m, _ in used):
+            sldMasterIdLst.remove(sldMasterId)
+            p.part.drop_rel(sldMasterId.rId)
+            masters_removed += 1
+
+    return layouts_removed, masters_removed
+
+
+def _dedupe_media(p: Presentation) -> int:
+    """내용이 같은 media 파트를 가리키는 관계를 첫 번째 파트 하나로 모음. 합친 파트 수 반환"""
+    canonical: dict[tuple[str, str], object] = {}
+    merged = set()
+    for part in list(p.part.package.iter_parts()):
+        rels = part.rels
+        for rId, rel in list(rels.items()):
+            if rel.is_external or not rel.target_part.partname.startswith("/ppt/media/"):
+                continue
+            target = rel.target_part
+            key = (target.content_type, hashlib.sha1(target.blob).hexdigest())
+            first = canonical.setdefault(key, target)
+            if first is target:
+                continue
+            # _Relationship 은 target 을 lazyproperty 로 캐시하므로 같은 rId 로 새로 만들어 바꿔 끼움
+            rels._rels[rId] = _Relationship(rel._base_uri, rId, rel.reltype, rel._target_mode, first)
+            rels.__dict__.pop("_rels_by_reltype", None)
+            merged.add(target)
+    return len(merged)
+
+
+def slim_deck(p: Presentation, used: set[tuple[int, int]]) -> dict:
+    """
+    렌더링이 끝난 덱에서 안 쓰는 layout/master(와 그 theme/이미지)를 빼고 같은 media 를 합침.
+    used: 실제로 쓴 (master, layout) 인덱스. 빠진 파트 수/크기를 지표로 남기고 그대로 반환.
+    bytes_removed 는 빠진 파트의 압축 전 크기(실제 파일이 줄어드는 양은 더 작을 수 있음),
+    prune_ms 는 slim 자체에 쓴 시간. 저장 시간이 얼마나 줄었는지는 덱마다 재지 않음
+    (같은 덱을 두 번 저장해야 알 수 있어서) → bench/bench_slim.py 로 비교.
+    """
+    t0 = time.perf_counter()
+    before = _part_bytes(p.part.package.iter_parts())
+
+    layouts_removed, masters_removed = _prune_layouts(p, used)
+    media_merged = _dedupe_media(p)
+
+    after = set(p.part.package.iter_parts())
+    removed = [part for part in before if part not in after]
+    stats = {
+        "layouts_removed": layouts_removed,
+        "masters_removed": masters_removed,
+        "media_merged": media_merged,
+        "parts_removed": len(removed),
+        "bytes_removed": sum(before[part] for part in removed),
+        "prune_ms": (time.perf_counter() - t0) * 1000,
+    }
+
+    _PARTS_REMOVED.inc(layouts_removed, kind="layout")
+    _PARTS_REMOVED.inc(masters_removed, kind="master")
+    _PARTS_REMOVED.inc(media_merged, kind="media")
+    _BYTES_REMOVED.observe(stats["bytes_removed"])
+    log.info(
+        "slim deck: layouts -%d masters -%d media merged %d, %d parts / %.0f KB (uncompressed) removed, took %.0fms",
+        layouts_removed, masters_removed, media_merged, len(removed), stats["bytes_removed"] / 1024, stats["prune_ms"],
+    )
+    return stats
+
+
+class _ZipWriter:
+    """PackageWriter 가 쓰는 phys_writer 인터페이스 (write(pack_uri, blob)) 에 압축 레벨만 얹음"""
+
+    def __init__(self, zf: zipfile.ZipFile, store_media: bool):
+        self.zf = zf
+        self.store_media = store_media
+
+    def write(self, pack_uri, blob: bytes) -> None:
+        name = pack_uri.membername
+        if self.store_media and name.lower().endswith(_COMPRESSED_MEDIA):
+            self.zf.writestr(name, blob, compress_type=zipfile.ZIP_STORED)
+        else:
+            self.zf.writestr(name, blob)
+
+
+def save_deck(p: Presentation, pkg_file, *, zip_level: int = -1, store_media: bool = False) -> None:
+    """
+    p.save 와 같은 순서/내용으로 저장하되 deflate 레벨과 media 저장 방식을 고를 수 있게.
+    zip_level -1 + store_media False 면 p.save 그대로.
+    """
+    if zip_level < 0 and not store_media:
+        p.save(pkg_file)
+        return
+
+    package = p.part.package
+    writer = PackageWriter(pkg_file, package._rels, tuple(package.iter_parts()))
+    compression = zipfile.ZIP_STORED if zip_level == 0 else zipfile.ZIP_DEFLATED
+    level = None if zip_level < 0 else min(zip_level, 9)
+    with zipfile.ZipFile(pkg_file, "w", compression=compression, compresslevel=level, strict_timestamps=False) as zf:
+        phys = _ZipWriter(zf, store_media)
+        writer._write_content_types_stream(phys)
+        writer._write_pkg_rels(phys)
+        writer._write_parts(phys)
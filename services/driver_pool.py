@@ -0,0 +1,262 @@
+# services/driver_pool.py
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable
+
+from services.cleanup import web_workers
+
+
+class DriverPoolTimeout(Exception):
+    """acquire_timeout 안에 빈 드라이버를 못 받았을 때"""
+
+
+def _proc_rss_kb(pid: int) -> int:
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    except Exception:
+        pass
+    return 0
+
+
+def _proc_children(pid: int) -> list[int]:
+    kids: list[int] = []
+    try:
+        for task in Path(f"/proc/{pid}/task").iterdir():
+            kids += [int(x) for x in (task / "children").read_text().split()]
+    except Exception:
+        pass
+    return kids
+
+
+def process_tree_rss_mb(pid: int) -> float:
+    """
+    chromedriver + 그 밑의 chromium 프로세스들 RSS 합계(MB).
+    /proc 을 못 읽는 환경(mac 등)에서는 0 → RSS 기준 재활용은 사실상 꺼짐.
+    """
+    total_kb = 0
+    stack = [pid]
+    seen = set()
+    while stack:
+        p = stack.pop()
+        if p in seen:
+            continue
+        seen.add(p)
+        total_kb += _proc_rss_kb(p)
+        stack += _proc_children(p)
+    return total_kb / 1024
+
+
+def _mem_available_mb() -> int | None:
+    try:
+        for line in Path("/proc/meminfo").read_text().splitlines():
+            if line.startswith("MemAvailable:"):
+                return int(line.split()[1]) // 1024
+    except Exception:
+        pass
+    return None
+
+
+def resource_budget(per_driver_mb: int) -> int:
+    """
+    동시에 띄워도 되는 브라우저 수: CPU 수와 (가용 메모리 / 브라우저당 MB) 중 작은 값 (최소 1).
+    worker 프로세스가 여러 개면 각자 자기 몫(1/WEB_WORKERS)만 씀.
+    """
+    budget = os.cpu_count() or 1
+    mem_mb = _mem_available_mb()
+    if mem_mb is not None and per_driver_mb > 0:
+        budget = min(budget, mem_mb // per_driver_mb)
+    return max(1, budget // web_workers())
+
+
+class _PooledDriver:
+    __slots__ = ("driver", "uses", "created_at")
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+        self.created_at = time.time()
+
+
+class DriverPool:
+    """
+    크기가 고정된 Selenium 드라이버 풀.
+    - 최대 max_size 개까지만 브라우저를 띄움 (동시 요청이 많아도 OOM 안 나게)
+    - 빌릴 때 health check, 죽은 드라이버는 새로 만듦
+    - max_uses 번 쓰였거나 RSS가 max_rss_mb 넘으면 반납 시점에 종료하고 교체
+    - 다 쓰고 있으면 acquire_timeout 초까지 대기 후 DriverPoolTimeout
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], object],
+        *,
+        max_size: int,
+        max_uses: int,
+        max_rss_mb: int,
+        acquire_timeout: float,
+    ):
+        self._factory = factory
+        self.max_size = max(1, max_size)
+        self.max_uses = max_uses
+        self.max_rss_mb = max_rss_mb
+        self.acquire_timeout = acquire_timeout
+
+        self._cond = threading.Condition()
+        self._idle: deque[_PooledDriver] = deque()
+        self._live = 0       # 살아있는 드라이버 수(idle + in_use + 생성 중)
+        self._in_use = 0
+        self._waiting = 0
+        self._recycled = 0
+        self._closed = False
+
+    # ---------- 내부 ----------
+
+    def _create(self) -> _PooledDriver:
+        try:
+            return _PooledDriver(self._factory())
+        except Exception:
+            with self._cond:
+                self._live -= 1
+                self._cond.notify()
+            raise
+
+    def _discard(self, pd: _PooledDriver) -> None:
+        try:
+            pd.driver.quit()
+        except Exception:
+            pass
+        with self._cond:
+            self._live -= 1
+            self._cond.notify()
+
+    @staticmethod
+    def _healthy(pd: _PooledDriver) -> bool:
+        try:
+            pd.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def _needs_recycle(self, pd: _PooledDriver) -> bool:
+        if self.max_uses and pd.uses >= self.max_uses:
+            return True
+        if self.max_rss_mb:
+            try:
+                pid = pd.driver.service.process.pid
+            except Exception:
+                return False
+            if process_tree_rss_mb(pid) > self.max_rss_mb:
+                return True
+        return False
+
+    def _acquire(self, timeout: float) -> _PooledDriver:
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._cond:
+                self._waiting += 1
+                try:
+                    while not self._idle and self._live >= self.max_size:
+                        if self._closed:
+                            raise DriverPoolTimeout("driver pool closed")
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise DriverPoolTimeout(f"no driver available within {timeout:.0f}s")
+                        self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+
+                if self._idle:
+                    pd = self._idle.popleft()
+                    fresh = False
+                else:
+                    self._live += 1   # 자리 먼저 잡고 생성은 lock 밖에서
+                    pd = None
+                    fresh = True
+
+            if fresh:
+                pd = self._create()
+            elif not self._healthy(pd):
+                self._discard(pd)
+                continue
+
+            with self._cond:
+                self._in_use += 1
+            return pd
+
+    def _release(self, pd: _PooledDriver, broken: bool) -> None:
+        pd.uses += 1
+        with self._cond:
+            self._in_use -= 1
+
+        if broken or self._closed or self._needs_recycle(pd):
+            with self._cond:
+                self._recycled += 1
+            self._discard(pd)
+            return
+
+        with self._cond:
+            self._idle.append(pd)
+            self._cond.notify()
+
+    # ---------- 외부 ----------
+
+    @contextmanager
+    def borrow(self, timeout: float | None = None):
+        """
+        with pool.borrow() as driver: ...
+        블록 안에서 WebDriverException 류가 나면 그 드라이버는 버리고 새로 만듦.
+        """
+        pd = self._acquire(self.acquire_timeout if timeout is None else timeout)
+        broken = False
+        try:
+            yield pd.driver
+        except Exception:
+            broken = not self._healthy(pd)
+            raise
+        finally:
+            self._release(pd, broken)
+
+    def warm(self, count: int | None = None) -> int:
+        """
+        미리 count 개(기본 max_size)의 드라이버를 띄워 idle 로 둠. 새로 띄운 개수 반환.
+        """
+        target = self.max_size if count is None else min(count, self.max_size)
+        started = 0
+        while True:
+            with self._cond:
+                if self._closed or self._live >= target:
+                    return started
+                self._live += 1
+            pd = self._create()
+            with self._cond:
+                self._idle.append(pd)
+                self._cond.notify()
+            started += 1
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "max_size": self.max_size,
+                "live": self._live,
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "waiting": self._waiting,
+                "recycled": self._recycled,
+            }
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for pd in idle:
+            self._discard(pd)
@@ -0,0 +1,119 @@
+# services/expiry.py
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from services.cleanup import _safe_unlink, env_int
+
+
+class ExpiryIndex:
+    """
+    생성한 파일(plan json, 덱 캐시 등)을 만료 시각과 함께 SQLite 에 등록해 두고,
+    sweep() 때 만료된 것만 골라 지움. 디렉터리 전체 glob/stat 을 하지 않음.
+    같은 경로를 다시 등록하면 만료 시각이 뒤로 밀림 (저장/사용 시점 기준 TTL).
+    """
+
+    def __init__(self, db_path: str = "out/expiry.sqlite3"):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._conn() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS expiry (path TEXT PRIMARY KEY, expires_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS expiry_at ON expiry(expires_at)")
+
+    @contextmanager
+    def _conn(self):
+        conn = sqlite3.connect(str(self.db_path), timeout=5)
+        try:
+            with conn:
+                conn.execute("PRAGMA synchronous=NORMAL")
+                yield conn
+        finally:
+            conn.close()
+
+    def register(self, path: Path, ttl_sec: int) -> None:
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT INTO expiry (path, expires_at) VALUES (?, ?) "
+                "ON CONFLICT(path) DO UPDATE SET expires_at = excluded.expires_at",
+                (str(Path(path).resolve()), time.time() + ttl_sec),
+            )
+
+    def sweep(self, limit: int = 1000) -> dict:
+        """
+        만료된 항목을 최대 limit 개 삭제.
+        lag_sec: 만료 시각보다 얼마나 늦게 지웠는지(가장 늦은 것 기준)
+        """
+        now = time.time()
+        deleted = 0
+        deleted_bytes = 0
+        missing = 0
+        lag = 0.0
+
+        with self._conn() as conn:
+            due = conn.execute(
+                "SELECT path, expires_at FROM expiry WHERE expires_at <= ? ORDER BY expires_at LIMIT ?",
+                (now, limit),
+            ).fetchall()
+
+        for path, expires_at in due:
+            with self._conn() as conn:
+                # 그 사이 다시 등록(만료 연장)된 항목은 건드리지 않음
+                cur = conn.execute("DELETE FROM expiry WHERE path = ? AND expires_at <= ?", (path, now))
+                if cur.rowcount != 1:
+                    continue
+
+            fp = Path(path)
+            try:
+                size = fp.stat().st_size
+            except FileNotFoundError:
+                missing += 1
+                continue
+            if _safe_unlink(fp):
+                deleted += 1
+                deleted_bytes += size
+                lag = max(lag, now - expires_at)
+
+        return {"due": len(due), "deleted": deleted, "deleted_bytes": deleted_bytes, "missing": missing, "lag_sec": lag}
+
+    def stats(self) -> dict:
+        now = time.time()
+        with self._conn() as conn:
+            total, overdue = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(expires_at <= ?), 0) FROM expiry", (now,)
+            ).fetchone()
+            oldest = conn.execute("SELECT MIN(expires_at) FROM expiry").fetchone()[0]
+        return {
+            "tracked": total,
+            "overdue": overdue,
+            "oldest_overdue_sec": max(0.0, now - oldest) if oldest is not None and oldest <= now else 0.0,
+        }
+
+
+_index: ExpiryIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_expiry_index() -> ExpiryIndex:
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = ExpiryIndex()
+    return _index
+
+
+def register_expiry(path: Path, ttl_sec: int) -> None:
+    """등록 실패가 저장 자체를 막으면 안 되므로 조용히 무시 (어차피 reconcile 스캔이 정리함)"""
+    if not env_int("EXPIRY_INDEX_ENABLED", 1):
+        return
+    try:
+        get_expiry_index().register(path, ttl_sec)
+    except Exception:
+        pass
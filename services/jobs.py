@@ -0,0 +1,265 @@
+# services/jobs.py
+from __future__ import annotations
+
+import json
+import os
+import secrets
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+from services.melon import fetch_lyrics_batch_melon
+
+
+class JobQueueFull(Exception):
+    """대기 중인 job이 max_queue 개를 넘었을 때"""
+
+
+def _owner_alive(pid: int) -> bool:
+    """job 을 등록한 worker 프로세스가 아직 있는지 (job DB 는 같은 머신의 worker 끼리만 공유하므로 pid 로 충분)"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # 다른 사용자의 프로세스가 그 pid 를 쓰는 중 → 있는 것으로 봄
+        return True
+    return True
+
+
+def _slot_song(plan: dict, slot: list) -> dict | None:
+    """slot: ["praise", i] / ["offering", None] / ["closing", None]"""
+    kind, idx = slot
+    songs = plan.get("songs", {})
+    if kind == "praise":
+        praise = songs.get("praise") or []
+        return praise[idx] if idx < len(praise) else None
+    return songs.get(kind)
+
+
+class CrawlJobQueue:
+    """
+    Step2 가사 크롤링을 요청 밖(스레드)에서 돌리는 job 큐.
+    - 동시에 도는 job은 worker 프로세스마다 max_workers 개, 대기열은 전체 max_queue 개까지 (넘으면 JobQueueFull)
+    - 곡 하나 끝날 때마다 plan 파일에 가사를 채워 넣고 job 상태를 갱신
+    - 상태는 SQLite(out/jobs.sqlite3)에 있어서, uvicorn worker 가 여러 개여도
+      Step3 polling 이 어느 worker 로 가든 같은 상태를 봄. 실행은 등록한 worker 가 함
+    - 끝난 job은 keep_sec 지나면 정리. stale_sec 넘게 안 끝난 job 은 등록한 worker(owner pid)가 없어졌을 때만 실패 처리
+      (오래 걸려도 worker 가 살아 있으면 그대로 둠)
+    """
+
+    def __init__(
+        self,
+        store,
+        *,
+        max_workers: int,
+        max_queue: int,
+        keep_sec: int = 3600,
+        stale_sec: int = 1800,
+        db_path: str = "out/jobs.sqlite3",
+    ):
+        self.store = store
+        self.max_queue = max_queue
+        self.keep_sec = keep_sec
+        self.stale_sec = stale_sec
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="crawl-job")
+        self._init_db()
+
+    @contextmanager
+    def _conn(self):
+        conn = sqlite3.connect(str(self.db_path), timeout=5)
+        try:
+            with conn:
+                conn.execute("PRAGMA synchronous=NORMAL")
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self) -> None:
+        with self._conn() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    plan_id TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    error TEXT,
+                    owner INTEGER NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs(status, created_at)")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS job_songs (
+                    job_id TEXT NOT NULL,
+                    i INTEGER NOT NULL,
+                    slot TEXT NOT NULL,
+                    field TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    artist TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    lyrics TEXT,
+                    PRIMARY KEY (job_id, i)
+                )
+                """
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            conn.execute(
+                "INSERT OR IGNORE INTO stats VALUES ('submitted', 0), ('done', 0), ('failed', 0), ('rejected', 0)"
+            )
+            # 이 프로세스는 방금 떴으므로, 같은 pid 로 남아 있는 안 끝난 job 은 pid 를 재사용한 예전 worker 것
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', error = 'worker lost', finished_at = ? "
+                "WHERE owner = ? AND status IN ('queued', 'running')",
+                (time.time(), os.getpid()),
+            )
+
+    @staticmethod
+    def _count(conn, name: str) -> None:
+        conn.execute("UPDATE stats SET value = value + 1 WHERE name = ?", (name,))
+
+    # ---------- 외부 ----------
+
+    def submit(self, plan_id: str, songs: list[dict]) -> str:
+        """
+        songs: [{"slot": ["praise", 0], "field": "lyrics_praise_0", "title": ..., "artist": ...}, ...]
+        """
+        job_id = secrets.token_hex(8)
+        with self._conn() as conn:
+            # 대기열 개수 확인과 등록 사이에 다른 worker 가 끼어들지 않게 쓰기 lock 부터 잡음
+            conn.execute("BEGIN IMMEDIATE")
+            self._prune(conn)
+            queued = conn.execute("SELECT COUNT(*) FROM jobs WHERE status = 'queued'").fetchone()[0]
+            if queued >= self.max_queue:
+                self._count(conn, "rejected")
+                conn.commit()
+                raise JobQueueFull(f"{queued} jobs waiting")
+
+            conn.execute(
+                "INSERT INTO jobs (job_id, plan_id, status, created_at, owner) VALUES (?, ?, 'queued', ?, ?)",
+                (job_id, plan_id, time.time(), os.getpid()),
+            )
+            conn.executemany(
+                "INSERT INTO job_songs (job_id, i, slot, field, title, artist, status) VALUES (?, ?, ?, ?, ?, ?, 'pending')",
+                [
+                    (job_id, i, json.dumps(s["slot"]), s["field"], s["title"], s.get("artist", ""))
+                    for i, s in enumerate(songs)
+                ],
+            )
+            self._count(conn, "submitted")
+
+        self._executor.submit(self._run, job_id)
+        return job_id
+
+    def get(self, job_id: str) -> dict | None:
+        with self._conn() as conn:
+            row = conn.execute(
+                "SELECT job_id, plan_id, status, created_at, started_at, finished_at, error FROM jobs WHERE job_id = ?",
+                (job_id,),
+            ).fetchone()
+            if row is None:
+                return None
+            songs = conn.execute(
+                "SELECT slot, field, title, artist, status, lyrics FROM job_songs WHERE job_id = ? ORDER BY i",
+                (job_id,),
+            ).fetchall()
+
+        job = dict(zip(("job_id", "plan_id", "status", "created_at", "started_at", "finished_at", "error"), row))
+        job["songs"] = [
+            {"slot": json.loads(slot), "field": field, "title": title, "artist": artist, "status": status, "lyrics": lyrics}
+            for slot, field, title, artist, status, lyrics in songs
+        ]
+        done = sum(1 for s in job["songs"] if s["status"] == "done")
+        job["progress"] = {"done": done, "total": len(job["songs"])}
+        return job
+
+    def metrics(self) -> dict:
+        with self._conn() as conn:
+            statuses = dict(conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+            counters = dict(conn.execute("SELECT name, value FROM stats").fetchall())
+        return {
+            "queued": statuses.get("queued", 0),
+            "running": statuses.get("running", 0),
+            "max_queue": self.max_queue,
+            **counters,
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # ---------- 내부 ----------
+
+    def _prune(self, conn) -> None:
+        now = time.time()
+        overdue = conn.execute(
+            "SELECT job_id, owner FROM jobs WHERE status IN ('queued', 'running') AND created_at < ?",
+            (now - self.stale_sec,),
+        ).fetchall()
+        lost = [(now, job_id) for job_id, owner in overdue if not _owner_alive(owner)]
+        if lost:
+            conn.executemany(
+                "UPDATE jobs SET status = 'failed', error = 'worker lost', finished_at = ? WHERE job_id = ?", lost
+            )
+        old = [r[0] for r in conn.execute("SELECT job_id FROM jobs WHERE finished_at < ?", (now - self.keep_sec,))]
+        if old:
+            conn.executemany("DELETE FROM job_songs WHERE job_id = ?", [(j,) for j in old])
+            conn.executemany("DELETE FROM jobs WHERE job_id = ?", [(j,) for j in old])
+
+    def _fill_plan(self, plan_id: str, song: dict, lyrics: str) -> None:
+        """
+        plan을 다시 읽어서 해당 자리의 가사가 아직 비어있을 때만 채움
+        (그 사이 사용자가 Step3에서 직접 입력했으면 덮어쓰지 않음)
+        Step3 저장과 같은 plan lock 안에서 해서, 그 사이에 들어온 저장을 덮어쓰지 않음
+        """
+        with self.store.locked(plan_id):
+            plan = self.store.get(plan_id)
+            if not plan:
+                return
+            target = _slot_song(plan, song["slot"])
+            if not target or target.get("title") != song["title"] or target.get("lyrics"):
+                return
+            target["lyrics"] = lyrics
+            self.store.save(plan_id, plan)
+
+    def _run(self, job_id: str) -> None:
+        with self._conn() as conn:
+            plan_id = conn.execute("SELECT plan_id FROM jobs WHERE job_id = ?", (job_id,)).fetchone()[0]
+            songs = [
+                {"slot": json.loads(slot), "title": title, "artist": artist}
+                for slot, title, artist in conn.execute(
+                    "SELECT slot, title, artist FROM job_songs WHERE job_id = ? ORDER BY i", (job_id,)
+                )
+            ]
+            conn.execute("UPDATE jobs SET status = 'running', started_at = ? WHERE job_id = ?", (time.time(), job_id))
+            conn.execute("UPDATE job_songs SET status = 'running' WHERE job_id = ?", (job_id,))
+
+        def _on_result(i: int, _song: dict, lyrics: str) -> None:
+            lyrics = (lyrics or "").replace("\r\n", "\n")
+            self._fill_plan(plan_id, songs[i], lyrics)
+            with self._conn() as conn:
+                conn.execute(
+                    "UPDATE job_songs SET status = 'done', lyrics = ? WHERE job_id = ? AND i = ?", (lyrics, job_id, i)
+                )
+
+        try:
+            batch = [{"title": s["title"], "artist": s["artist"]} for s in songs]
+            fetch_lyrics_batch_melon(batch, headless=True, on_result=_on_result)
+            status, error = "done", None
+        except Exception as e:
+            status, error = "failed", str(e)
+
+        with self._conn() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE job_id = ?",
+                (status, error, time.time(), job_id),
+            )
+            self._count(conn, status)
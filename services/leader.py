@@ -0,0 +1,47 @@
+# services/leader.py
+from __future__ import annotations
+
+import fcntl
+import os
+from pathlib import Path
+
+
+class LeaderLock:
+    """
+    여러 uvicorn worker 중 하나만 백그라운드 작업을 돌리도록 하는 파일 lock.
+    flock 은 프로세스가 죽으면 OS가 풀어주므로, 다른 worker 가 다음 시도 때 이어받음.
+    """
+
+    def __init__(self, path: str = "out/.leader.lock"):
+        self.path = Path(path)
+        self._fd: int | None = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._fd is not None
+
+    def try_acquire(self) -> bool:
+        if self._fd is not None:
+            return True
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        try:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        finally:
+            os.close(self._fd)
+            self._fd = None
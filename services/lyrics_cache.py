@@ -0,0 +1,143 @@
+# services/lyrics_cache.py
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+import unicodedata
+from contextlib import contextmanager
+from pathlib import Path
+
+from services.cleanup import env_int
+
+
+def normalize_key(title: str, artist: str = "") -> str:
+    """
+    캐시 키: 제목+가수를 NFKC/소문자/공백 정리해서 붙인 문자열.
+    "주 은혜임을  " 과 "주 은혜임을" 이 같은 곡으로 잡히게.
+    """
+    def _norm(s: str) -> str:
+        s = unicodedata.normalize("NFKC", s or "").casefold()
+        return " ".join(s.split())
+
+    return f"{_norm(title)}\x1f{_norm(artist)}"
+
+
+class LyricsCache:
+    """
+    멜론 가사 디스크 캐시 (SQLite).
+    - ttl_sec 지난 항목은 miss 처리 후 삭제
+    - max_entries 넘으면 가장 오래 안 쓴 항목부터 삭제
+    - hit/miss 횟수는 stats 테이블에 누적 (worker 여러 개여도 같이 집계됨)
+    """
+
+    def __init__(self, db_path: str = "out/lyrics_cache.sqlite3", *, ttl_sec: int, max_entries: int):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_sec = ttl_sec
+        self.max_entries = max_entries
+        self._init_db()
+
+    @contextmanager
+    def _conn(self):
+        conn = sqlite3.connect(str(self.db_path), timeout=5)
+        try:
+            with conn:  # 정상 종료 시 commit, 예외 시 rollback
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self) -> None:
+        with self._conn() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")  # WAL은 DB 파일에 유지되므로 한 번만
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS lyrics (
+                    key TEXT PRIMARY KEY,
+                    lyrics TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS lyrics_last_used ON lyrics(last_used)")
+            conn.execute("CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            conn.execute("INSERT OR IGNORE INTO stats VALUES ('hits', 0), ('misses', 0)")
+
+    def get(self, title: str, artist: str = "") -> str | None:
+        key = normalize_key(title, artist)
+        now = time.time()
+        with self._conn() as conn:
+            row = conn.execute("SELECT lyrics, created_at FROM lyrics WHERE key = ?", (key,)).fetchone()
+            if row and now - row[1] >= self.ttl_sec:
+                conn.execute("DELETE FROM lyrics WHERE key = ?", (key,))
+                row = None
+
+            if row is None:
+                conn.execute("UPDATE stats SET value = value + 1 WHERE name = 'misses'")
+                return None
+
+            conn.execute("UPDATE lyrics SET last_used = ? WHERE key = ?", (now, key))
+            conn.execute("UPDATE stats SET value = value + 1 WHERE name = 'hits'")
+            return row[0]
+
+    def put(self, title: str, artist: str, lyrics: str) -> None:
+        """
+        실패 문구는 호출하는 쪽(melon.py)에서 걸러서 넘겨야 함. 빈 가사는 여기서도 무시.
+        """
+        if not (lyrics or "").strip():
+            return
+
+        key = normalize_key(title, artist)
+        now = time.time()
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO lyrics (key, lyrics, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, lyrics, now, now),
+            )
+            # 개수 초과분은 last_used 오래된 순으로 정리
+            conn.execute(
+                """
+                DELETE FROM lyrics WHERE key IN (
+                    SELECT key FROM lyrics ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+
+    def stats(self) -> dict:
+        with self._conn() as conn:
+            counters = dict(conn.execute("SELECT name, value FROM stats").fetchall())
+            entries = conn.execute("SELECT COUNT(*) FROM lyrics").fetchone()[0]
+
+        hits = counters.get("hits", 0)
+        misses = counters.get("misses", 0)
+        total = hits + misses
+        return {
+            "entries": entries,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": (hits / total) if total else 0.0,
+        }
+
+
+_cache: LyricsCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_lyrics_cache() -> LyricsCache | None:
+    """
+    프로세스 전역 캐시 인스턴스. LYRICS_CACHE_ENABLED=0 이면 None (캐시 끔).
+    """
+    global _cache
+    if not env_int("LYRICS_CACHE_ENABLED", 1):
+        return None
+
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LyricsCache(
+                    ttl_sec=env_int("LYRICS_CACHE_TTL_SEC", 30 * 24 * 3600),   # 30일
+                    max_entries=env_int("LYRICS_CACHE_MAX_ENTRIES", 2000),
+                )
+    return _cache
@@ -1,14 +1,114 @@
+import logging
+import queue
+import re
 import time
-from typing import List, Dict, Tuple
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait as wait_futures
+from contextlib import contextmanager
+from html import unescape
+from typing import Callable, List, Dict, Tuple
+from urllib.parse import urljoin
 import os
 
+import requests
+
 from selenium import webdriver
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.chrome.service import Service as ChromeService
 from webdriver_manager.chrome import ChromeDriverManager
 
+from services.cleanup import env_float, env_int
+from services.driver_pool import DriverPool, DriverPoolTimeout, resource_budget
+from services.lyrics_cache import get_lyrics_cache, normalize_key
+from services.metrics import counter, histogram
+from services.singleflight import SingleFlight
+
+log = logging.getLogger(__name__)
+
+# MELON_BASE_URL 로 로컬 stand-in 서버 등을 가리킬 수 있음
+MELON_HOME = os.getenv("MELON_BASE_URL", "https://www.melon.com/")
+
+# readiness 대기 시 polling 간격
+_POLL_SEC = 0.05
+
+# 크롤링 실패 시 가사 자리에 들어가는 문구들 (캐시에 저장하면 안 됨)
+LYRICS_NOT_FOUND = "(가사를 찾지 못했습니다)"
+LYRICS_EMPTY = "(가사 비어있음)"
+LYRICS_PARSE_FAILED = "(가사 파싱 실패)"
+CRAWL_FAILED_PREFIX = "(크롤링 실패:"
+
+# 단계별 지표 (/metrics)
+_CACHE_LOOKUPS = counter("melon_lyrics_cache_total", "가사 캐시 조회 수", ("result",))
+_CRAWL_SECONDS = histogram("melon_crawl_seconds", "곡 하나 가사를 가져오는 데 걸린 시간", ("path",))
+_CRAWL_RESULTS = counter("melon_crawl_total", "곡 단위 가사 가져오기 결과", ("path", "result"))
+_DRIVER_START_SECONDS = histogram("melon_driver_start_seconds", "브라우저(드라이버) 기동 시간")
+_STEP_SECONDS = histogram("melon_step_seconds", "Selenium 단계별 대기 시간", ("step", "result"))
+_FLIGHTS_TOTAL = counter("melon_flight_total", "캐시 miss 곡 가져오기 (leader: 직접, shared: 진행 중인 것 공유)", ("role",))
+_PREFETCH_TOTAL = counter("melon_prefetch_total", "Step2 가사 미리 가져오기 요청", ("result",))
+
+# 같은 곡(정규화한 제목+가수)을 동시에 가져오려는 요청(/api/lyrics/fetch, prefetch, 크롤링 job)을 하나로 합침
+_FLIGHTS = SingleFlight()
+
+
+def is_failed_lyrics(lyrics: str) -> bool:
+    lyrics = (lyrics or "").strip()
+    if not lyrics:
+        return True
+    return lyrics in (LYRICS_NOT_FOUND, LYRICS_EMPTY, LYRICS_PARSE_FAILED) or lyrics.startswith(CRAWL_FAILED_PREFIX)
+
+
+def _result_label(lyrics: str | None) -> str:
+    if lyrics is None:
+        return "fallback"
+    if lyrics == LYRICS_NOT_FOUND:
+        return "not_found"
+    return "failed" if is_failed_lyrics(lyrics) else "ok"
 
 
+def _record_crawl(path: str, started: float, lyrics: str | None) -> None:
+    _CRAWL_SECONDS.observe(time.perf_counter() - started, path=path)
+    _CRAWL_RESULTS.inc(path=path, result=_result_label(lyrics))
+
+
+def _cache_put(title: str, artist: str, lyrics: str) -> None:
+    cache = get_lyrics_cache()
+    if cache is None or is_failed_lyrics(lyrics):
+        return
+    try:
+        cache.put(title, artist, lyrics)
+    except Exception:
+        # 캐시 저장 실패가 크롤링 결과를 막으면 안 됨
+        pass
+
+
+def _cache_get(title: str, artist: str) -> str | None:
+    cache = get_lyrics_cache()
+    if cache is None:
+        return None
+    try:
+        lyrics = cache.get(title, artist)
+    except Exception:
+        return None
+    _CACHE_LOOKUPS.inc(result="miss" if lyrics is None else "hit")
+    return lyrics
+
+
+def _begin_flight(key: str) -> tuple[Future, bool]:
+    fut, leader = _FLIGHTS.begin(key)
+    _FLIGHTS_TOTAL.inc(role="leader" if leader else "shared")
+    return fut, leader
+
+
+def _flight_result(fut: Future, timeout: float | None = None) -> str:
+    """다른 요청이 가져오는 중인 곡의 결과. 그쪽이 실패/시간 초과면 실패 문구"""
+    try:
+        return fut.result(timeout)
+    except Exception as e:
+        return f"{CRAWL_FAILED_PREFIX} {str(e) or type(e).__name__})"
+
 
 def _new_driver(headless: bool = True) -> webdriver.Chrome:
     options = webdriver.ChromeOptions()
@@ -23,27 +123,126 @@ def _new_driver(headless: bool = True) -> webdriver.Chrome:
     chromedriver_bin = os.getenv("CHROMEDRIVER_BIN", "/usr/bin/chromedriver")
     options.binary_location = chrome_bin
 
-    return webdriver.Chrome(
-        service=ChromeService(executable_path=chromedriver_bin),
-        options=options,
-    )
+    with _DRIVER_START_SECONDS.time():
+        return webdriver.Chrome(
+            service=ChromeService(executable_path=chromedriver_bin),
+            options=options,
+        )
 
 
-def _search_song_open_lyrics(driver, query: str) -> bool:
-    # 멜론 홈에서 검색
-    search = driver.find_element(By.ID, "top_search")
+_pool: DriverPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_driver_pool() -> DriverPool:
+    """
+    프로세스 전역 드라이버 풀. 크기/재활용 기준은 환경변수로 조절.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = DriverPool(
+                    _new_driver,
+                    max_size=env_int("MELON_POOL_SIZE", resource_budget(env_int("MELON_BROWSER_MB", 400))),
+                    max_uses=env_int("MELON_DRIVER_MAX_USES", 50),
+                    max_rss_mb=env_int("MELON_DRIVER_MAX_RSS_MB", 800),
+                    acquire_timeout=env_int("MELON_POOL_TIMEOUT_SEC", 120),
+                )
+    return _pool
+
+
+def warm_driver_pool() -> int:
+    """
+    서버 시작 시 MELON_POOL_WARM 개의 브라우저를 미리 띄워 둠 (0이면 안 띄움).
+    """
+    count = env_int("MELON_POOL_WARM", 1)
+    if count <= 0:
+        return 0
+    return get_driver_pool().warm(count)
+
+
+@contextmanager
+def _borrow_driver(headless: bool = True, timeout: float | None = None):
+    if not headless:
+        # 화면 띄우는 디버깅용은 풀을 거치지 않음
+        driver = _new_driver(headless=False)
+        try:
+            yield driver
+        finally:
+            driver.quit()
+        return
+
+    with get_driver_pool().borrow(timeout) as driver:
+        yield driver
+
+
+class _StepWaiter:
+    """
+    곡 하나를 처리하는 동안의 대기 예산.
+    - 단계마다 최대 step_sec 초, 곡 전체로는 max_sec 초까지만 기다림
+    - 조건이 만족되는 즉시 다음 단계로 넘어가고, 단계별 소요 시간을 로그로 남김
+    """
+
+    def __init__(self, driver, step_sec: float | None = None, max_sec: float | None = None):
+        self.driver = driver
+        self.step_sec = env_float("MELON_WAIT_STEP_SEC", 5.0) if step_sec is None else step_sec
+        max_sec = env_float("MELON_WAIT_MAX_SEC", 15.0) if max_sec is None else max_sec
+        self.deadline = time.monotonic() + max_sec
+
+    def until(self, step: str, condition):
+        timeout = max(0.0, min(self.step_sec, self.deadline - time.monotonic()))
+        t0 = time.perf_counter()
+        result = "ok"
+        try:
+            return WebDriverWait(self.driver, timeout, poll_frequency=_POLL_SEC).until(condition)
+        except TimeoutException:
+            result = "timeout"
+            raise
+        finally:
+            elapsed = time.perf_counter() - t0
+            _STEP_SECONDS.observe(elapsed, step=step, result=result)
+            log.info("melon step=%s result=%s %.0fms", step, result, elapsed * 1000)
+
+
+def _open_home(driver, waiter: _StepWaiter):
+    driver.get(MELON_HOME)
+    waiter.until("home", EC.element_to_be_clickable((By.ID, "top_search")))
+
+
+def _search_song_open_lyrics(driver, query: str, waiter: _StepWaiter | None = None) -> bool:
+    waiter = waiter or _StepWaiter(driver)
+
+    # 멜론 상단 검색창은 상세 페이지에도 있으니 그대로 씀. 없으면(에러 페이지 등) 홈으로.
+    try:
+        search = driver.find_element(By.ID, "top_search")
+    except NoSuchElementException:
+        _open_home(driver, waiter)
+        search = driver.find_element(By.ID, "top_search")
+
     search.clear()
     search.send_keys(query)
+    page = driver.find_element(By.TAG_NAME, "html")
     driver.find_element(By.CSS_SELECTOR, "button.btn_icon.search_m").click()
-    time.sleep(1)
 
     try:
-        # 첫 결과 상세
-        driver.find_element(By.CSS_SELECTOR, ".btn.btn_icon_detail").click()
-        time.sleep(1)
+        # 검색 결과 페이지로 넘어가고 첫 결과 상세 버튼이 뜰 때까지
+        waiter.until("search_nav", EC.staleness_of(page))
+        detail = waiter.until("search_results", EC.element_to_be_clickable((By.CSS_SELECTOR, ".btn.btn_icon_detail")))
+
+        page = driver.find_element(By.TAG_NAME, "html")
+        detail.click()
+        waiter.until("detail_nav", EC.staleness_of(page))
+
         # 가사 더보기
-        driver.find_element(By.CSS_SELECTOR, ".button_more.arrow_d").click()
-        time.sleep(1)
+        more = waiter.until("detail_button", EC.element_to_be_clickable((By.CSS_SELECTOR, ".button_more.arrow_d")))
+        more.click()
+
+        # 가사 영역이 보이고 내용이 채워질 때까지
+        waiter.until(
+            "lyrics",
+            lambda d: d.find_element(By.CSS_SELECTOR, "#d_video_summary").text.strip() or False,
+        )
         return True
     except Exception:
         return False
@@ -53,82 +252,474 @@ def _extract_lyrics(driver) -> str:
     try:
         lyrics_element = driver.find_element(By.CSS_SELECTOR, "#d_video_summary")
         lyrics = lyrics_element.text.strip()
-        return lyrics if lyrics else "(가사 비어있음)"
+        return lyrics if lyrics else LYRICS_EMPTY
     except Exception:
-        return "(가사 파싱 실패)"
+        return LYRICS_PARSE_FAILED
+
+
+# ---------- HTTP 경로 (브라우저 없이) ----------
+
+_HTTP_HEADERS = {
+    # 멜론은 UA 없는 요청을 막음
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    ),
+    "Accept-Language": "ko-KR,ko;q=0.9",
+}
+_SONG_ID_RE = re.compile(r"goSongDetail\(\s*'(\d+)'\s*\)")
+_LYRICS_DIV_RE = re.compile(r'<div[^>]*\bid="d_video_summary"[^>]*>(.*?)</div>', re.S)
+_NO_RESULT_MARKER = "검색결과가 없습니다"
+
+_http_session: requests.Session | None = None
+_http_lock = threading.Lock()
+
+
+def _session() -> requests.Session:
+    """keep-alive 커넥션을 재사용하는 프로세스 전역 세션"""
+    global _http_session
+    if _http_session is None:
+        with _http_lock:
+            if _http_session is None:
+                sess = requests.Session()
+                size = env_int("MELON_HTTP_POOL", 8)
+                adapter = requests.adapters.HTTPAdapter(pool_connections=size, pool_maxsize=size, max_retries=1)
+                sess.mount("http://", adapter)
+                sess.mount("https://", adapter)
+                sess.headers.update(_HTTP_HEADERS)
+                _http_session = sess
+    return _http_session
+
+
+def _parse_first_song_id(html: str) -> str | None:
+    m = _SONG_ID_RE.search(html)
+    return m.group(1) if m else None
+
+
+def _parse_lyrics_html(html: str) -> str | None:
+    """상세 페이지의 #d_video_summary 안 가사(<br> 줄바꿈)를 텍스트로"""
+    m = _LYRICS_DIV_RE.search(html)
+    if not m:
+        return None
+    body = re.sub(r"<!--.*?-->", "", m.group(1), flags=re.S)
+    body = re.sub(r"<br\s*/?>", "\n", body, flags=re.I)
+    body = unescape(re.sub(r"<[^>]+>", "", body))
+    lines = [line.strip() for line in body.replace("\r\n", "\n").split("\n")]
+    return "\n".join(lines).strip() or None
+
+
+def _http_search_song_id(query: str, timeout: float) -> str | None:
+    """
+    검색 결과 첫 곡의 songId. 결과가 없다고 확실히 나오면 "" 반환,
+    페이지를 못 읽었으면 None (→ 브라우저 fallback 대상).
+    """
+    resp = _session().get(urljoin(MELON_HOME, "search/song/index.htm"), params={"q": query}, timeout=timeout)
+    resp.raise_for_status()
+    song_id = _parse_first_song_id(resp.text)
+    if song_id:
+        return song_id
+    return "" if _NO_RESULT_MARKER in resp.text else None
+
+
+def _fetch_lyrics_http(song_title: str, artist_name: str = "") -> str | None:
+    """
+    HTTP 요청 + HTML 파싱으로 가사 가져오기. 파싱이 안 되면 None → Selenium fallback.
+    """
+    if not env_int("MELON_HTTP_ENABLED", 1):
+        return None
+
+    timeout = env_float("MELON_HTTP_TIMEOUT_SEC", 5.0)
+    t0 = time.perf_counter()
+    lyrics = None
+    try:
+        song_id = None
+        for query in (f"{song_title} {artist_name}".strip(), song_title.strip()):
+            song_id = _http_search_song_id(query, timeout)
+            if song_id:
+                break
+        if song_id == "":
+            lyrics = LYRICS_NOT_FOUND
+            return lyrics
+        if song_id is None:
+            return None
+
+        resp = _session().get(urljoin(MELON_HOME, "song/detail.htm"), params={"songId": song_id}, timeout=timeout)
+        resp.raise_for_status()
+        lyrics = _parse_lyrics_html(resp.text)
+        return lyrics
+    except Exception as e:
+        log.info("melon http failed for %r: %s", song_title, e)
+        return None
+    finally:
+        _record_crawl("http", t0, lyrics)
+        log.info("melon http song=%r %.0fms", song_title, (time.perf_counter() - t0) * 1000)
 
 
 def fetch_lyrics_melon(song_title: str, artist_name: str = "", headless: bool = True) -> str:
     """
-    단일 곡 가사 크롤링(호환용)
+    단일 곡 가사 크롤링(호환용).
+    캐시 → HTTP 파싱 → (파싱 실패 시에만) 브라우저 순서로 시도.
+    같은 곡을 동시에 요청하면 한 번만 가져와서 나눠 가짐.
     """
-    driver = _new_driver(headless=headless)
-    driver.get("https://www.melon.com/")
-    time.sleep(1)
+    cached = _cache_get(song_title, artist_name)
+    if cached is not None:
+        return cached
+
+    # 같은 곡을 prefetch/다른 요청이 이미 가져오는 중이면 그 결과를 같이 씀
+    key = normalize_key(song_title, artist_name)
+    fut, leader = _begin_flight(key)
+    if not leader:
+        return _flight_result(fut, env_float("MELON_FLIGHT_WAIT_SEC", 180.0))
 
+    return _fetch_as_leader(key, fut, song_title, artist_name, headless)
+
+
+def _fetch_as_leader(key: str, fut: Future, song_title: str, artist_name: str, headless: bool = True) -> str:
     try:
-        q1 = f"{song_title} {artist_name}".strip()
-        ok = _search_song_open_lyrics(driver, q1)
+        lyrics = _fetch_lyrics_http(song_title, artist_name)
+        if lyrics is None:
+            lyrics = _crawl_lyrics(song_title, artist_name, headless=headless)
+        # 캐시에 먼저 넣고 flight 를 닫아야 그 사이에 온 요청이 다시 크롤링하지 않음
+        _cache_put(song_title, artist_name, lyrics)
+    except BaseException as e:
+        _FLIGHTS.finish(key, fut, error=e)
+        raise
+    _FLIGHTS.finish(key, fut, lyrics)
+    return lyrics
 
-        if not ok:
-            ok = _search_song_open_lyrics(driver, song_title.strip())
 
-        if not ok:
-            return "(가사를 찾지 못했습니다)"
+# ---------- Step2 미리 가져오기 ----------
 
-        return _extract_lyrics(driver)
-    except Exception as e:
-        return f"(크롤링 실패: {e})"
+_prefetch_executor: ThreadPoolExecutor | None = None
+_prefetch_lock = threading.Lock()
+_prefetch_pending = 0
+
+
+def _prefetch_pool() -> ThreadPoolExecutor:
+    global _prefetch_executor
+    if _prefetch_executor is None:
+        with _prefetch_lock:
+            if _prefetch_executor is None:
+                _prefetch_executor = ThreadPoolExecutor(
+                    max_workers=env_int("MELON_PREFETCH_WORKERS", 4), thread_name_prefix="melon-prefetch"
+                )
+    return _prefetch_executor
+
+
+def _run_prefetch(key: str, fut: Future, title: str, artist: str) -> None:
+    global _prefetch_pending
+    try:
+        _fetch_as_leader(key, fut, title, artist)
+    except Exception:
+        log.exception("lyrics prefetch failed for %r", title)
     finally:
-        driver.quit()
+        with _prefetch_lock:
+            _prefetch_pending -= 1
+
+
+def prefetch_lyrics(song_title: str, artist_name: str = "") -> str:
+    """
+    Step2 에서 제목/가수 칸을 벗어날 때 가사를 미리 가져오기 시작 (기다리지 않음).
+    결과는 가사 캐시에 남고, 끝나기 전에 제출된 job 은 진행 중인 가져오기를 같이 기다림.
+    return: cached / in_flight / started / busy / disabled
+    """
+    global _prefetch_pending
+    title, artist = song_title.strip(), artist_name.strip()
+    if not title or not env_int("MELON_PREFETCH_ENABLED", 1) or get_lyrics_cache() is None:
+        # 캐시가 없으면 미리 가져와도 job 이 결과를 못 씀
+        status = "disabled"
+    elif _cache_get(title, artist) is not None:
+        status = "cached"
+    else:
+        with _prefetch_lock:
+            busy = _prefetch_pending >= env_int("MELON_PREFETCH_MAX_PENDING", 16)
+            if not busy:
+                _prefetch_pending += 1
+        if busy:
+            status = "busy"
+        else:
+            # flight 는 여기서 잡아 둠 → 바로 뒤이은 같은 곡 요청도 이 가져오기를 기다림
+            key = normalize_key(title, artist)
+            fut, leader = _FLIGHTS.begin(key)
+            if leader:
+                _FLIGHTS_TOTAL.inc(role="leader")
+                status = "started"
+                try:
+                    _prefetch_pool().submit(_run_prefetch, key, fut, title, artist)
+                except RuntimeError as e:
+                    # 종료 중이라 풀이 닫힘 → flight 를 닫아 둬야 같은 곡을 기다리는 쪽이 시간 초과까지 붙잡혀 있지 않음
+                    _FLIGHTS.finish(key, fut, error=e)
+                    status = "disabled"
+                    with _prefetch_lock:
+                        _prefetch_pending -= 1
+            else:
+                status = "in_flight"
+                with _prefetch_lock:
+                    _prefetch_pending -= 1
+
+    _PREFETCH_TOTAL.inc(result=status)
+    return status
+
+
+def prefetch_stats() -> dict:
+    with _prefetch_lock:
+        pending = _prefetch_pending
+    return {"pending": pending, "in_flight": len(_FLIGHTS)}
+
+
+def shutdown_prefetch() -> None:
+    if _prefetch_executor is not None:
+        _prefetch_executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _crawl_lyrics(song_title: str, artist_name: str = "", headless: bool = True) -> str:
+    t0 = time.perf_counter()
+    lyrics = _crawl_lyrics_once(song_title, artist_name, headless)
+    _record_crawl("selenium", t0, lyrics)
+    return lyrics
+
+
+def _crawl_lyrics_once(song_title: str, artist_name: str, headless: bool) -> str:
+    try:
+        with _borrow_driver(headless=headless) as driver:
+            waiter = _StepWaiter(driver)
+            _open_home(driver, waiter)
 
+            q1 = f"{song_title} {artist_name}".strip()
+            ok = _search_song_open_lyrics(driver, q1, waiter)
 
-def fetch_lyrics_batch_melon(songs: List[Dict], headless: bool = True) -> List[Tuple[Dict, str]]:
+            if not ok:
+                ok = _search_song_open_lyrics(driver, song_title.strip(), waiter)
+
+            if not ok:
+                return LYRICS_NOT_FOUND
+
+            return _extract_lyrics(driver)
+    except Exception as e:
+        return f"{CRAWL_FAILED_PREFIX} {e})"
+
+
+def fetch_lyrics_batch_melon(
+    songs: List[Dict],
+    headless: bool = True,
+    workers: int | None = None,
+    on_result: Callable[[int, Dict, str], None] | None = None,
+) -> List[Tuple[Dict, str]]:
     """
     ✅ Step2 제출 시 여러 곡을 한 번에 처리하려고 만든 배치 버전.
     - songs: [{"title": "...", "artist": "..."}, ...]
-    - return: [(song_dict, lyrics_str), ...]
+    - return: [(song_dict, lyrics_str), ...]  (입력 순서 그대로)
+    - 캐시에 있는 곡은 바로 채우고, miss 난 곡은 HTTP로 먼저 시도,
+      HTTP 파싱이 안 된 곡만 브라우저 크롤러로 보냄
+    - 다른 요청(prefetch 등)이 이미 가져오는 중인 곡은 새로 가져오지 않고 그 결과를 기다림
+    - workers: 동시에 돌릴 브라우저 수 (None이면 MELON_BATCH_WORKERS / CPU·메모리 기준)
+    - on_result(index, song_dict, lyrics): 곡 하나가 끝날 때마다 호출 (진행 상황 표시용)
     """
-    driver = _new_driver(headless=headless)
-    driver.get("https://www.melon.com/")
-    time.sleep(1)
+    def _notify(i: int, lyrics: str) -> None:
+        if on_result is None:
+            return
+        try:
+            on_result(i, songs[i], lyrics)
+        except Exception:
+            log.exception("on_result callback failed")
 
-    out: List[Tuple[Dict, str]] = []
-    try:
-        for s in songs:
-            title = (s.get("title") or "").strip()
-            artist = (s.get("artist") or "").strip()
+    def _song(i: int) -> Tuple[str, str]:
+        s = songs[i]
+        return (s.get("title") or "").strip(), (s.get("artist") or "").strip()
 
-            if not title:
-                out.append((s, ""))  # 빈 입력
+    found: Dict[int, str] = {}
+    found_lock = threading.Lock()
+    miss_idx: List[int] = []
+    flights: Dict[int, Tuple[str, Future]] = {}  # 이 배치가 직접 가져오는 곡
+    shared: List[Tuple[int, Future]] = []  # 다른 요청(prefetch 등)이 가져오는 중인 곡
+    for i in range(len(songs)):
+        title, artist = _song(i)
+        if not title:
+            found[i] = ""  # 빈 입력
+        else:
+            cached = _cache_get(title, artist)
+            if cached is None:
+                key = normalize_key(title, artist)
+                fut, leader = _begin_flight(key)
+                if leader:
+                    flights[i] = (key, fut)
+                    miss_idx.append(i)
+                else:
+                    shared.append((i, fut))
                 continue
+            found[i] = cached
+        _notify(i, found[i])
+
+    def _settle(i: int, lyrics: str) -> None:
+        """직접 가져온 곡: 캐시 → flight 종료(기다리던 쪽 깨움) → 진행 상황 알림"""
+        _cache_put(*_song(i), lyrics)
+        found[i] = lyrics
+        _FLIGHTS.finish(*flights[i], lyrics)
+        _notify(i, lyrics)
+
+    def _on_shared(i: int, fut: Future) -> None:
+        lyrics = _flight_result(fut, 0)
+        with found_lock:
+            if i in found:
+                return
+            found[i] = lyrics
+        _notify(i, lyrics)
+
+    # 공유하는 곡은 그쪽이 끝나는 즉시 알림 (이 배치 크롤링이 끝날 때까지 미루지 않음)
+    for i, fut in shared:
+        fut.add_done_callback(lambda f, i=i: _on_shared(i, f))
+
+    def _try_http(i: int) -> None:
+        lyrics = _fetch_lyrics_http(*_song(i))
+        if lyrics is not None:
+            _settle(i, lyrics)
+
+    try:
+        if miss_idx:
+            with ThreadPoolExecutor(max_workers=min(len(miss_idx), env_int("MELON_HTTP_POOL", 8))) as ex:
+                list(ex.map(_try_http, miss_idx))
+            miss_idx = [i for i in miss_idx if i not in found]
+
+        if miss_idx:
+            crawled = _crawl_lyrics_parallel(
+                [songs[i] for i in miss_idx],
+                headless=headless,
+                workers=workers,
+                on_done=lambda j, lyrics: _settle(miss_idx[j], lyrics),
+            )
+            for i, (_, lyrics) in zip(miss_idx, crawled):
+                found[i] = lyrics
+    finally:
+        # 예외로 빠져나가도 이 곡들을 기다리는 요청이 멈춰 있지 않게 (이미 끝난 flight 는 그대로)
+        for key, fut in flights.values():
+            _FLIGHTS.finish(key, fut, error=RuntimeError("lyrics batch aborted"))
+
+    if shared:
+        wait_futures([fut for _, fut in shared], timeout=env_float("MELON_FLIGHT_WAIT_SEC", 180.0))
+        for i, fut in shared:
+            if not fut.done():
+                _on_shared(i, fut)  # 시간 초과 → 실패 문구
+
+    return [(s, found[i]) for i, s in enumerate(songs)]
+
 
-            try:
-                q1 = f"{title} {artist}".strip()
-                ok = _search_song_open_lyrics(driver, q1)
+def default_crawl_workers() -> int:
+    """
+    배치 크롤링 브라우저 수 기본값. MELON_BATCH_WORKERS 가 있으면 그 값,
+    없으면 CPU 수와 (가용 메모리 / 브라우저당 MB) 중 작은 값, 그리고 풀 크기를 넘지 않게.
+    """
+    configured = env_int("MELON_BATCH_WORKERS", 0)
+    if configured > 0:
+        return configured
+    return min(resource_budget(env_int("MELON_BROWSER_MB", 400)), get_driver_pool().max_size)
 
-                if not ok:
-                    ok = _search_song_open_lyrics(driver, title)
 
-                if not ok:
-                    out.append((s, "(가사를 찾지 못했습니다)"))
-                    # 다시 멜론 홈으로 복귀(상태 꼬임 방지)
-                    driver.get("https://www.melon.com/")
-                    time.sleep(1)
-                    continue
+def _crawl_one(driver, s: Dict) -> str:
+    title = (s.get("title") or "").strip()
+    artist = (s.get("artist") or "").strip()
+    if not title:
+        return ""  # 빈 입력
 
-                lyrics = _extract_lyrics(driver)
-                out.append((s, lyrics))
+    # 곡마다 대기 예산을 새로 잡음. 다음 곡은 지금 페이지의 검색창에서 바로 검색
+    t0 = time.perf_counter()
+    waiter = _StepWaiter(driver)
+    lyrics = None
+    try:
+        q1 = f"{title} {artist}".strip()
+        ok = _search_song_open_lyrics(driver, q1, waiter)
 
-                # 다음 곡을 위해 홈으로 복귀
-                driver.get("https://www.melon.com/")
-                time.sleep(1)
+        if not ok:
+            ok = _search_song_open_lyrics(driver, title, waiter)
 
-            except Exception as e:
-                out.append((s, f"(크롤링 실패: {e})"))
-                driver.get("https://www.melon.com/")
-                time.sleep(1)
+        lyrics = _extract_lyrics(driver) if ok else LYRICS_NOT_FOUND
+        return lyrics
+
+    except Exception as e:
+        # 상태가 꼬였을 수 있으니 이때만 홈으로 복귀
+        try:
+            _open_home(driver, _StepWaiter(driver))
+        except Exception:
+            pass
+        lyrics = f"{CRAWL_FAILED_PREFIX} {e})"
+        return lyrics
 
-        return out
     finally:
-        driver.quit()
+        _record_crawl("selenium", t0, lyrics)
+        log.info("melon song=%r total %.0fms", title, (time.perf_counter() - t0) * 1000)
+
+
+def _crawl_worker(
+    songs: List[Dict],
+    todo: "queue.SimpleQueue[int]",
+    results: Dict[int, str],
+    headless: bool,
+    on_done: Callable[[int, str], None] | None = None,
+) -> None:
+    """
+    드라이버 하나를 빌려서, 공유 큐에서 곡 번호를 하나씩 꺼내 처리.
+    (빠른 worker가 곡을 더 가져가므로 고정 분할보다 끝나는 시점이 고름)
+    드라이버는 MELON_WORKER_POLL_SEC 씩 끊어서 기다리고, 그 사이 다른 worker 가 큐를 비웠으면 빌리지 않고 끝냄
+    (남는 worker 가 풀 대기 시간 내내 배치 결과를 붙잡고 있지 않게). 전체로는 풀 대기 시간까지만 기다림.
+    """
+    poll = env_float("MELON_WORKER_POLL_SEC", 1.0)
+    total = get_driver_pool().acquire_timeout if headless else 0
+    deadline = time.monotonic() + total
+    while not todo.empty():
+        wait = max(0.0, min(poll, deadline - time.monotonic()))
+        try:
+            with _borrow_driver(headless=headless, timeout=wait) as driver:
+                _open_home(driver, _StepWaiter(driver))
+                while True:
+                    try:
+                        i = todo.get_nowait()
+                    except queue.Empty:
+                        return
+                    results[i] = _crawl_one(driver, songs[i])
+                    if on_done is not None:
+                        on_done(i, results[i])
+        except DriverPoolTimeout as e:
+            if time.monotonic() >= deadline:
+                raise DriverPoolTimeout(f"no driver available within {total:.0f}s") from e
+
+
+def _crawl_lyrics_parallel(
+    songs: List[Dict],
+    headless: bool = True,
+    workers: int | None = None,
+    on_done: Callable[[int, str], None] | None = None,
+) -> List[Tuple[Dict, str]]:
+    k = max(1, min(workers or default_crawl_workers(), len(songs)))
+
+    todo: "queue.SimpleQueue[int]" = queue.SimpleQueue()
+    for i in range(len(songs)):
+        todo.put(i)
+    results: Dict[int, str] = {}
+
+    error: Exception | None = None
+    if k == 1:
+        try:
+            _crawl_worker(songs, todo, results, headless, on_done)
+        except Exception as e:
+            error = e
+    else:
+        with ThreadPoolExecutor(max_workers=k, thread_name_prefix="melon") as ex:
+            futures = [ex.submit(_crawl_worker, songs, todo, results, headless, on_done) for _ in range(k)]
+            for fut in futures:
+                try:
+                    fut.result()
+                except Exception as e:
+                    # 한 worker가 드라이버를 못 빌려도 나머지 worker가 남은 곡을 가져감
+                    error = e
+
+    # 드라이버를 못 빌렸거나(풀 대기 초과) 브라우저가 죽어서 처리 못 한 곡은 실패 처리
+    for i in range(len(songs)):
+        if i not in results:
+            results[i] = f"{CRAWL_FAILED_PREFIX} {error})"
+            if on_done is not None:
+                on_done(i, results[i])
+    return [(s, results[i]) for i, s in enumerate(songs)]
+
+
+def _crawl_lyrics_batch(songs: List[Dict], headless: bool = True) -> List[Tuple[Dict, str]]:
+    """브라우저 하나로 순서대로 처리 (벤치마크 비교용 순차 경로)"""
+    return _crawl_lyrics_parallel(songs, headless=headless, workers=1)
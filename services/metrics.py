@@ -0,0 +1,232 @@
+# services/metrics.py
+from __future__ import annotations
+
+import bisect
+import os
+import pickle
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# 초 단위 지연 시간용 기본 bucket (1ms ~ 60s)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_str(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v)) if not float(v).is_integer() else str(int(v))
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = tuple(labels.get(n, "") for n in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _drain(self) -> dict:
+        with self._lock:
+            values, self._values = self._values, {}
+        return values
+
+    def _snapshot(self) -> dict:
+        with self._lock:
+            return dict(self._values)
+
+    def _merge(self, values: dict) -> None:
+        with self._lock:
+            for key, v in values.items():
+                self._values[key] = self._values.get(key, 0) + v
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        lines += [f"{self.name}{_label_str(self.labels, k)} {_fmt(v)}" for k, v in items]
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets))
+        # key -> [bucket 별 개수..., 합계, 개수]
+        self._values: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(labels.get(n, "") for n in self.labels)
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(key)
+            if row is None:
+                row = self._values[key] = [0] * (len(self.buckets) + 2)
+            if i < len(self.buckets):
+                row[i] += 1
+            row[-2] += value
+            row[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0, **labels)
+
+    def _drain(self) -> dict:
+        with self._lock:
+            values, self._values = self._values, {}
+        return values
+
+    def _snapshot(self) -> dict:
+        with self._lock:
+            return {k: list(row) for k, row in self._values.items()}
+
+    def _merge(self, values: dict) -> None:
+        with self._lock:
+            for key, row in values.items():
+                cur = self._values.get(key)
+                if cur is None:
+                    self._values[key] = list(row)
+                else:
+                    for i, v in enumerate(row):
+                        cur[i] += v
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, row in items:
+            acc = 0
+            for le, n in zip(self.buckets, row):
+                acc += n
+                le_label = 'le="' + _fmt(le) + '"'
+                lines.append(f"{self.name}_bucket{_label_str(self.labels, key, le_label)} {acc}")
+            inf_label = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_label_str(self.labels, key, inf_label)} {row[-1]}")
+            lines.append(f"{self.name}_sum{_label_str(self.labels, key)} {_fmt(row[-2])}")
+            lines.append(f"{self.name}_count{_label_str(self.labels, key)} {row[-1]}")
+        return lines
+
+
+class Registry:
+    """
+    프로세스 내 지표 모음. 기록은 lock + dict 갱신 정도라 요청 경로에 둬도 부담 없음.
+    빌드 worker 프로세스처럼 다른 프로세스에서 쌓인 값은 drain() → merge() 로 옮겨 옴.
+    uvicorn worker 끼리는 snapshot() 을 파일로 내려놓고 /metrics 에서 합침 (dump_snapshot / render_merged).
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, Counter | Histogram] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            m = self._metrics.get(name)
+            if m is None:
+                m = self._metrics[name] = cls(name, *args, **kwargs)
+            return m
+
+    def counter(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help, labels)
+
+    def histogram(self, name: str, help: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help, labels, buckets)
+
+    def drain(self) -> dict:
+        """지금까지 쌓인 값을 꺼내고 0으로 비움 (pickle 가능한 dict)"""
+        with self._lock:
+            metrics = list(self._metrics.items())
+        return {name: values for name, m in metrics if (values := m._drain())}
+
+    def snapshot(self) -> dict:
+        """drain() 과 같은 모양이지만 값은 그대로 둠"""
+        with self._lock:
+            metrics = list(self._metrics.items())
+        return {name: values for name, m in metrics if (values := m._snapshot())}
+
+    def empty_copy(self) -> "Registry":
+        """같은 지표 정의(이름/설명/label/bucket)에 값만 비운 Registry"""
+        copy = Registry()
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for m in metrics:
+            if isinstance(m, Histogram):
+                copy.histogram(m.name, m.help, m.labels, m.buckets)
+            else:
+                copy.counter(m.name, m.help, m.labels)
+        return copy
+
+    def merge(self, snapshot: dict) -> None:
+        with self._lock:
+            metrics = dict(self._metrics)
+        for name, values in snapshot.items():
+            m = metrics.get(name)
+            if m is not None:
+                m._merge(values)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = sorted(self._metrics.items())
+        lines = []
+        for _, m in metrics:
+            lines += m.render()
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+counter = REGISTRY.counter
+histogram = REGISTRY.histogram
+
+
+def dump_snapshot(spool_dir: Path) -> None:
+    """이 worker 의 누적값을 spool_dir/{pid}.pkl 로 (원자적으로) 내려놓음"""
+    spool_dir = Path(spool_dir)
+    spool_dir.mkdir(parents=True, exist_ok=True)
+    fp = spool_dir / f"{os.getpid()}.pkl"
+    tmp = spool_dir / f".{os.getpid()}.tmp"
+    tmp.write_bytes(pickle.dumps(REGISTRY.snapshot()))
+    os.replace(tmp, fp)
+
+
+def render_merged(spool_dir: Path, max_age_sec: float) -> str:
+    """
+    모든 worker 의 값을 더해서 렌더링. 내 값은 메모리에서 바로, 다른 worker 는 spool 파일에서.
+    max_age_sec 넘게 갱신이 없는 파일(죽은 worker)은 뺌 → 그 worker 몫만큼 counter 가 줄어드는 건 reset 으로 보임.
+    """
+    merged = REGISTRY.empty_copy()
+    merged.merge(REGISTRY.snapshot())
+    now = time.time()
+    for fp in Path(spool_dir).glob("*.pkl"):
+        if fp.stem == str(os.getpid()):
+            continue
+        try:
+            if now - fp.stat().st_mtime > max_age_sec:
+                continue
+            merged.merge(pickle.loads(fp.read_bytes()))
+        except Exception:
+            # 쓰는 도중이거나 방금 지워진 파일
+            continue
+    return merged.render()
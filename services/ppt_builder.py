@@ -1,37 +1,20 @@
 from pptx import Presentation
+from pptx.opc.constants import CONTENT_TYPE as CT, RELATIONSHIP_TYPE as RT
+from pptx.parts.slide import SlidePart
 from pathlib import Path
+import copy
 import datetime
+import io
+import tempfile
+import threading
+import time
 
-from services.bible import parse_range, scroll_bible
-
-# 템플릿 기준 master/layout 인덱스
-M0 = 0
-M1 = 1
-
-# master0 layouts
-L0_GREETINGS     = 0
-L0_PREVIEW       = 1   # (ph 10,11,12)
-L0_CONTACTUS     = 2
-L0_WHITEPRAYER   = 5
-L0_APOSTLES      = 6
-L0_APOSTLES_1    = 7
-L0_APOSTLES_2    = 8
-L0_OFFERINGPRAY  = 9
-L0_WHITEANNOUNCE = 10
-L0_SERMON_TITLE  = 11  # (ph 10,11,12)
-L0_BIBLE_PHRASE  = 12  # (ph 10,11)
-
-# master1 layouts
-L1_WORSHIP_BG    = 0
-L1_WORSHIP_INTRO = 1
-L1_WORSHIP_TITLE = 2   # (ph 10,11)
-L1_WORSHIP_LYR   = 3   # (ph 10)
-L1_BLACKPRAYER   = 4
-L1_OFFERING      = 5
-L1_LordsPrayer   = 6
-L1_LordsPrayer_1 = 7
-L1_LordsPrayer_2 = 8
-L1_PRAYER        = 9   # (ph 10)
+from services.slide_plan import SlideSpec, clean_song_title, compile_plan, song_section_specs  # noqa: F401
+from services.metrics import counter, histogram
+from services.cleanup import env_int
+from services.deck_slim import output_options, save_deck, slim_deck
+from services.section_cache import SectionCache, get_section_cache, section_key
+from services.slide_engine import SlideEmitter
 
 
 def clear_all_slides(p: Presentation):
@@ -42,6 +25,58 @@ def clear_all_slides(p: Presentation):
         sldIdLst.remove(sldId)
 
 
+# 덱 생성 단계별 지표 (/metrics). template → slides → save
+_STAGE_SECONDS = histogram("ppt_stage_seconds", "덱 생성 단계별 시간", ("stage",))
+_SLIDES_PER_DECK = histogram("ppt_slides_per_deck", "덱 하나의 슬라이드 수", buckets=(10, 25, 50, 75, 100, 150, 200, 300, 500, 1000))
+_OUTPUT_BYTES = histogram(
+    "ppt_output_bytes", "생성된 .pptx 크기", buckets=tuple(2 ** n * 1024 * 1024 for n in range(-2, 8))
+)
+_DECKS = counter("ppt_decks_total", "생성한 덱 수")
+
+# 템플릿 파일 경로 -> ((mtime_ns, size), 샘플 슬라이드를 지운 Presentation)
+# 요청마다 zip 해제/XML 파싱/clear_all_slides 를 반복하지 않고, 캐시본을 deepcopy 해서 씀
+_TEMPLATE_CACHE: dict[str, tuple[tuple[int, int], Presentation]] = {}
+_TEMPLATE_LOCK = threading.Lock()
+
+
+def _load_cleared_template(template_path: Path) -> Presentation:
+    p = Presentation(str(template_path))
+    clear_all_slides(p)
+
+    # 한 번 저장했다가 다시 열어서, 지운 샘플 슬라이드(와 그 이미지) 파트를 완전히 떼어냄
+    buf = io.BytesIO()
+    p.save(buf)
+    buf.seek(0)
+    return Presentation(buf)
+
+
+def template_version(template_path: Path) -> str:
+    """템플릿 버전 문자열 (mtime/size 기준, 캐시 무효화와 같은 기준)"""
+    st = Path(template_path).stat()
+    return f"{st.st_mtime_ns}:{st.st_size}"
+
+
+def load_template(template_path: Path) -> Presentation:
+    """
+    샘플 슬라이드가 지워진 템플릿의 사본을 반환.
+    파일의 mtime/size 가 바뀌면 다시 읽는다.
+    """
+    template_path = Path(template_path)
+    st = template_path.stat()
+    version = (st.st_mtime_ns, st.st_size)
+    key = str(template_path.resolve())
+
+    cached = _TEMPLATE_CACHE.get(key)
+    if cached is None or cached[0] != version:
+        with _TEMPLATE_LOCK:
+            cached = _TEMPLATE_CACHE.get(key)
+            if cached is None or cached[0] != version:
+                cached = (version, _load_cleared_template(template_path))
+                _TEMPLATE_CACHE[key] = cached
+
+    return copy.deepcopy(cached[1])
+
+
 def add_slide(p: Presentation, master_idx: int, layout_idx: int):
     layout = p.slide_masters[master_idx].slide_layouts[layout_idx]
     return p.slides.add_slide(layout)
@@ -51,149 +86,130 @@ def set_ph(slide, idx: int, text: str):
     slide.placeholders[idx].text = text
 
 
-def clean_song_title(title: str) -> str:
-    return title.split("_")[0] if "_" in title else title
+class _PptxEmitter:
+    """python-pptx 기본 API 로 슬라이드를 추가 (SlideEmitter 와 같은 인터페이스, PPT_FAST_EMIT=0 일 때)"""
+
+    def __init__(self, p: Presentation):
+        self.p = p
+
+    def add(self, master_idx: int, layout_idx: int):
+        return add_slide(self.p, master_idx, layout_idx)
+
+    def add_blob(self, master_idx: int, layout_idx: int, blob: bytes) -> None:
+        p = self.p
+        layout = p.slide_masters[master_idx].slide_layouts[layout_idx]
+        part = SlidePart.load(p.part._next_slide_partname, CT.PML_SLIDE, p.part.package, blob)
+        part.relate_to(layout.part, RT.SLIDE_LAYOUT)
+        p.slides._sldIdLst.add_sldId(p.part.relate_to(part, RT.SLIDE))
+
+
+def _render_spec(emitter, spec: SlideSpec):
+    slide = emitter.add(spec.master, spec.layout)
+    for idx, text in spec.texts:
+        set_ph(slide, idx, text)
+    return slide
+
+
+def render_slides(
+    p: Presentation,
+    specs: list[SlideSpec],
+    cache: SectionCache | None = None,
+    template_ver: str = "",
+) -> None:
+    """
+    compile_plan 이 만든 슬라이드 목록을 순서대로 python-pptx 슬라이드로 만듦.
+    cache 를 주면 구간(section) 단위로 렌더링 결과 XML 을 재사용하고, 바뀐 구간만 새로 렌더링.
+    캐시해 둔 XML 도 add_slide 와 같은 순서로 partname/관계를 만들어 붙이므로 결과 파일이 똑같음.
+    """
+    emitter = SlideEmitter(p, template_ver) if env_int("PPT_FAST_EMIT", 1) else _PptxEmitter(p)
+
+    if cache is None:
+        for spec in specs:
+            _render_spec(emitter, spec)
+        return
+
+    start = 0
+    while start < len(specs):
+        end = start
+        while end < len(specs) and specs[end].section == specs[start].section:
+            end += 1
+        group = specs[start:end]
+        key = section_key(group, template_ver)
+
+        blobs = cache.get(key)
+        if blobs is not None and len(blobs) == len(group):
+            for spec, blob in zip(group, blobs):
+                emitter.add_blob(spec.master, spec.layout, blob)
+        else:
+            cache.put(key, [_render_spec(emitter, spec).part.blob for spec in group])
+        start = end
 
 
 def add_song_section(p: Presentation, label_en: str, song: dict):
-    title = clean_song_title(song.get("title", ""))
-    lines = (song.get("lyrics", "") or "").replace("\r\n", "\n").split("\n")
-
-    # 제목 슬라이드
-    s_title = add_slide(p, M1, L1_WORSHIP_TITLE)
-    set_ph(s_title, 10, title)
-    set_ph(s_title, 11, label_en)
-
-    # ---- 핵심: 빈 줄 처리 규칙 반영 ----
-    buf = []  # 현재 슬라이드에 넣을 가사 줄(최대 2줄)
-
-    def flush_buf():
-        """buf에 쌓인 1~2줄을 슬라이드로 내보냄"""
-        nonlocal buf
-        if not buf:
-            return
-        s_lyr = add_slide(p, M1, L1_WORSHIP_LYR)
-        set_ph(s_lyr, 10, "\n".join(buf))
-        buf = []
-
-    prev_flushed_linecount = 0  # 직전에 만든 가사 슬라이드가 몇 줄이었는지(1 or 2)
-
-    for raw in lines:
-        line = raw.strip()
-
-        # 1) 빈 줄이면
-        if line == "":
-            # (A) 직전에 "1줄짜리 슬라이드"를 막 만든 상황이면 → 빈 슬라이드 만들지 말고 그냥 무시
-            if not buf and prev_flushed_linecount == 1:
-                continue
-
-            # (B) 현재 buf에 1줄이 쌓인 상태에서 빈 줄이 나오면:
-            #     -> 그 1줄은 그대로 슬라이드로 만들고(1줄짜리),
-            #     -> 그리고 "빈 슬라이드"는 만들지 않음(너 요구사항: 1줄+빈줄이면 넘어감)
-            if len(buf) == 1:
-                flush_buf()
-                prev_flushed_linecount = 1
-                continue
-
-            # (C) buf가 비어있고(=이미 2줄 단위로 flush 되었거나) 그냥 빈 줄만 나온 경우:
-            #     -> 여기서만 "빈 슬라이드" 생성
-            if not buf:
-                add_slide(p, M1, L1_WORSHIP_LYR)  # 빈 화면용
-                prev_flushed_linecount = 0
-            continue
-
-        # 2) 일반 가사 줄이면 buf에 추가
-        buf.append(line)
-
-        # 2줄이 채워지면 슬라이드 생성
-        if len(buf) == 2:
-            flush_buf()
-            prev_flushed_linecount = 2
-
-    # 마지막 남은 1줄 처리
-    if buf:
-        flush_buf()
-        prev_flushed_linecount = 1 if len(buf) == 1 else 2
+    render_slides(p, song_section_specs(label_en, song))
 
 
-def build_ppt(plan: dict, template_path: Path, bible_dir: Path, out_dir: Path) -> Path:
-    p = Presentation(str(template_path))
-    clear_all_slides(p)
+def compose_ppt(plan: dict, template_path: Path, bible_dir: Path) -> Presentation:
+    """plan 으로 슬라이드를 모두 채운 Presentation (저장은 호출하는 쪽에서)"""
+    t0 = time.perf_counter()
+    p = load_template(template_path)
+    t1 = time.perf_counter()
+    _STAGE_SECONDS.observe(t1 - t0, stage="template")
+
+    specs = compile_plan(plan, bible_dir)
+    render_slides(p, specs, get_section_cache(), template_version(template_path))
+
+    t2 = time.perf_counter()
+    _STAGE_SECONDS.observe(t2 - t1, stage="slides")
+    _SLIDES_PER_DECK.observe(len(p.slides))
+
+    # PPT_SLIM=1: 이 덱이 쓰지 않는 layout/master/이미지를 빼고 저장
+    if output_options()["slim"]:
+        slim_deck(p, {(s.master, s.layout) for s in specs})
+        _STAGE_SECONDS.observe(time.perf_counter() - t2, stage="slim")
+    return p
+
+
+def _save(p: Presentation, pkg_file) -> None:
+    opts = output_options()
+    save_deck(p, pkg_file, zip_level=opts["zip_level"], store_media=opts["slim"])
 
-    date = datetime.datetime.now().date()
-    sermon_title = plan.get("sermon_title", "")
-    sermon_phrases = plan.get("sermon_phrases", [])
-
-    # [1] 프리뷰 + 사도신경
-    add_slide(p, M0, L0_GREETINGS)
-
-    s_prev = add_slide(p, M0, L0_PREVIEW)
-    set_ph(s_prev, 10, date.strftime("%Y.%m.%d 주일 예배"))
-    set_ph(s_prev, 11, sermon_title)
-    set_ph(s_prev, 12, sermon_phrases[0] if sermon_phrases else "")
-
-    add_slide(p, M0, L0_CONTACTUS)
-    add_slide(p, M0, L0_WHITEPRAYER)
-    add_slide(p, M0, L0_APOSTLES)
-    add_slide(p, M0, L0_APOSTLES_1)
-    add_slide(p, M0, L0_APOSTLES_2)
-
-    # [2] 찬양
-    add_slide(p, M1, L1_WORSHIP_BG)
-    add_slide(p, M1, L1_WORSHIP_INTRO)
-
-    for s in plan["songs"]["praise"]:
-        add_song_section(p, "Praise", s)
-
-    add_slide(p, M1, L1_BLACKPRAYER)
-
-    s_pray = add_slide(p, M1, L1_PRAYER)
-    set_ph(s_pray, 10, plan.get("prayer", "기도 | "))
-
-    # [3] 헌금
-    add_slide(p, M1, L1_OFFERING)
-    if plan["songs"].get("offering"):
-        add_song_section(p, "Offering", plan["songs"]["offering"])
-
-    add_slide(p, M0, L0_OFFERINGPRAY)
-    add_slide(p, M0, L0_WHITEANNOUNCE)
-
-    # [4] 설교 + 본문
-    if sermon_phrases:
-        s_sermon = add_slide(p, M0, L0_SERMON_TITLE)
-        set_ph(s_sermon, 10, "말씀 | 박성준 전도사님")
-        set_ph(s_sermon, 11, sermon_title)
-        set_ph(s_sermon, 12, sermon_phrases[0])
-
-        for phrase in sermon_phrases:
-            book, chapter, start_v, end_v = parse_range(phrase)
-            if not book:
-                continue
-            verses = scroll_bible(Path(bible_dir), book, chapter, start_v, end_v)
-
-            for i, vno in enumerate(range(start_v, end_v + 1)):
-                s_b = add_slide(p, M0, L0_BIBLE_PHRASE)
-                set_ph(s_b, 10, verses[i])
-                set_ph(s_b, 11, f"{book} {chapter}장 {vno}절")
-            s_sermon = add_slide(p, M0, L0_SERMON_TITLE)
-            set_ph(s_sermon, 10, "말씀 | 박성준 전도사님")
-            set_ph(s_sermon, 11, sermon_title)
-            set_ph(s_sermon, 12, sermon_phrases[0])
-
-
-    # [5] 설후찬
-    if plan["songs"].get("closing"):
-        add_song_section(p, "Closing", plan["songs"]["closing"])
-
-    # 주기도문
-    add_slide(p, M1, L1_LordsPrayer)
-    add_slide(p, M1, L1_LordsPrayer_1)
-    add_slide(p, M1, L1_LordsPrayer_2)
+
+def _record_save(started: float, size: int) -> None:
+    _STAGE_SECONDS.observe(time.perf_counter() - started, stage="save")
+    _OUTPUT_BYTES.observe(size)
+    _DECKS.inc()
+
+
+def build_ppt(plan: dict, template_path: Path, bible_dir: Path, out_dir: Path) -> Path:
+    p = compose_ppt(plan, template_path, bible_dir)
 
     # 저장 (out/ 아래에 생성)
     out_dir = Path(out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
 
+    date = datetime.datetime.now().date()
     out_fp = out_dir / f"{date.strftime('%Y%m%d')}_thepureum_out.pptx"
-    p.save(str(out_fp))
+    t0 = time.perf_counter()
+    _save(p, str(out_fp))
+    _record_save(t0, out_fp.stat().st_size)
     return out_fp
+
+
+def build_ppt_buffer(plan: dict, template_path: Path, bible_dir: Path, *, spool_max_bytes: int = 8 * 1024 * 1024):
+    """
+    out/ 에 파일을 만들지 않고 SpooledTemporaryFile 에 저장해서 반환 (위치는 0으로 되감아 둠).
+    spool_max_bytes 까지는 메모리, 넘으면 이름 없는 임시파일로 넘어감. 다 쓰면 close() 할 것.
+    """
+    p = compose_ppt(plan, template_path, bible_dir)
+
+    buf = tempfile.SpooledTemporaryFile(max_size=spool_max_bytes)
+    t0 = time.perf_counter()
+    try:
+        _save(p, buf)
+    except Exception:
+        buf.close()
+        raise
+    _record_save(t0, buf.tell())
+    buf.seek(0)
+    return buf
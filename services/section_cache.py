@@ -0,0 +1,107 @@
+# services/section_cache.py
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from services.cleanup import _safe_unlink, env_int
+from services.expiry import register_expiry
+from services.metrics import counter
+
+# 렌더링 방식이 바뀌면 올려서 예전 캐시를 무효화
+SECTION_FORMAT_VERSION = 1
+
+_LOOKUPS = counter("ppt_section_cache_total", "구간(섹션) 슬라이드 캐시 조회", ("result",))
+
+
+def section_key(specs, template_version: str) -> str:
+    """구간 하나의 입력(레이아웃 + placeholder 텍스트)과 템플릿 버전으로 만든 키"""
+    payload = [SECTION_FORMAT_VERSION, template_version, [(s.master, s.layout, s.texts) for s in specs]]
+    return hashlib.sha256(json.dumps(payload, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class SectionCache:
+    """
+    구간별로 렌더링된 슬라이드 XML(bytes 목록)을 보관.
+    - 프로세스 안에서는 메모리 LRU, 빌드 worker 끼리는 out/section_cache/{key}.bin 으로 공유
+    - 가사 한 곡을 고치면 그 곡 구간만 키가 바뀌고 나머지는 그대로 재사용됨
+    """
+
+    def __init__(self, base_dir: str = "out/section_cache", *, mem_entries: int = 512, ttl_sec: int | None = None):
+        self.base = Path(base_dir)
+        self.base.mkdir(parents=True, exist_ok=True)
+        self.mem_entries = mem_entries
+        self.ttl_sec = ttl_sec
+        self._mem: OrderedDict[str, list[bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _fp(self, key: str) -> Path:
+        return self.base / f"{key}.bin"
+
+    def _remember(self, key: str, blobs: list[bytes]) -> None:
+        with self._lock:
+            self._mem[key] = blobs
+            self._mem.move_to_end(key)
+            while len(self._mem) > self.mem_entries:
+                self._mem.popitem(last=False)
+
+    def get(self, key: str) -> list[bytes] | None:
+        with self._lock:
+            blobs = self._mem.get(key)
+            if blobs is not None:
+                self._mem.move_to_end(key)
+        if blobs is not None:
+            _LOOKUPS.inc(result="hit_mem")
+            return blobs
+
+        try:
+            blobs = pickle.loads(self._fp(key).read_bytes())
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            _LOOKUPS.inc(result="miss")
+            return None
+
+        _LOOKUPS.inc(result="hit_disk")
+        self._remember(key, blobs)
+        if self.ttl_sec:
+            register_expiry(self._fp(key), self.ttl_sec)
+        return blobs
+
+    def put(self, key: str, blobs: list[bytes]) -> None:
+        self._remember(key, blobs)
+        fd, tmp = tempfile.mkstemp(dir=self.base, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(pickle.dumps(blobs, protocol=pickle.HIGHEST_PROTOCOL))
+            os.replace(tmp, self._fp(key))
+        except OSError:
+            # 디스크 쪽은 못 써도 메모리 캐시로는 동작
+            _safe_unlink(Path(tmp))
+            return
+        if self.ttl_sec:
+            register_expiry(self._fp(key), self.ttl_sec)
+
+
+_cache: SectionCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_section_cache() -> SectionCache | None:
+    """프로세스 전역 구간 캐시. SECTION_CACHE_ENABLED=0 이면 None."""
+    global _cache
+    if not env_int("SECTION_CACHE_ENABLED", 1):
+        return None
+
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SectionCache(
+                    mem_entries=env_int("SECTION_CACHE_MEM_ENTRIES", 512),
+                    ttl_sec=env_int("SECTION_CACHE_TTL_SEC", 24 * 3600),
+                )
+    return _cache
@@ -0,0 +1,43 @@
+# services/singleflight.py
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """
+    같은 키로 동시에 들어온 작업을 하나로 합침.
+    - 먼저 begin 한 쪽(leader)만 실제로 일하고 finish 로 결과를 넘김
+    - 그 사이 같은 키로 들어온 쪽(follower)은 같은 Future 를 받아 결과를 기다림
+    - 끝난 키는 바로 빠지므로 결과를 오래 들고 있지 않음 (보관은 캐시 몫)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[str, Future] = {}
+
+    def begin(self, key: str) -> tuple[Future, bool]:
+        """(future, leader 여부). leader 면 반드시 finish 를 호출해야 함"""
+        with self._lock:
+            fut = self._calls.get(key)
+            if fut is not None:
+                return fut, False
+            fut = Future()
+            self._calls[key] = fut
+            return fut, True
+
+    def finish(self, key: str, fut: Future, result=None, error: BaseException | None = None) -> None:
+        with self._lock:
+            if self._calls.get(key) is fut:
+                del self._calls[key]
+        if fut.done():
+            return
+        if error is not None:
+            fut.set_exception(error)
+        else:
+            fut.set_result(result)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,84 @@
+# services/slide_engine.py
+from __future__ import annotations
+
+import copy
+import threading
+
+from pptx import Presentation
+from pptx.opc.constants import CONTENT_TYPE as CT, RELATIONSHIP_TYPE as RT
+from pptx.opc.packuri import PackURI
+from pptx.oxml import parse_xml
+from pptx.parts.slide import SlidePart
+
+# (템플릿 버전, master, layout) -> placeholder 가 복제된 빈 슬라이드 XML 요소
+_SKELETONS: dict[tuple[str, int, int], object] = {}
+_SKELETON_LOCK = threading.Lock()
+
+
+class SlideEmitter:
+    """
+    python-pptx 의 add_slide 를 거치지 않고 슬라이드를 빠르게 붙이는 경로.
+
+    add_slide 는 슬라이드마다
+    - 레이아웃 placeholder 를 다시 복제하고 (clone_layout_placeholders)
+    - presentation 관계 전체를 훑어서 같은 관계가 있는지 찾고 (rels.get_or_add)
+    - sldId 전체를 xpath 로 읽어 다음 id 를 계산함
+    이라 덱이 커질수록 느려짐 (슬라이드 수에 대해 O(n^2)).
+
+    여기서는 레이아웃별 빈 슬라이드(skeleton)를 한 번만 만들어 복사해 쓰고,
+    partname/rId/sldId 는 python-pptx 와 같은 규칙의 값을 카운터로 이어서 매김 → 결과 파일이 같음.
+    """
+
+    def __init__(self, p: Presentation, template_ver: str = ""):
+        self.p = p
+        self.prs_part = p.part
+        self.package = p.part.package
+        self.template_ver = template_ver
+        self._sldIdLst = p.slides._sldIdLst
+        self._rels = p.part.rels
+        self._slide_no = len(self._sldIdLst) + 1
+        self._next_id = self._sldIdLst._next_id
+        self._local: dict[tuple[int, int], object] = {}
+
+    def _layout(self, master_idx: int, layout_idx: int):
+        return self.p.slide_masters[master_idx].slide_layouts[layout_idx]
+
+    def _skeleton(self, master_idx: int, layout_idx: int):
+        key = (master_idx, layout_idx)
+        skel = self._local.get(key)
+        if skel is not None:
+            return skel
+
+        gkey = (self.template_ver, master_idx, layout_idx)
+        skel = _SKELETONS.get(gkey) if self.template_ver else None
+        if skel is None:
+            # add_slide 가 하는 것과 똑같이 빈 슬라이드에 placeholder 복제 (패키지에는 연결 안 함)
+            layout = self._layout(master_idx, layout_idx)
+            scratch = SlidePart.new(PackURI("/ppt/slides/skeleton.xml"), self.package, layout.part)
+            scratch.slide.shapes.clone_layout_placeholders(layout)
+            skel = scratch._element
+            if self.template_ver:
+                with _SKELETON_LOCK:
+                    _SKELETONS[gkey] = skel
+        self._local[key] = skel
+        return skel
+
+    def _attach(self, master_idx: int, layout_idx: int, element) -> SlidePart:
+        part = SlidePart(PackURI("/ppt/slides/slide%d.xml" % self._slide_no), CT.PML_SLIDE, self.package, element)
+        part.relate_to(self._layout(master_idx, layout_idx).part, RT.SLIDE_LAYOUT)
+
+        # 새 파트라 기존 관계와 겹칠 일이 없으니 get_or_add 의 전체 탐색을 건너뜀 (rId 규칙은 동일)
+        rId = self._rels._add_relationship(RT.SLIDE, part)
+        self._sldIdLst._add_sldId(id=self._next_id, rId=rId)
+        self._slide_no += 1
+        self._next_id += 1
+        return part
+
+    def add(self, master_idx: int, layout_idx: int):
+        """빈 슬라이드 추가 (add_slide 와 같은 결과). Slide 객체 반환"""
+        element = copy.deepcopy(self._skeleton(master_idx, layout_idx))
+        return self._attach(master_idx, layout_idx, element).slide
+
+    def add_blob(self, master_idx: int, layout_idx: int, blob: bytes) -> None:
+        """렌더링해 둔 슬라이드 XML 을 그대로 붙임 (구간 캐시 hit 용)"""
+        self._attach(master_idx, layout_idx, parse_xml(blob))
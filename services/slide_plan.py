@@ -0,0 +1,214 @@
+# services/slide_plan.py
+from __future__ import annotations
+
+import datetime
+from pathlib import Path
+
+from services.bible_refs import resolve_refs
+
+# 템플릿 기준 master/layout 인덱스
+M0 = 0
+M1 = 1
+
+# master0 layouts
+L0_GREETINGS     = 0
+L0_PREVIEW       = 1   # (ph 10,11,12)
+L0_CONTACTUS     = 2
+L0_WHITEPRAYER   = 5
+L0_APOSTLES      = 6
+L0_APOSTLES_1    = 7
+L0_APOSTLES_2    = 8
+L0_OFFERINGPRAY  = 9
+L0_WHITEANNOUNCE = 10
+L0_SERMON_TITLE  = 11  # (ph 10,11,12)
+L0_BIBLE_PHRASE  = 12  # (ph 10,11)
+
+# master1 layouts
+L1_WORSHIP_BG    = 0
+L1_WORSHIP_INTRO = 1
+L1_WORSHIP_TITLE = 2   # (ph 10,11)
+L1_WORSHIP_LYR   = 3   # (ph 10)
+L1_BLACKPRAYER   = 4
+L1_OFFERING      = 5
+L1_LordsPrayer   = 6
+L1_LordsPrayer_1 = 7
+L1_LordsPrayer_2 = 8
+L1_PRAYER        = 9   # (ph 10)
+
+PREACHER = "말씀 | 박성준 전도사님"
+
+
+class SlideSpec:
+    """
+    슬라이드 한 장: 어떤 layout 에 어떤 placeholder 텍스트를 넣을지만 들고 있는 순수 데이터.
+    section 은 덱 안의 구간 이름 (liturgy:opening, praise:0, bible:0 ...)
+    """
+
+    __slots__ = ("master", "layout", "texts", "section")
+
+    def __init__(self, master: int, layout: int, texts: tuple[tuple[int, str], ...] = (), section: str = ""):
+        self.master = master
+        self.layout = layout
+        self.texts = texts
+        self.section = section
+
+    def to_dict(self) -> dict:
+        return {
+            "master": self.master,
+            "layout": self.layout,
+            "section": self.section,
+            "texts": {str(idx): text for idx, text in self.texts},
+        }
+
+    def __repr__(self) -> str:
+        return f"SlideSpec({self.master}, {self.layout}, {self.texts!r}, {self.section!r})"
+
+
+def clean_song_title(title: str) -> str:
+    return title.split("_")[0] if "_" in title else title
+
+
+def song_section_specs(label_en: str, song: dict, section: str = "") -> list[SlideSpec]:
+    """찬양 한 곡: 제목 슬라이드 + 가사 슬라이드 (2줄씩, 빈 줄 규칙 적용)"""
+    title = clean_song_title(song.get("title", ""))
+    lines = (song.get("lyrics", "") or "").replace("\r\n", "\n").split("\n")
+
+    # 제목 슬라이드
+    specs = [SlideSpec(M1, L1_WORSHIP_TITLE, ((10, title), (11, label_en)), section)]
+
+    # ---- 핵심: 빈 줄 처리 규칙 반영 ----
+    buf = []  # 현재 슬라이드에 넣을 가사 줄(최대 2줄)
+
+    def flush_buf():
+        """buf에 쌓인 1~2줄을 슬라이드로 내보냄"""
+        nonlocal buf
+        if not buf:
+            return
+        specs.append(SlideSpec(M1, L1_WORSHIP_LYR, ((10, "\n".join(buf)),), section))
+        buf = []
+
+    prev_flushed_linecount = 0  # 직전에 만든 가사 슬라이드가 몇 줄이었는지(1 or 2)
+
+    for raw in lines:
+        line = raw.strip()
+
+        # 1) 빈 줄이면
+        if line == "":
+            # (A) 직전에 "1줄짜리 슬라이드"를 막 만든 상황이면 → 빈 슬라이드 만들지 말고 그냥 무시
+            if not buf and prev_flushed_linecount == 1:
+                continue
+
+            # (B) 현재 buf에 1줄이 쌓인 상태에서 빈 줄이 나오면:
+            #     -> 그 1줄은 그대로 슬라이드로 만들고(1줄짜리),
+            #     -> 그리고 "빈 슬라이드"는 만들지 않음(너 요구사항: 1줄+빈줄이면 넘어감)
+            if len(buf) == 1:
+                flush_buf()
+                prev_flushed_linecount = 1
+                continue
+
+            # (C) buf가 비어있고(=이미 2줄 단위로 flush 되었거나) 그냥 빈 줄만 나온 경우:
+            #     -> 여기서만 "빈 슬라이드" 생성
+            if not buf:
+                specs.append(SlideSpec(M1, L1_WORSHIP_LYR, (), section))  # 빈 화면용
+                prev_flushed_linecount = 0
+            continue
+
+        # 2) 일반 가사 줄이면 buf에 추가
+        buf.append(line)
+
+        # 2줄이 채워지면 슬라이드 생성
+        if len(buf) == 2:
+            flush_buf()
+            prev_flushed_linecount = 2
+
+    # 마지막 남은 1줄 처리
+    if buf:
+        flush_buf()
+
+    return specs
+
+
+def compile_plan(plan: dict, bible_dir: Path, date: datetime.date | None = None) -> list[SlideSpec]:
+    """plan → 덱 전체 슬라이드 목록 (python-pptx 없이, 순서 그대로)"""
+    date = date or datetime.datetime.now().date()
+    sermon_title = plan.get("sermon_title", "")
+    sermon_phrases = plan.get("sermon_phrases", [])
+    sermon_slide = ((10, PREACHER), (11, sermon_title), (12, sermon_phrases[0] if sermon_phrases else ""))
+    specs: list[SlideSpec] = []
+
+    def fixed(section: str, *slides):
+        specs.extend(SlideSpec(m, l, texts, section) for m, l, texts in slides)
+
+    # [1] 프리뷰 + 사도신경
+    fixed(
+        "liturgy:opening",
+        (M0, L0_GREETINGS, ()),
+        (M0, L0_PREVIEW, (
+            (10, date.strftime("%Y.%m.%d 주일 예배")),
+            (11, sermon_title),
+            (12, sermon_phrases[0] if sermon_phrases else ""),
+        )),
+        (M0, L0_CONTACTUS, ()),
+        (M0, L0_WHITEPRAYER, ()),
+        (M0, L0_APOSTLES, ()),
+        (M0, L0_APOSTLES_1, ()),
+        (M0, L0_APOSTLES_2, ()),
+        # [2] 찬양
+        (M1, L1_WORSHIP_BG, ()),
+        (M1, L1_WORSHIP_INTRO, ()),
+    )
+
+    for i, s in enumerate(plan["songs"]["praise"]):
+        specs.extend(song_section_specs("Praise", s, f"praise:{i}"))
+
+    fixed(
+        "liturgy:prayer",
+        (M1, L1_BLACKPRAYER, ()),
+        (M1, L1_PRAYER, ((10, plan.get("prayer", "기도 | ")),)),
+        # [3] 헌금
+        (M1, L1_OFFERING, ()),
+    )
+    if plan["songs"].get("offering"):
+        specs.extend(song_section_specs("Offering", plan["songs"]["offering"], "offering"))
+
+    fixed("liturgy:offering", (M0, L0_OFFERINGPRAY, ()), (M0, L0_WHITEANNOUNCE, ()))
+
+    # [4] 설교 + 본문
+    if sermon_phrases:
+        fixed("sermon", (M0, L0_SERMON_TITLE, sermon_slide))
+
+        # 본문 전체를 한 번에 해석 (책별로 묶어서 조회). 형식을 못 알아본 줄은 (예전처럼) 건너뜀
+        for i, ref in enumerate(resolve_refs(Path(bible_dir), sermon_phrases)):
+            if not ref["parsed"]:
+                continue
+            section = f"bible:{i}"
+            if not ref["verses"]:
+                # 형식은 맞는데 절을 못 꺼낸 경우(거꾸로 된 범위, 최대 절 수 초과 등) → 빠뜨리지 말고 오류를 슬라이드로
+                specs.append(SlideSpec(M0, L0_BIBLE_PHRASE, ((10, f"⚠️ {ref['error']}"), (11, ref["input"])), section))
+            for v in ref["verses"]:
+                specs.append(SlideSpec(
+                    M0, L0_BIBLE_PHRASE,
+                    ((10, v["text"]), (11, f"{v['book']} {v['chapter']}장 {v['verse']}절")),
+                    section,
+                ))
+            specs.append(SlideSpec(M0, L0_SERMON_TITLE, sermon_slide, section))
+
+    # [5] 설후찬
+    if plan["songs"].get("closing"):
+        specs.extend(song_section_specs("Closing", plan["songs"]["closing"], "closing"))
+
+    # 주기도문
+    fixed("liturgy:lords_prayer", (M1, L1_LordsPrayer, ()), (M1, L1_LordsPrayer_1, ()), (M1, L1_LordsPrayer_2, ()))
+
+    return specs
+
+
+def summarize(specs: list[SlideSpec]) -> list[dict]:
+    """구간별 슬라이드 수 (순서 유지)"""
+    out: list[dict] = []
+    for i, s in enumerate(specs):
+        if out and out[-1]["section"] == s.section:
+            out[-1]["count"] += 1
+        else:
+            out.append({"section": s.section, "start": i, "count": 1})
+    return out
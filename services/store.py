@@ -1,28 +1,190 @@
+import fcntl
 import json
+import os
+import pickle
+import re
+import secrets
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
 
+from services.expiry import register_expiry
+from services.metrics import counter, histogram
+
+_PLAN_ID_RE = re.compile(r"^[0-9A-Za-z_-]{1,64}$")
+
+_OPS = counter("plan_store_ops_total", "PlanStore 호출 수 (get 은 메모리 캐시 hit/miss 구분)", ("op", "cache"))
+_SECONDS = histogram("plan_store_seconds", "PlanStore 호출 시간", ("op",))
+
 
 class PlanStore:
-    def __init__(self, base_dir: str = "out/plans"):
+    """
+    plan 을 out/plans/{plan_id}.json 으로 저장.
+    - 쓰기는 임시파일 + os.replace 로 원자적 (읽는 쪽이 반쯤 쓴 파일을 볼 일 없음)
+    - 최근 plan 은 메모리 LRU 에 write-through 로 들고 있고, 읽을 때 파일의
+      (inode, mtime, size) 가 같을 때만 캐시를 씀 → 다른 worker 가 저장한 것도 바로 반영
+    - 캐시에는 pickle bytes 를 두고 매번 새 dict 로 풀어서 줌 (호출한 쪽이 수정해도 캐시는 안전)
+    - ttl_sec 을 주면 저장할 때마다 만료 인덱스에 등록 (마지막 저장 후 ttl_sec 뒤 삭제)
+    - get → 수정 → save 를 여러 곳(크롤링 job, Step3 저장)에서 하면 locked() 안에서 (worker 프로세스끼리도 배타적)
+      lock 파일은 나이로 지우면 안 되고 prune_locks 로만 정리
+    """
+
+    def __init__(self, base_dir: str = "out/plans", cache_size: int = 256, ttl_sec: int | None = None):
         self.base = Path(base_dir)
         self.base.mkdir(parents=True, exist_ok=True)
+        self.cache_size = cache_size
+        self.ttl_sec = ttl_sec
+        self._cache: OrderedDict[str, tuple[tuple[int, int, int], bytes]] = OrderedDict()
+        self._lock = threading.Lock()
 
     def _fp(self, plan_id: str) -> Path:
         return self.base / f"{plan_id}.json"
 
+    @staticmethod
+    def _version(st: os.stat_result) -> tuple[int, int, int]:
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _remember(self, plan_id: str, version: tuple[int, int, int], plan: dict) -> None:
+        blob = pickle.dumps(plan, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._cache[plan_id] = (version, blob)
+            self._cache.move_to_end(plan_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    @contextmanager
+    def locked(self, plan_id: str):
+        """
+        with store.locked(plan_id): plan = store.get(...); ...; store.save(...)
+        plan 파일은 os.replace 로 바뀌므로 옆의 .{plan_id}.lock 파일에 flock.
+        open 마다 따로 잡히는 lock 이라 같은 프로세스의 스레드끼리도 배타적.
+        """
+        if not _PLAN_ID_RE.match(plan_id or ""):
+            raise ValueError(f"invalid plan_id: {plan_id!r}")
+        lock_fp = self.base / f".{plan_id}.lock"
+        while True:
+            fd = os.open(lock_fp, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            # 기다리는 사이 prune_locks 가 파일을 지웠으면 새로 만든 쪽과 따로 잡히므로 다시 열어서 잡음
+            try:
+                same = os.stat(lock_fp).st_ino == os.fstat(fd).st_ino
+            except FileNotFoundError:
+                same = False
+            if same:
+                break
+            os.close(fd)
+        try:
+            yield
+        finally:
+            os.close(fd)  # close 하면 flock 도 풀림
+
+    def prune_locks(self, max_age_seconds: int) -> int:
+        """
+        plan 이 이미 지워졌고 max_age_seconds 넘게 안 바뀐 lock 파일을 삭제. 지운 개수 반환.
+        flock 은 mtime 을 안 바꾸므로 나이만 보고 지우지 않고, 아무도 안 잡고 있을 때(LOCK_NB)만 잡은 채로 지움.
+        """
+        now = time.time()
+        removed = 0
+        for fp in self.base.glob(".*.lock"):
+            plan_id = fp.name[1:-len(".lock")]
+            try:
+                if self._fp(plan_id).exists() or now - fp.stat().st_mtime < max_age_seconds:
+                    continue
+                fd = os.open(fp, os.O_RDWR)
+            except FileNotFoundError:
+                continue
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                continue
+            try:
+                if os.stat(fp).st_ino == os.fstat(fd).st_ino:
+                    os.unlink(fp)
+                    removed += 1
+            except FileNotFoundError:
+                pass
+            finally:
+                os.close(fd)
+        return removed
+
     def create(self, plan: dict) -> str:
-        plan_id = datetime.now().strftime("%Y%m%d%H%M%S%f")
+        # 시간순 정렬은 유지하면서, 동시에 들어온 요청(다른 worker 포함)끼리 안 겹치게 난수 + O_EXCL
+        while True:
+            plan_id = f"{datetime.now().strftime('%Y%m%d%H%M%S%f')}-{secrets.token_hex(3)}"
+            try:
+                fd = os.open(self._fp(plan_id), os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                continue
+            os.close(fd)
+            break
+
         plan["plan_id"] = plan_id
         self.save(plan_id, plan)
         return plan_id
 
     def get(self, plan_id: str) -> dict | None:
+        if not _PLAN_ID_RE.match(plan_id or ""):
+            return None
         fp = self._fp(plan_id)
-        if not fp.exists():
+        try:
+            version = self._version(fp.stat())
+        except FileNotFoundError:
+            return None
+
+        with self._lock:
+            cached = self._cache.get(plan_id)
+            if cached and cached[0] == version:
+                self._cache.move_to_end(plan_id)
+                blob = cached[1]
+            else:
+                blob = None
+        if blob is not None:
+            _OPS.inc(op="get", cache="hit")
+            return pickle.loads(blob)
+
+        _OPS.inc(op="get", cache="miss")
+        t0 = time.perf_counter()
+        try:
+            with open(fp, "rb") as f:
+                version = self._version(os.fstat(f.fileno()))
+                raw = f.read()
+        except FileNotFoundError:
             return None
-        return json.loads(fp.read_text(encoding="utf-8"))
+        if not raw:
+            return None  # create() 가 자리만 잡아 둔 순간
+
+        plan = json.loads(raw)
+        self._remember(plan_id, version, plan)
+        _SECONDS.observe(time.perf_counter() - t0, op="get")
+        return plan
 
     def save(self, plan_id: str, plan: dict) -> None:
+        t0 = time.perf_counter()
         fp = self._fp(plan_id)
-        fp.write_text(json.dumps(plan, ensure_ascii=False, indent=2), encoding="utf-8")
+        data = json.dumps(plan, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+        fd, tmp = tempfile.mkstemp(dir=self.base, prefix=f".{plan_id}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                # rename 해도 inode/mtime 은 그대로라 여기서 잰 값이 저장 후 파일의 버전
+                version = self._version(os.fstat(f.fileno()))
+            os.replace(tmp, fp)
+        except Exception:
+            try:
+                os.unlink(tmp)
+            except FileNotFoundError:
+                pass
+            raise
+
+        self._remember(plan_id, version, plan)
+        if self.ttl_sec:
+            register_expiry(fp, self.ttl_sec)
+        _OPS.inc(op="save", cache="")
+        _SECONDS.observe(time.perf_counter() - t0, op="save")